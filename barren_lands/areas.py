@@ -0,0 +1,178 @@
+import bisect
+
+import numpy as np
+
+from .land import bounds_array, clip_bounds
+from .structures import DisjointSet
+
+
+def island_areas(width, height, barren):
+    """Computes the sorted fertile island areas without building any zones.
+
+    Notes:
+        The field is swept from top to bottom in row bands cut at every barren start and end.
+        The free runs of a row are kept from band to band, only the runs around the zones that
+        start or end at a band edge are closed and cut again from a coverage count over the
+        compressed x axis. A new run belongs to the same island as the closed runs it touches,
+        corners included, so only those are joined and the areas of the runs summed.
+
+    Args:
+        width (int): The width of the field.
+        height (int): The height of the field.
+        barren (iterable[Zone]|ZoneStore|numpy.ndarray): The barren zones or their bounds.
+
+    Returns:
+        (list[int]): The area of every island, sorted from least to most.
+    """
+    if width <= 0 or height <= 0:
+        return list()
+    bounds = clip_bounds(bounds_array(barren), width, height)
+
+    # Column j of the compressed x axis stands for the units axis_x[j] to axis_x[j + 1] - 1.
+    axis_x = np.unique(np.concatenate(([0, width], bounds[:, 0], bounds[:, 2] + 1)))
+    first = np.searchsorted(axis_x, bounds[:, 0])
+    last = np.searchsorted(axis_x, bounds[:, 2] + 1)
+    # Every zone changes the coverage twice, once where it starts and once below its end.
+    changes = np.concatenate((
+        np.stack((bounds[:, 1], first, last, np.ones(len(bounds), dtype=np.int64)), axis=1),
+        np.stack((bounds[:, 3] + 1, first, last, np.full(len(bounds), -1)), axis=1)))
+    changes = changes[np.lexsort((changes[:, 1], changes[:, 0]))]
+    edges = np.unique(np.concatenate(([0, height], changes[:, 0]))).tolist()
+    changes = changes.tolist()
+    axis_x = axis_x.tolist()
+
+    coverage = np.zeros(len(axis_x) - 1, dtype=np.int32)
+    # The free runs of the current band in compressed columns, sorted and apart from another.
+    run_starts = list()
+    run_ends = list()
+    run_nodes = list()
+    run_tops = list()
+    # The area and the touching runs of every run that was ever opened.
+    areas = list()
+    unions = list()
+    position = 0
+    for top in edges[:-1]:
+        # The compressed columns whose coverage changes at this band, sorted and merged, and
+        # whether zones only started over them.
+        changed = [[0, len(coverage), False]] if top == 0 else list()
+        while position < len(changes) and changes[position][0] == top:
+            _, start, end, step = changes[position]
+            coverage[start:end] += step
+            if changed and start <= changed[-1][1]:
+                changed[-1][1] = max(changed[-1][1], end)
+                changed[-1][2] = changed[-1][2] and step > 0
+            else:
+                changed.append([start, end, step > 0])
+            position += 1
+
+        index = 0
+        while index < len(changed):
+            window = [changed[index]]
+            low, high, _ = changed[index]
+            index += 1
+            while True:
+                # Runs touching the changed columns, corners included, are cut again.
+                run_first = bisect.bisect_left(run_ends, low)
+                run_last = bisect.bisect_right(run_starts, high)
+                if run_first < run_last:
+                    low = min(low, run_starts[run_first])
+                    high = max(high, run_ends[run_last - 1])
+                if index < len(changed) and changed[index][0] <= high:
+                    window.append(changed[index])
+                    high = max(high, changed[index][1])
+                    index += 1
+                    continue
+                break
+            _recut(top, window, run_first, run_last, coverage, axis_x,
+                   (run_starts, run_ends, run_nodes, run_tops), areas, unions)
+
+    for start, end, node, run_top in zip(run_starts, run_ends, run_nodes, run_tops):
+        areas[node] += (axis_x[end] - axis_x[start]) * (height - run_top)
+    groups = DisjointSet(len(areas))
+    for node_a, node_b in unions:
+        groups.union(node_a, node_b)
+    totals = dict()
+    for node, area in enumerate(areas):
+        root = groups.find(node)
+        totals[root] = totals.get(root, 0) + area
+    return sorted(totals.values())
+
+
+def _recut(top, changed, run_first, run_last, coverage, axis_x, runs, areas, unions):
+    """Closes the runs around changed columns and opens the free runs they have from now on.
+
+    Notes:
+        Outside of the changed columns the land is as free as it was in the band above, so
+        only the changed columns are read from the coverage.
+
+    Args:
+        top (int): The first row of the band.
+        changed (list[list]): Sorted `start, end, covered` ranges of the changed columns,
+            covered when zones only started over them.
+        run_first (int): The first run touching the changed columns.
+        run_last (int): The run right after the last one touching the changed columns.
+        coverage (numpy.ndarray): How many zones cover each compressed column.
+        axis_x (list[int]): The first unit of each compressed column.
+        runs (tuple[list]): The starts, ends, nodes and tops of the current runs.
+        areas (list[int]): The area of every run node, extended with the new runs.
+        unions (list[tuple[int]]): Pairs of touching run nodes, extended with the new pairs.
+    """
+    run_starts, run_ends, run_nodes, run_tops = runs
+    closed = list(zip(run_starts[run_first:run_last], run_ends[run_first:run_last],
+                      run_nodes[run_first:run_last]))
+    pieces = list()
+    index = 0
+    for (start, end, node), run_top in zip(closed, run_tops[run_first:run_last]):
+        areas[node] += (axis_x[end] - axis_x[start]) * (top - run_top)
+        # Keep the parts of the run that did not change.
+        while index < len(changed) and changed[index][1] <= start:
+            index += 1
+        cursor = start
+        for change_start, change_end, _ in changed[index:]:
+            if change_start >= end:
+                break
+            if change_start > cursor:
+                pieces.append((cursor, change_start))
+            cursor = max(cursor, change_end)
+        if cursor < end:
+            pieces.append((cursor, end))
+    for change_start, change_end, covered in changed:
+        if covered:
+            # Zones only started over these columns, none of them can be free.
+            continue
+        # One byte per column, the free stretches are found at C speed.
+        free = (coverage[change_start:change_end] == 0).tobytes()
+        column = free.find(1)
+        while column != -1:
+            end = free.find(0, column)
+            end = len(free) if end == -1 else end
+            pieces.append((change_start + column, change_start + end))
+            column = free.find(1, end)
+
+    # Pieces that meet make up a single run.
+    starts = list()
+    ends = list()
+    for start, end in sorted(pieces):
+        if ends and ends[-1] == start:
+            ends[-1] = end
+        else:
+            starts.append(start)
+            ends.append(end)
+    nodes = list(range(len(areas), len(areas) + len(starts)))
+    areas.extend([0] * len(starts))
+
+    # Both are sorted, walk them together like a merge.
+    new, old = 0, 0
+    while new < len(starts) and old < len(closed):
+        old_start, old_end, old_node = closed[old]
+        if old_start <= ends[new] and starts[new] <= old_end:
+            unions.append((nodes[new], old_node))
+        if old_end < ends[new]:
+            old += 1
+        else:
+            new += 1
+
+    run_starts[run_first:run_last] = starts
+    run_ends[run_first:run_last] = ends
+    run_nodes[run_first:run_last] = nodes
+    run_tops[run_first:run_last] = [top] * len(starts)
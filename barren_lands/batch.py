@@ -0,0 +1,175 @@
+import os
+import sys
+import json
+import time
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from .areas import island_areas
+from .grid import GridField, CompressedField
+from .land import Field, Coord, Zone
+from .partition import PartitionField
+from .utils import format_input
+
+# The engines of the `--engine` flag, None skips building the zones with `island_areas`.
+ENGINES = {
+    "areas": None,
+    "field": Field,
+    "grid": GridField,
+    "compressed": CompressedField,
+    "partition": PartitionField,
+}
+
+
+def analyze_scenario(line, engine=None):
+    """Analyzes a single JSON scenario.
+
+    Args:
+        line (str): The JSON scenario with `width`, `height` and a `barren` list of either
+            `"sx sy ex ey"` strings or `[sx, sy, ex, ey]` lists. `id` is passed through.
+        engine (type): The Field class to run the analysis with. Defaults to `island_areas`,
+            which skips building the zones.
+
+    Returns:
+        result (dict): `id` and the sorted island `areas`, or an `error` message.
+    """
+    result = dict()
+    try:
+        scenario = json.loads(line)
+        result["id"] = scenario.get("id")
+        width, height = scenario.get("width", 400), scenario.get("height", 600)
+        zones = list()
+        for barren in scenario.get("barren", ()):
+            if isinstance(barren, str):
+                zones.append(format_input(barren))
+            else:
+                zones.append(Zone(Coord(barren[0], barren[1]), Coord(barren[2], barren[3])))
+        if engine is None:
+            result["areas"] = island_areas(width, height, zones)
+        else:
+            field = engine(width, height)
+            for zone in zones:
+                field.add_zone(zone, barren=True)
+            field.check_zones()
+            result["areas"] = field.islands_as_area()
+    except Exception as error:
+        # One broken scenario should not stop the whole batch.
+        result["error"] = f"{type(error).__name__}: {error}"
+    return result
+
+
+def analyze_chunk(lines, engine=None):
+    """Analyzes a chunk of scenarios, used by the worker processes.
+
+    Args:
+        lines (list[str]): The JSON scenarios.
+        engine (type): The Field class to run the analysis with, see `analyze_scenario`.
+
+    Returns:
+        (list[str]): The JSON results.
+    """
+    return [json.dumps(analyze_scenario(line, engine)) for line in lines]
+
+
+def chunked(lines, size):
+    """Groups the non empty lines into chunks.
+
+    Args:
+        lines (iterable[str]): The lines to group.
+        size (int): The amount of lines per chunk.
+
+    Yields:
+        chunk (list[str]): Up to `size` lines.
+    """
+    chunk = list()
+    for line in lines:
+        if line.strip():
+            chunk.append(line)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = list()
+    if chunk:
+        yield chunk
+
+
+def run_batch(lines, workers=None, chunk_size=64, engine=None):
+    """Analyzes scenarios across worker processes, streaming the results in input order.
+
+    Notes:
+        Only a few chunks per worker are in flight at once, so the input can be far larger
+        than memory.
+
+    Args:
+        lines (iterable[str]): The JSON scenarios.
+        workers (int): Amount of processes, defaults to the amount of cpus. With 1 the
+            scenarios run in this process.
+        chunk_size (int): The amount of scenarios to send to a worker at once.
+        engine (type): The Field class to run the analysis with, see `analyze_scenario`.
+
+    Yields:
+        (str): The JSON result of each scenario.
+    """
+    workers = workers or os.cpu_count() or 1
+    chunks = chunked(lines, chunk_size)
+    if workers == 1:
+        for chunk in chunks:
+            yield from analyze_chunk(chunk, engine)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(analyze_chunk, chunk, engine))
+            if len(pending) >= workers * 4:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def main(args=None):
+    """Command line entry point.
+
+    Args:
+        args (list[str]): The arguments to parse, defaults to `sys.argv`.
+    """
+    parser = argparse.ArgumentParser(
+        description="Analyzes barren land scenarios from a JSONL file or STDIN.")
+    parser.add_argument("input", nargs="?", default="-",
+                        help="JSONL file with one scenario per line. (default: STDIN)")
+    parser.add_argument("--output", default="-",
+                        help="File to write the JSONL results to. (default: STDOUT)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="The amount of worker processes. (default: cpu count)")
+    parser.add_argument("--chunk-size", dest="chunk_size", type=int, default=64,
+                        help="The amount of scenarios sent to a worker at once.")
+    parser.add_argument("--engine", choices=list(ENGINES), default="areas",
+                        help="The analysis to run, areas only skips building the zones. "
+                             "(default: areas)")
+    options = parser.parse_args(args)
+
+    source = sys.stdin if options.input == "-" else open(options.input, "r")
+    target = sys.stdout if options.output == "-" else open(options.output, "w")
+    start = time.perf_counter()
+    count = 0
+    try:
+        results = run_batch(source, workers=options.workers, chunk_size=options.chunk_size,
+                            engine=ENGINES[options.engine])
+        for result in results:
+            target.write(result + "\n")
+            count += 1
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+        else:
+            target.flush()
+    elapsed = time.perf_counter() - start
+    # Report to STDERR so the results stay clean.
+    print(f"{count} scenarios in {elapsed:.2f}s ({count / max(elapsed, 1e-9):.1f}/s)",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+import json
+import time
+import random
+import platform
+import argparse
+
+import numpy as np
+
+from .areas import island_areas
+from .land import Field, Coord, Zone, normalize_zones
+from .grid import GridField, CompressedField
+from .partition import PartitionField
+
+ENGINES = {"field": Field, "grid": GridField, "compressed": CompressedField,
+           "partition": PartitionField}
+
+
+def random_rectangles(width, height, count, max_size=40, seed=0):
+    """Randomly placed barren rectangles.
+
+    Args:
+        width (int): The width of the field.
+        height (int): The height of the field.
+        count (int): The amount of rectangles.
+        max_size (int): The largest width/height of a rectangle.
+        seed (int): Seed for the random generator so runs are reproducible.
+
+    Returns:
+        (list[tuple[int]]): `(start_x, start_y, end_x, end_y)` of each rectangle.
+    """
+    rand = random.Random(seed)
+    rectangles = list()
+    for _ in range(count):
+        x, y = rand.randrange(width), rand.randrange(height)
+        rectangles.append((x, y, x + rand.randrange(max_size), y + rand.randrange(max_size)))
+    return rectangles
+
+
+def comb(width, height, spacing=4):
+    """A lattice of single unit barren zones that splits the land into as many zones as possible.
+
+    Args:
+        width (int): The width of the field.
+        height (int): The height of the field.
+        spacing (int): The distance between barren units.
+
+    Returns:
+        (list[tuple[int]]): `(start_x, start_y, end_x, end_y)` of each rectangle.
+    """
+    return [(x, y, x, y) for x in range(spacing // 2, width, spacing)
+            for y in range(spacing // 2, height, spacing)]
+
+
+def strips(width, height, count, thickness=2, seed=0):
+    """Long thin barren strips running across the whole field in both directions.
+
+    Args:
+        width (int): The width of the field.
+        height (int): The height of the field.
+        count (int): The amount of strips.
+        thickness (int): The thickness of each strip.
+        seed (int): Seed for the random generator so runs are reproducible.
+
+    Returns:
+        (list[tuple[int]]): `(start_x, start_y, end_x, end_y)` of each rectangle.
+    """
+    rand = random.Random(seed)
+    rectangles = list()
+    for i in range(count):
+        if i % 2:
+            y = rand.randrange(height)
+            rectangles.append((0, y, width - 1, y + thickness - 1))
+        else:
+            x = rand.randrange(width)
+            rectangles.append((x, 0, x + thickness - 1, height - 1))
+    return rectangles
+
+
+def readme_sample(scale=1):
+    """The second sample from the README, scaled up.
+
+    Args:
+        scale (int): Factor to scale the field and the rectangles by.
+
+    Returns:
+        (tuple): `(width, height, rectangles)`.
+    """
+    sample = [(48, 192, 351, 207), (48, 392, 351, 407), (120, 52, 135, 547), (260, 52, 275, 547)]
+    rectangles = [(sx * scale, sy * scale, (ex + 1) * scale - 1, (ey + 1) * scale - 1)
+                  for sx, sy, ex, ey in sample]
+    return 400 * scale, 600 * scale, rectangles
+
+
+def workloads(sizes):
+    """Builds the reproducible benchmark workloads.
+
+    Args:
+        sizes (list[int]): Scale factors, every workload grows with each of them.
+
+    Yields:
+        (tuple): `(name, scale, width, height, rectangles)` of each workload.
+    """
+    for scale in sizes:
+        width, height = 100 * scale, 150 * scale
+        rectangles = random_rectangles(width, height, 10 * scale, seed=scale)
+        yield "random", scale, width, height, rectangles
+        yield "comb", scale, width, height, comb(width, height)
+        yield "strips", scale, width, height, strips(width, height, 4 * scale, seed=scale)
+        yield ("readme", scale) + readme_sample(scale)
+
+
+def timed(call, repeat):
+    """Times a call, keeping the fastest run.
+
+    Args:
+        call (callable): The call to time. Called with no arguments.
+        repeat (int): The amount of runs.
+
+    Returns:
+        (float): The fastest run in seconds.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_workload(engine, width, height, rectangles, repeat=1, render=False):
+    """Times every phase of an analysis.
+
+    Args:
+        engine (type): The Field class to analyze with.
+        width (int): The width of the field.
+        height (int): The height of the field.
+        rectangles (list[tuple[int]]): The barren rectangles.
+        repeat (int): The amount of runs per phase, the fastest run is kept.
+        render (bool): Also time `render_image`.
+
+    Returns:
+        result (dict): Timings in seconds and the size of the problem.
+    """
+    def build():
+        field = engine(width, height)
+        for sx, sy, ex, ey in rectangles:
+            field.add_zone(Zone(Coord(sx, sy), Coord(ex, ey)), barren=True)
+        return field
+
+    fields = [build() for _ in range(repeat)]
+    field = fields[-1]
+    result = {
+        "check_zones": timed(lambda: fields.pop().check_zones(), repeat),
+        "gather_islands": timed(field.gather_islands, repeat),
+        "islands_as_area": timed(field.islands_as_area, repeat),
+        "area": width * height,
+        "barren_zones": len(rectangles),
+        "fertile_zones": len(field.fertile_zones),
+        "islands": len(field.islands),
+    }
+    if render:
+        from .visualize import render_image
+        result["render_image"] = timed(
+            lambda: render_image(field.islands, width, height, by_zone=True), repeat)
+    return result
+
+
+def run_sweep(count, size=10 ** 6, max_size=1000, seed=0):
+    """Times the analyses that skip the fertile zones on many randomly placed rectangles.
+
+    Args:
+        count (int): The amount of rectangles.
+        size (int): The width and height of the field.
+        max_size (int): The largest width/height of a rectangle.
+        seed (int): Seed for the random generator so runs are reproducible.
+
+    Returns:
+        result (dict): Timings of `island_areas` and `normalize_zones` in seconds and the size
+            of the problem.
+    """
+    rng = np.random.default_rng(seed)
+    start = rng.integers(0, size, size=(count, 2))
+    bounds = np.hstack((start, start + rng.integers(0, max_size, size=(count, 2))))
+    began = time.perf_counter()
+    islands = len(island_areas(size, size, bounds))
+    result = {"island_areas": time.perf_counter() - began}
+    began = time.perf_counter()
+    normalized = len(normalize_zones(bounds, size, size))
+    result["normalize_zones"] = time.perf_counter() - began
+    result.update(area=size * size, barren_zones=count, normalized_zones=normalized,
+                  islands=islands)
+    return result
+
+
+def scaling(results, key="check_zones"):
+    """Fits how a phase scales with the field area and the zone count.
+
+    Notes:
+        The exponent is the slope of a log-log fit, 1.0 means linear and 2.0 quadratic.
+
+    Args:
+        results (list[dict]): Results of a single engine and workload.
+        key (str): The phase to fit.
+
+    Returns:
+        (dict): The exponent against `area` and against `fertile_zones`.
+    """
+    exponents = dict()
+    times = np.array([r[key] for r in results], dtype=float)
+    for size in ("area", "fertile_zones"):
+        sizes = np.array([r[size] for r in results], dtype=float)
+        usable = (times > 0) & (sizes > 0)
+        if usable.sum() >= 2 and len(set(sizes[usable])) >= 2:
+            exponents[size] = round(float(np.polyfit(
+                np.log(sizes[usable]), np.log(times[usable]), 1)[0]), 2)
+    return exponents
+
+
+def compare(before, after):
+    """Lines up two saved runs.
+
+    Args:
+        before (dict): The earlier saved run.
+        after (dict): The later saved run.
+
+    Returns:
+        (list[str]): The speedup of `check_zones` for every case found in both runs.
+    """
+    earlier = {(r["engine"], r["workload"], r["scale"]): r for r in before["results"]}
+    lines = list()
+    for result in after["results"]:
+        old = earlier.get((result["engine"], result["workload"], result["scale"]))
+        if old and result["check_zones"] > 0:
+            lines.append(f"{result['engine']:>10} {result['workload']:>8} x{result['scale']:<3} "
+                         f"{old['check_zones'] / result['check_zones']:6.2f}x")
+    return lines
+
+
+def main(args=None):
+    """Command line entry point.
+
+    Args:
+        args (list[str]): The arguments to parse, defaults to `sys.argv`.
+    """
+    parser = argparse.ArgumentParser(description="Benchmarks the barren lands analysis.")
+    parser.add_argument("--engines", nargs="+", default=["grid", "compressed"],
+                        choices=sorted(ENGINES), help="The Field classes to benchmark.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 2, 4],
+                        help="Scale factors of the workloads.")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Runs per phase, the fastest run is kept.")
+    parser.add_argument("--render", action="store_true", help="Also time render_image.")
+    parser.add_argument("--sweep", type=int, default=None,
+                        help="Also time island_areas and normalize_zones on this many random "
+                             "rectangles of a 1000000 x 1000000 field.")
+    parser.add_argument("--output", default=None, help="Save the results as JSON.")
+    parser.add_argument("--compare", default=None, help="Saved JSON results to compare against.")
+    options = parser.parse_args(args)
+
+    results = list()
+    for name, scale, width, height, rectangles in workloads(options.sizes):
+        for engine in options.engines:
+            result = run_workload(ENGINES[engine], width, height, rectangles,
+                                  repeat=options.repeat, render=options.render)
+            result.update(engine=engine, workload=name, scale=scale)
+            results.append(result)
+            print(f"{engine:>10} {name:>8} x{scale:<3} area={result['area']:<10} "
+                  f"zones={result['fertile_zones']:<7} check_zones={result['check_zones']:.4f}s "
+                  f"gather_islands={result['gather_islands']:.4f}s")
+
+    report = {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+        "scaling": dict(),
+    }
+    if options.sweep:
+        sweep = report["sweep"] = run_sweep(options.sweep)
+        print(f"     sweep {options.sweep} zones island_areas={sweep['island_areas']:.4f}s "
+              f"normalize_zones={sweep['normalize_zones']:.4f}s")
+    for engine in options.engines:
+        for name in sorted(set(r["workload"] for r in results)):
+            runs = [r for r in results if r["engine"] == engine and r["workload"] == name]
+            exponents = report["scaling"][f"{engine}/{name}"] = scaling(runs)
+            print(f"{engine:>10} {name:>8} scaling exponents: {exponents}")
+
+    if options.output:
+        with open(options.output, "w") as output:
+            json.dump(report, output, indent=2)
+    if options.compare:
+        with open(options.compare, "r") as earlier:
+            print("\n".join(compare(json.load(earlier), report)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+
+from .areas import island_areas
+from .land import ZoneStore, bounds_array, clip_bounds
+
+
+def canonical_key(kind, width, height, barren):
+    """Builds the cache key of a layout, the same for every way of writing the layout down.
+
+    Notes:
+        The barren zones are clipped to the field, zones outside of it are dropped and the rest
+        are sorted and de-duplicated, so order, duplicates and overhangs do not matter.
+
+    Args:
+        kind (str): What is cached, keeps different results of the same layout apart.
+        width (int): The width of the field.
+        height (int): The height of the field.
+        barren (iterable[Zone]|ZoneStore|numpy.ndarray): The barren zones or their bounds.
+
+    Returns:
+        (str): The hex digest of the canonical layout.
+    """
+    bounds = clip_bounds(bounds_array(barren), width, height)
+    bounds = np.unique(bounds, axis=0).astype(np.int64)
+    digest = hashlib.sha256(f"{kind}:{width}:{height}:".encode())
+    digest.update(np.ascontiguousarray(bounds).tobytes())
+    return digest.hexdigest()
+
+
+class AnalysisCache(object):
+    """Results of analysed layouts, kept in memory and optionally on disk.
+
+    Notes:
+        The memory cache drops the least recently used results past `max_size`. The disk store
+        is a `shelve` file that is never trimmed and survives restarts.
+    """
+
+    def __init__(self, max_size=256, path=None):
+        """AnalysisCache initialization.
+
+        Args:
+            max_size (int): The most results to keep in memory.
+            path (str): File to store the results on disk, memory only if not provided.
+        """
+        self.max_size = max_size
+        self.memory = OrderedDict()
+        self.store = None
+        if path:
+            import shelve
+            self.store = shelve.open(path)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Looks up a result, from memory first and then from disk.
+
+        Args:
+            key (str): The key from `canonical_key`.
+
+        Returns:
+            The cached result, None if there is none.
+        """
+        if key in self.memory:
+            self.memory.move_to_end(key)
+            self.hits += 1
+            return self.memory[key]
+        if self.store is not None and key in self.store:
+            value = self.store[key]
+            self._remember(key, value)
+            self.hits += 1
+            return value
+        self.misses += 1
+        return None
+
+    def put(self, key, value):
+        """Stores a result.
+
+        Args:
+            key (str): The key from `canonical_key`.
+            value: The result, has to be picklable for the disk store.
+        """
+        self._remember(key, value)
+        if self.store is not None:
+            self.store[key] = value
+
+    def island_areas(self, width, height, barren):
+        """Cached version of `areas.island_areas`.
+
+        Args:
+            width (int): The width of the field.
+            height (int): The height of the field.
+            barren (iterable[Zone]|ZoneStore|numpy.ndarray): The barren zones or their bounds.
+
+        Returns:
+            (list[int]): The area of every island, sorted from least to most.
+        """
+        barren = bounds_array(barren)
+        key = canonical_key("areas", width, height, barren)
+        areas = self.get(key)
+        if areas is None:
+            areas = island_areas(width, height, barren)
+            self.put(key, areas)
+        return list(areas)
+
+    def analyze(self, field):
+        """Cached version of `Field.check_zones`, fills in the fertile zones and the islands.
+
+        Args:
+            field (Field): The field to analyse, any Field class. The results are cached per
+                `Field.cache_kind` as fields can split the land into different zones.
+        """
+        key = canonical_key(field.cache_kind(), field.width, field.height, field.barren_zones)
+        islands = self.get(key)
+        if islands is None:
+            field.check_zones()
+            self.put(key, [island.bounds() for island in field.islands])
+            return
+        field.fertile_zones = ()
+        for bounds in islands:
+            field.fertile_zones.extend_bounds(bounds)
+        field.islands = [ZoneStore.from_bounds(bounds) for bounds in islands]
+
+    def close(self):
+        """Writes out and closes the disk store."""
+        if self.store is not None:
+            self.store.close()
+            self.store = None
+
+    def _remember(self, key, value):
+        """Keeps a result in memory, dropping the least recently used past the size bound.
+
+        Args:
+            key (str): The key of the result.
+            value: The result.
+        """
+        self.memory[key] = value
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_size:
+            self.memory.popitem(last=False)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
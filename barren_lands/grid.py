@@ -0,0 +1,264 @@
+import numpy as np
+
+from .land import Field, bounds_array, group_islands
+from .structures import burn_corners
+
+
+class GridField(Field):
+    """Field that runs its analysis on a NumPy occupancy grid.
+
+    Notes:
+        Produces the same zones and islands as `Field`, but the barren zones are rasterized into
+        a boolean mask once instead of calling `check_coord` for every unit of the field.
+    """
+
+    def check_zones(self):
+        """Runs the final calculation to mark the zones."""
+        with self.stats.phase("mark"):
+            free = ~rasterize(self.barren_zones, self.width, self.height)
+            # Zones that were already marked are not available anymore.
+            free &= ~rasterize(self.fertile_zones, self.width, self.height)
+            self.fertile_zones.extend_bounds(np.array(list(decompose(free)), dtype=np.int64))
+        # Partition zones into their respective islands.
+        with self.stats.phase("islands"):
+            self.gather_islands()
+
+    def gather_islands(self):
+        """Groups the fertile zones into islands using the labeled fertile grid."""
+        bounds = self.fertile_zones.bounds()
+        labels, _ = label_regions(rasterize(bounds, self.width, self.height))
+        # Every unit of a zone shares the same label, the start is enough.
+        self.islands = group_islands(bounds, labels[bounds[:, 1], bounds[:, 0]])
+
+
+class CompressedField(GridField):
+    """Field that runs its analysis on a coordinate compressed grid.
+
+    Notes:
+        The x and y axes are cut at the edges of the zones only, so each unit of the compressed
+        grid stands for a whole rectangle of the field. Runtime and memory depend on the amount
+        of zones rather than the size of the field. The fertile zones are coarser than the ones
+        from `Field`, but the islands cover the same land.
+    """
+
+    def check_zones(self):
+        """Runs the final calculation to mark the zones."""
+        with self.stats.phase("mark"):
+            axis_x, axis_y = self.compress()
+            free = ~rasterize_compressed(self.barren_zones, axis_x, axis_y)
+            free &= ~rasterize_compressed(self.fertile_zones, axis_x, axis_y)
+            units = self.split(free)
+            # Expand the compressed units back to the land they stand for.
+            self.fertile_zones.extend_bounds(np.stack((
+                axis_x[units[:, 0]], axis_y[units[:, 1]],
+                axis_x[units[:, 2] + 1] - 1, axis_y[units[:, 3] + 1] - 1), axis=1))
+        # Partition zones into their respective islands.
+        with self.stats.phase("islands"):
+            self.gather_islands()
+
+    def split(self, free):
+        """Splits the free land of the compressed grid into rectangles.
+
+        Args:
+            free (numpy.ndarray): `(height, width)` boolean mask of available compressed units.
+                Modified in place.
+
+        Returns:
+            (numpy.ndarray): `(N, 4)` int64 array of `start_x, start_y, end_x, end_y` of each
+                rectangle in compressed units.
+        """
+        return np.array(list(decompose(free)), dtype=np.int64).reshape(-1, 4)
+
+    def gather_islands(self):
+        """Groups the fertile zones into islands using the labeled compressed grid."""
+        axis_x, axis_y = self.compress()
+        bounds = self.fertile_zones.bounds()
+        labels, _ = label_regions(rasterize_compressed(bounds, axis_x, axis_y))
+        # Find the compressed unit each zone starts in.
+        x = np.searchsorted(axis_x, bounds[:, 0], side="right") - 1
+        y = np.searchsorted(axis_y, bounds[:, 1], side="right") - 1
+        self.islands = group_islands(bounds, labels[y, x])
+
+    def compress(self):
+        """Finds the distinct zone edges along each axis of the field.
+
+        Returns:
+            (tuple[numpy.ndarray]): `(axis_x, axis_y)` sorted edges, including 0 and the size of
+                the field. Compressed unit `i` covers `axis[i]` up to `axis[i + 1]`.
+        """
+        bounds = np.concatenate((self.barren_zones.bounds(), self.fertile_zones.bounds()))
+        axis_x = np.concatenate(([0, self.width], bounds[:, 0], bounds[:, 2] + 1))
+        axis_y = np.concatenate(([0, self.height], bounds[:, 1], bounds[:, 3] + 1))
+        return (np.unique(np.clip(axis_x, 0, self.width)),
+                np.unique(np.clip(axis_y, 0, self.height)))
+
+
+def rasterize(zones, width, height):
+    """Burns zones into a boolean occupancy mask.
+
+    Args:
+        zones (iterable[Zone]|ZoneStore|numpy.ndarray): The zones to rasterize.
+        width (int): The width of the mask.
+        height (int): The height of the mask.
+
+    Returns:
+        mask (numpy.ndarray): `(height, width)` mask that is True within any of the zones.
+    """
+    mask = np.zeros((height, width), dtype=bool)
+    for start_x, start_y, end_x, end_y in bounds_array(zones).tolist():
+        # Clip to the field so negative ends don't wrap around.
+        mask[max(start_y, 0):max(end_y + 1, 0), max(start_x, 0):max(end_x + 1, 0)] = True
+    return mask
+
+
+def rasterize_compressed(zones, axis_x, axis_y):
+    """Burns zones into a boolean mask of a compressed grid.
+
+    Args:
+        zones (iterable[Zone]|ZoneStore|numpy.ndarray): The zones to rasterize. Their edges must
+            be part of the axes.
+        axis_x (numpy.ndarray): Sorted x edges of the compressed grid.
+        axis_y (numpy.ndarray): Sorted y edges of the compressed grid.
+
+    Returns:
+        mask (numpy.ndarray): Mask of `(len(axis_y) - 1, len(axis_x) - 1)` compressed units.
+    """
+    bounds = bounds_array(zones)
+    start_x = np.searchsorted(axis_x, np.clip(bounds[:, 0], axis_x[0], axis_x[-1]))
+    start_y = np.searchsorted(axis_y, np.clip(bounds[:, 1], axis_y[0], axis_y[-1]))
+    end_x = np.searchsorted(axis_x, np.clip(bounds[:, 2] + 1, axis_x[0], axis_x[-1]))
+    end_y = np.searchsorted(axis_y, np.clip(bounds[:, 3] + 1, axis_y[0], axis_y[-1]))
+    valid = (start_x < end_x) & (start_y < end_y)
+    covered = burn_corners((len(axis_y), len(axis_x)), start_x[valid], start_y[valid],
+                           end_x[valid], end_y[valid])
+    return covered[:-1, :-1] > 0
+
+
+def decompose(free):
+    """Splits the free units of a mask into rectangles, marking them as used along the way.
+
+    Notes:
+        Follows the same column major scan as `Field.check_zones`, extending each zone to the
+        right first and then down, so the zones match the ones from the pure python Field.
+
+    Args:
+        free (numpy.ndarray): `(height, width)` boolean mask of available units. Modified in place.
+
+    Yields:
+        (tuple[int]): `(start_x, start_y, end_x, end_y)` of each zone.
+    """
+    height, width = free.shape
+    for x in range(width):
+        column = np.flatnonzero(free[:, x])
+        i = 0
+        while i < len(column):
+            y = int(column[i])
+            end_x = x + _leading(lambda a, b: free[y, x + a:x + b], width - x) - 1
+            end_y = y + _leading(lambda a, b: free[y + a:y + b, x:end_x + 1].all(axis=1),
+                                 height - y) - 1
+            free[y:end_y + 1, x:end_x + 1] = False
+            yield x, y, end_x, end_y
+            # Skip the units of this column that the new zone just used.
+            i = int(np.searchsorted(column, end_y, side="right"))
+
+
+def _leading(values, limit):
+    """Counts the leading True values of a lazily sliced boolean vector.
+
+    Notes:
+        Slices are taken in doubling chunks so the cost follows the length of the run rather
+        than the remaining size of the field.
+
+    Args:
+        values (callable): Returns the boolean values between `(start, stop)`.
+        limit (int): The length of the vector.
+
+    Returns:
+        count (int): The amount of leading True values.
+    """
+    count = 0
+    step = 8
+    while count < limit:
+        stop = min(count + step, limit)
+        chunk = values(count, stop)
+        if not chunk.all():
+            return count + int(np.argmin(chunk))
+        count = stop
+        step *= 2
+    return count
+
+
+def label_regions(mask, diagonal=True):
+    """Labels the connected regions of a boolean mask.
+
+    Notes:
+        Works on the horizontal runs of each row, connecting the runs that overlap on adjacent
+        rows, so every step is vectorized.
+
+    Args:
+        mask (numpy.ndarray): `(height, width)` boolean mask to label.
+        diagonal (bool): Connect units that only touch by a corner, like `Zone.is_neighbor`.
+
+    Returns:
+        (tuple): `(labels, count)` where labels is an int32 array with 0 outside of the mask and
+            1..count for each region.
+    """
+    height, width = mask.shape
+    labels = np.zeros((height, width), dtype=np.int32)
+    padded = np.zeros((height, width + 2), dtype=np.int8)
+    padded[:, 1:-1] = mask
+    edges = np.diff(padded, axis=1)
+    rows, starts = np.nonzero(edges == 1)
+    ends = np.nonzero(edges == -1)[1]  # Exclusive
+    if not len(rows):
+        return labels, 0
+
+    # Find the runs of the previous row that overlap each run. Keys keep rows apart.
+    tolerance = 1 if diagonal else 0
+    stride = width + 2
+    start_keys = rows * stride + starts
+    end_keys = rows * stride + ends - 1
+    low = np.searchsorted(end_keys, start_keys - stride - tolerance, side="left")
+    high = np.searchsorted(start_keys, end_keys - stride + tolerance, side="right")
+    counts = np.maximum(high - low, 0)
+    run_a = np.repeat(np.arange(len(rows)), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    run_b = np.repeat(low, counts) + offsets
+
+    # Union the connected runs.
+    parent = _connect(len(rows), run_a, run_b)
+    _, run_labels = np.unique(parent, return_inverse=True)
+
+    # Paint the run labels back into the grid.
+    lengths = ends - starts
+    first = np.repeat(rows * width + starts - (np.cumsum(lengths) - lengths), lengths)
+    labels.ravel()[first + np.arange(lengths.sum())] = np.repeat(run_labels + 1, lengths)
+    return labels, int(run_labels.max()) + 1
+
+
+def _connect(count, node_a, node_b):
+    """Finds the connected components of a graph by hooking and pointer jumping.
+
+    Args:
+        count (int): Amount of nodes.
+        node_a (numpy.ndarray): First node of each edge.
+        node_b (numpy.ndarray): Second node of each edge.
+
+    Returns:
+        parent (numpy.ndarray): The smallest node of the component each node belongs to.
+    """
+    parent = np.arange(count)
+    while True:
+        root_a = parent[node_a]
+        root_b = parent[node_b]
+        split = root_a != root_b
+        if not split.any():
+            return parent
+        # Hook the larger root onto the smaller one.
+        np.minimum.at(parent, np.maximum(root_a, root_b)[split], np.minimum(root_a, root_b)[split])
+        # Flatten the trees so every node points at its root.
+        while True:
+            grand_parent = parent[parent]
+            if np.array_equal(grand_parent, parent):
+                break
+            parent = grand_parent
@@ -2,13 +2,17 @@ import sys
 import time
 import random
 import pathlib
+import numpy as np
 from PySide2.QtWidgets import (QApplication, QWidget, QMainWindow, QVBoxLayout, QHBoxLayout,
-                               QGraphicsView, QGraphicsScene, QPushButton, QSizePolicy, QLabel,
-                               QPlainTextEdit, QGroupBox)
-from PySide2.QtGui import Qt, QBrush, QColor, QIcon, QPen
-from PySide2.QtCore import QRect, QRectF
+                               QGraphicsView, QGraphicsScene, QGraphicsItem, QGraphicsRectItem,
+                               QPushButton, QSizePolicy, QLabel, QPlainTextEdit, QGroupBox,
+                               QCheckBox)
+from PySide2.QtGui import Qt, QBrush, QColor, QIcon, QImage, QPen
+from PySide2.QtCore import QRect, QRectF, QThread, QTimer, Signal
 
 from barren_lands import land, utils
+from barren_lands.cache import AnalysisCache
+from barren_lands.visualize import island_labels, palette
 
 
 class BarrenButton(QPushButton):
@@ -31,12 +35,12 @@ class BarrenButton(QPushButton):
 class ResultLabel(QLabel):
     """Custom label to help visualize the zone this result comes from."""
 
-    def __init__(self, label, rectangle, zone, parent=None):
+    def __init__(self, label, item, zone, parent=None):
         """Initialization fo the ResultLabel.
 
         Args:
             label (str): Text to display on the label.
-            rectangle (QGraphicsItem): The rectangle that is within the canvas.
+            item (FertileItem): The item that draws the zone within the canvas.
             zone (Zone): The zone data.
             parent (QWidget): Parent widget.
         """
@@ -44,38 +48,321 @@ class ResultLabel(QLabel):
         self.setAlignment(Qt.AlignCenter)
         self.setCursor(Qt.PointingHandCursor)
         self.setMinimumHeight(20)
-        self.rectangle = rectangle
+        self.item = item
         self.zone = zone
-        self.hover_pen = QPen(QColor(120, 220, 120))
-        self.base_pen = Qt.NoPen
 
     def enterEvent(self, event):
-        """Sets the corresponding rectangle's color to hove.
+        """Outlines the corresponding zone on the canvas.
 
         Args:
             event (QEvent): The event handler.
         """
-        self.rectangle.setPen(self.hover_pen)
+        self.item.set_highlight(self.zone)
 
     def leaveEvent(self, event):
-        """Sets the corresponding rectangle's color back to default.
+        """Removes the outline of the corresponding zone.
 
         Args:
             event (QEvent): The event handler.
         """
-        self.rectangle.setPen(self.base_pen)
+        self.item.set_highlight(None)
+
+
+class FertileItem(QGraphicsItem):
+    """Draws all fertile zones of a field as a single image on the canvas.
+
+    Notes:
+        The image is built from an island label buffer in one go, instead of adding a
+        QGraphicsRectItem per zone. Hovering looks the zone under the cursor up in the
+        spatial index of the fertile zones.
+    """
+
+    fertile_color = (90, 220, 90, 150)
+    no_go_color = (90, 220, 90, 50)
+
+    def __init__(self, field, pixels=None, parent=None):
+        """Initialization of the FertileItem.
+
+        Args:
+            field (Field): The analysed field to draw.
+            pixels (numpy.ndarray): The image from `fertile_pixels`, built if not provided.
+            parent (QGraphicsItem): Parent item.
+        """
+        QGraphicsItem.__init__(self, parent)
+        self.field = field
+        self.highlight = None
+        self.hover_pen = QPen(QColor(120, 220, 120))
+        self.pixels = None
+        self.image = QImage()
+        self.setAcceptHoverEvents(True)
+        self.set_field(field, pixels)
+
+    def recolor(self, seed=None):
+        """Rebuilds the image of the zones.
+
+        Args:
+            seed (int): Give every zone of the largest island a random color from this seed,
+                like the debug view. Colors by island if not provided.
+        """
+        self.set_pixels(fertile_pixels(self.field, seed=seed))
+
+    def set_field(self, field, pixels=None):
+        """Switches to the results of another analysis of the same field.
+
+        Args:
+            field (Field): The analysed field to draw.
+            pixels (numpy.ndarray): The image from `fertile_pixels`, built if not provided.
+        """
+        self.field = field
+        self.highlight = None
+        self.set_pixels(fertile_pixels(field) if pixels is None else pixels)
+
+    def set_pixels(self, pixels):
+        """Swaps the image, only repainting the part of the canvas that changed.
+
+        Args:
+            pixels (numpy.ndarray): `(height, width, 4)` RGBA image from `fertile_pixels`.
+        """
+        previous = self.pixels
+        # The image reads straight from the array, keep it around as long as the image.
+        self.pixels = pixels
+        height, width = pixels.shape[:2]
+        self.image = QImage(pixels.data, width, height, width * 4, QImage.Format_RGBA8888)
+        if previous is None or previous.shape != pixels.shape:
+            self.update()
+            return
+        changed = (previous != pixels).any(axis=2)
+        rows = np.flatnonzero(changed.any(axis=1))
+        columns = np.flatnonzero(changed.any(axis=0))
+        if len(rows):
+            self.update(QRectF(columns[0], rows[0], columns[-1] - columns[0] + 1,
+                               rows[-1] - rows[0] + 1))
+
+    def set_highlight(self, zone):
+        """Outlines a single zone.
+
+        Args:
+            zone (Zone): The zone to outline, None to remove the outline.
+        """
+        if zone != self.highlight:
+            self.highlight = zone
+            self.setToolTip(f"{zone.get_size()}" if zone else "")
+            self.update()
+
+    def boundingRect(self):
+        """Gets the area the item draws in.
+
+        Returns:
+            (QRectF): The whole field.
+        """
+        return QRectF(0, 0, self.field.width, self.field.height)
+
+    def paint(self, painter, option, widget=None):
+        """Draws the image and the outline of the highlighted zone.
+
+        Args:
+            painter (QPainter): The painter to draw with.
+            option (QStyleOptionGraphicsItem): The style options.
+            widget (QWidget): The widget that is painted on.
+        """
+        painter.drawImage(0, 0, self.image)
+        if self.highlight is not None:
+            painter.setPen(self.hover_pen)
+            painter.setBrush(Qt.NoBrush)
+            painter.drawRect(QRectF(self.highlight.start.x, self.highlight.start.y,
+                                    self.highlight.width(), self.highlight.height()))
+
+    def hoverMoveEvent(self, event):
+        """Outlines the zone under the cursor.
+
+        Args:
+            event (QGraphicsSceneHoverEvent): The event handler.
+        """
+        position = event.pos()
+        self.set_highlight(self.field.fertile_zones.find(
+            land.Coord(int(position.x()), int(position.y()))))
+
+    def hoverLeaveEvent(self, event):
+        """Removes the outline once the cursor leaves the zones.
+
+        Args:
+            event (QGraphicsSceneHoverEvent): The event handler.
+        """
+        self.set_highlight(None)
+
+
+def fertile_pixels(field, seed=None):
+    """Colors the islands of an analysed field into an RGBA image, safe to run on any thread.
+
+    Args:
+        field (Field): The analysed field.
+        seed (int): Give every zone of the largest island a random color from this seed, like
+            the debug view. Colors by island if not provided.
+
+    Returns:
+        (numpy.ndarray): `(height, width, 4)` uint8 RGBA image.
+    """
+    by_zone = seed is not None
+    labels, owners = island_labels(field.islands, field.width, field.height, by_zone=by_zone)
+    colors = np.zeros((len(owners), 4), dtype=np.uint8)
+    colors[1:] = FertileItem.no_go_color
+    largest = np.flatnonzero(owners == 0)
+    colors[largest] = FertileItem.fertile_color
+    if by_zone:
+        colors[largest, :3] = palette(len(largest), seed=seed)
+    return np.ascontiguousarray(colors[labels])
+
+
+class BarrenItem(QGraphicsRectItem):
+    """Rectangle of a barren zone that can be dragged around the canvas in live mode."""
+
+    def __init__(self, zone, moved, parent=None):
+        """Initialization of the BarrenItem.
+
+        Args:
+            zone (Zone): The barren zone to draw.
+            moved (callback): Called with this item once it was dragged somewhere else.
+            parent (QGraphicsItem): Parent item.
+        """
+        QGraphicsRectItem.__init__(self, zone.start.x, zone.start.y, zone.width(), zone.height(),
+                                   parent)
+        self.zone = zone
+        self.moved = moved
+        # Stay above the fertile zones so it can be picked up.
+        self.setZValue(1)
+
+    def moved_zone(self):
+        """Gets the zone at the place the rectangle was dragged to.
+
+        Returns:
+            (Zone): The zone moved by the offset of the rectangle, snapped to whole units.
+        """
+        offset_x, offset_y = round(self.pos().x()), round(self.pos().y())
+        return land.Zone(land.Coord(self.zone.start.x + offset_x, self.zone.start.y + offset_y),
+                         land.Coord(self.zone.end.x + offset_x, self.zone.end.y + offset_y))
+
+    def mouseReleaseEvent(self, event):
+        """Reports the new place of the rectangle once it is dropped.
+
+        Args:
+            event (QGraphicsSceneMouseEvent): The event handler.
+        """
+        QGraphicsRectItem.mouseReleaseEvent(self, event)
+        if self.moved_zone() != self.zone:
+            self.moved(self)
+
+
+class LiveThread(QThread):
+    """Brings a field up to date with edited barren zones, away from the UI thread.
+
+    Notes:
+        After the first full analysis only the barren zones that were added or removed are
+        applied with `Field.add_barren` and `Field.remove_barren`, which re-analyse the land
+        around them only.
+    """
+
+    updated = Signal(object, object)
+    failed = Signal(str)
+
+    def __init__(self, field, zones, full=False, parent=None):
+        """Initialization of the LiveThread.
+
+        Args:
+            field (Field): The field to update, owned by this thread until it is done.
+            zones (list[Zone]): All barren zones the field should have.
+            full (bool): Run a full analysis instead of applying the changes.
+            parent (QObject): Parent object.
+        """
+        QThread.__init__(self, parent)
+        self.field = field
+        self.zones = zones
+        self.full = full
+
+    def run(self):
+        """Updates the field, the outcome is sent through one of the signals.
+
+        Notes:
+            `updated` gets a copy of the field with its image, `failed` the error message.
+        """
+        try:
+            snapshot = self.update_field()
+        except Exception as error:
+            self.failed.emit(f"{type(error).__name__}: {error}")
+        else:
+            self.updated.emit(snapshot, fertile_pixels(snapshot))
+
+    def update_field(self):
+        """Brings the field up to date with the zones.
+
+        Returns:
+            (Field): A copy of the updated field.
+        """
+        field = self.field
+        if self.full:
+            field.barren_zones = self.zones
+            field.fertile_zones = set()
+            field.check_zones()
+        else:
+            wanted = set(self.zones)
+            current = set(field.barren_zones)
+            for zone in current - wanted:
+                field.remove_barren(zone)
+            for zone in wanted - current:
+                field.add_barren(zone)
+        # The UI gets its own copy, this field keeps changing with the next edits.
+        snapshot = land.Field(width=field.width, height=field.height)
+        snapshot.barren_zones = field.barren_zones
+        snapshot.fertile_zones = field.fertile_zones
+        snapshot.islands = [land.ZoneStore(island) for island in field.islands]
+        return snapshot
+
+
+class AnalysisThread(QThread):
+    """Runs the analysis of a field away from the UI thread."""
+
+    analysed = Signal(object)
+    cancelled = Signal()
+    failed = Signal(str)
+
+    def __init__(self, field, cache, parent=None):
+        """Initialization of the AnalysisThread.
+
+        Args:
+            field (Field): The field to analyse, owned by this thread until it is done.
+            cache (AnalysisCache): The cache to run the analysis through.
+            parent (QObject): Parent object.
+        """
+        QThread.__init__(self, parent)
+        self.field = field
+        self.cache = cache
+
+    def run(self):
+        """Runs the analysis, the outcome is sent through one of the signals."""
+        try:
+            self.cache.analyze(self.field)
+        except land.AnalysisCancelled:
+            self.cancelled.emit()
+        except Exception as error:
+            self.failed.emit(f"{type(error).__name__}: {error}")
+        else:
+            self.analysed.emit(self.field)
+
+    def cancel(self):
+        """Stops the analysis as soon as possible."""
+        self.field.cancel()
 
 
 class BarrenLandsWindow(QMainWindow):
     """User interface to interact with the barren lands library."""
 
-    def __init__(self, width=400, height=600, zones=None):
+    def __init__(self, width=400, height=600, zones=None, cache_path=None):
         """Initialization of BarrenLands GUI
 
         Args:
             width (int): The width of the canvas/field.
             height (int): The height of the canvas/field.
             zones (str): Text data to add to raw input if provided.
+            cache_path (str): File to keep analysis results in across sessions if provided.
         """
         QMainWindow.__init__(self)
         self.app = QApplication.instance()
@@ -88,13 +375,32 @@ class BarrenLandsWindow(QMainWindow):
         self.brush_barren = QBrush(QColor(120, 120, 75), Qt.Dense2Pattern)
         self.brush_overlay = QBrush(QColor(20, 20, 20, 35), Qt.SolidPattern)
         self.brush_innerlay = QBrush(QColor(32, 37, 44), Qt.SolidPattern)
-        self.brush_fertile = QBrush(QColor(90, 220, 90, 150), Qt.Dense5Pattern)
-        self.brush_fertile_no_go = QBrush(QColor(90, 220, 90, 150), Qt.BDiagPattern)
 
         # Setup the filed class that will handle our calculations.
         self.field = land.Field(width=self.canvas_width, height=self.canvas_height)
+        # Layouts that were analysed before are drawn straight from the cache.
+        self.cache = AnalysisCache(path=cache_path)
         self.barren_zones = list()
-        self.fertile_zones = list()
+        # All fertile zones are drawn by a single item.
+        self.fertile_item = None
+        # The analysis runs on its own thread, the results are drawn a frame at a time.
+        self.thread = None
+        self.running = False
+        self.pending = iter(())
+        self.total_area = 0
+        self.frame_budget = 0.012
+        self.draw_timer = QTimer(self)
+        self.draw_timer.timeout.connect(self.draw_batch)
+        # Live mode re-analyses shortly after the last edit.
+        self.live = False
+        self.live_field = None
+        self.live_thread = None
+        self.live_dirty = False
+        self.live_ready = False
+        self.live_timer = QTimer(self)
+        self.live_timer.setSingleShot(True)
+        self.live_timer.setInterval(250)
+        self.live_timer.timeout.connect(self.live_update)
 
         self.setup_window()
         self.build_core_ui()
@@ -109,6 +415,20 @@ class BarrenLandsWindow(QMainWindow):
         self.setWindowIcon(QIcon(utils.get_icon()))
         self.setStyleSheet(utils.get_css())
 
+    def closeEvent(self, event):
+        """Writes out the cache before the window closes.
+
+        Args:
+            event (QCloseEvent): The event handler.
+        """
+        if self.thread is not None:
+            self.thread.cancel()
+            self.thread.wait()
+        if self.live_thread is not None:
+            self.live_thread.wait()
+        self.cache.close()
+        QMainWindow.closeEvent(self, event)
+
     def build_core_ui(self):
         """Sets up the core elements of this window.
 
@@ -158,6 +478,11 @@ class BarrenLandsWindow(QMainWindow):
         # Create the buttons
         self.btn_add_bzone = BarrenButton(label="Add", parent=self, cmd=self.ctl_add_input)
         self.btn_run = BarrenButton(label="Analyze", parent=self, cmd=self.ctl_run)
+        self.btn_cancel = BarrenButton(label="Cancel", parent=self, cmd=self.ctl_cancel)
+        self.btn_cancel.setEnabled(False)
+        self.chk_live = QCheckBox("Live", self)
+        self.chk_live.setToolTip("Re-analyze while editing the input or dragging barren zones.")
+        self.chk_live.toggled.connect(self.ctl_live)
         # Build the utility buttons
         self.layout_btm_btn = QHBoxLayout()
         self.layout_btm_btn.setContentsMargins(0, 0, 0, 0)
@@ -172,6 +497,8 @@ class BarrenLandsWindow(QMainWindow):
         self.layout_controls.addLayout(self.input)
         self.layout_controls.addWidget(self.btn_add_bzone)
         self.layout_controls.addWidget(self.btn_run)
+        self.layout_controls.addWidget(self.btn_cancel)
+        self.layout_controls.addWidget(self.chk_live)
         self.layout_controls.addWidget(self.results_grp)
         self.layout_controls.addWidget(self.lbl_area)
         self.layout_controls.addLayout(self.layout_btm_btn)
@@ -205,6 +532,7 @@ class BarrenLandsWindow(QMainWindow):
         self.raw_input.setPlaceholderText('example: "0 292 399 307"')
         if self.user_input:
             self.raw_input.setPlainText(self.user_input)
+        self.raw_input.textChanged.connect(self.on_input_changed)
         self.layout_input = QVBoxLayout()
         self.layout_input.setContentsMargins(0, 0, 0, 0)
         layout_base.addWidget(self.raw_input)
@@ -213,12 +541,8 @@ class BarrenLandsWindow(QMainWindow):
 
     def ctr_debug(self):
         """CONTROL: Called by the 'debug' button to randomly assign colors to the zones."""
-        for result in self.results:
-            rand_color = [random.randint(0, 255) for i in range(3)]
-            rand_color = QColor(*rand_color)
-            brush = QBrush(rand_color, Qt.Dense5Pattern)
-            result.rectangle.setBrush(brush)
-            result.base = brush
+        if self.fertile_item is not None:
+            self.fertile_item.recolor(seed=random.randint(0, 2 ** 31))
 
     def ctl_add_input(self):
         """CONTROL: Called by the 'Add' button to handle parsing the raw input."""
@@ -230,57 +554,256 @@ class BarrenLandsWindow(QMainWindow):
                 end_coord = land.Coord(user_input[2], user_input[3])
                 zone = land.Zone(start_coord, end_coord)
                 self.field.add_zone(zone, barren=True)
-                self.draw_zone(zone, barren=True)
+                self.draw_zone(zone)
 
     def ctl_run(self):
-        """CONTROL: Called by the 'Run' button to initialize the final analysis."""
+        """CONTROL: Called by the 'Run' button to start the analysis on a worker thread."""
         # Make sure some values are cleared ahead of the analysis.
         self.clear_results()
-        for rectangle in self.fertile_zones:
-            self.scene.removeItem(rectangle)
+        self.remove_fertile_item()
         self.field.fertile_zones = set()
 
-        # Run the analysis
-        self.field.check_zones()
-        total_area = 0
-        # Format and draw the results in the QGraphicsScene.
-        for i, island in enumerate(self.field.islands):
-            for zone in island:
-                rectangle = self.draw_zone(zone)
-                size = zone.get_size()
-                if i == 0:  # Only add (largest) island to results. Always at 0.
-                    total_area += size
-                    self.results.add(ResultLabel(label=str(size), rectangle=rectangle, zone=zone))
-                else:
-                    # This zone is fertile, but Inaccessible.
-                    rectangle.setBrush(self.brush_fertile_no_go)
-                self.canvas.update()
-                # Pain the update for the user to see the new zone.
-                self.app.processEvents()
-                # Dont show all at the same time. (For more pleasing visual)
-                time.sleep(.015)
+        # Analyse a copy so the UI never reads a field that is being changed.
+        field = land.Field(width=self.canvas_width, height=self.canvas_height)
+        field.barren_zones = self.field.barren_zones
+        self.thread = AnalysisThread(field, self.cache, self)
+        self.thread.analysed.connect(self.on_analysed)
+        self.thread.cancelled.connect(self.on_cancelled)
+        self.thread.failed.connect(self.on_failed)
+        self.set_running(True)
+        self.lbl_island.setText("Analyzing...")
+        self.thread.start()
+
+    def ctl_cancel(self):
+        """CONTROL: Called by the 'Cancel' button to stop the analysis or the drawing of it."""
+        if self.thread is not None and self.thread.isRunning():
+            # The thread reports back through on_cancelled.
+            self.thread.cancel()
+            return
+        self.draw_timer.stop()
+        self.pending = iter(())
+        self.on_cancelled()
+
+    def on_analysed(self, field):
+        """Takes over the results of the worker thread and starts drawing them.
+
+        Args:
+            field (Field): The analysed field.
+        """
+        if self.thread is None or field is not self.thread.field:
+            # Cancelled after the thread was already done, drop the late result.
+            return
+        self.thread = None
+        self.present(field)
+
+    def present(self, field, pixels=None):
+        """Shows the results of an analysis and starts drawing their labels.
+
+        Args:
+            field (Field): The analysed field.
+            pixels (numpy.ndarray): The image from `fertile_pixels`, built if not provided.
+        """
+        self.clear_results()
+        self.field.fertile_zones = field.fertile_zones
+        self.field.islands = field.islands
+        if self.fertile_item is None:
+            self.fertile_item = FertileItem(self.field, pixels)
+            self.scene.addItem(self.fertile_item)
+        else:
+            # Keep the item, only the parts of the image that changed are repainted.
+            self.fertile_item.set_field(self.field, pixels)
+        # Only the (largest) island gets result labels. Always at 0.
+        largest = field.islands[0] if field.islands else ()
+        self.total_area = self.field.get_island_volume(largest)
+        self.pending = iter(largest)
+        self.running = True
+        self.draw_timer.start(0)
+
+    def ctl_live(self, live):
+        """CONTROL: Called by the 'Live' check box to re-analyse while editing.
+
+        Args:
+            live (bool): True to turn live mode on.
+        """
+        self.live = live
+        for rectangle in self.barren_zones:
+            rectangle.setFlag(QGraphicsItem.ItemIsMovable, live)
+        self.set_running(self.running)
+        if live:
+            # The first update analyses the whole field, the next ones only apply the edits.
+            self.live_field = land.Field(width=self.canvas_width, height=self.canvas_height)
+            self.live_ready = False
+            self.live_timer.start()
+        else:
+            self.live_timer.stop()
+
+    def on_input_changed(self):
+        """Restarts the live update countdown, so it runs once the typing stops."""
+        if self.live:
+            self.live_timer.start()
+
+    def on_barren_moved(self, rectangle):
+        """Writes a dragged barren zone back into the input, which triggers a live update.
+
+        Args:
+            rectangle (BarrenItem): The dropped rectangle.
+        """
+        zone = rectangle.moved_zone()
+        lines = list()
+        for item in self.barren_zones:
+            moved = zone if item is rectangle else item.zone
+            lines.append(f'"{moved.start.x} {moved.start.y} {moved.end.x} {moved.end.y}"')
+        self.raw_input.setPlainText(", ".join(lines))
+
+    def live_update(self):
+        """Analyses the zones of the input on a worker thread, called by the live timer."""
+        if self.live_thread is not None:
+            # Catch up once the running update is done.
+            self.live_dirty = True
+            return
+        self.live_dirty = False
+        zones = self.parse_input()
+        if zones is None:
+            # Still typing, wait for the input to make sense.
+            return
+        for rectangle in self.barren_zones:
+            self.scene.removeItem(rectangle)
+        self.barren_zones = list()
+        self.field.barren_zones = zones
+        for zone in zones:
+            self.draw_zone(zone)
+        self.live_thread = LiveThread(self.live_field, zones, full=not self.live_ready, parent=self)
+        self.live_thread.updated.connect(self.on_live_updated)
+        self.live_thread.failed.connect(self.on_live_failed)
+        self.live_ready = True
+        self.live_thread.start()
+
+    def on_live_updated(self, field, pixels):
+        """Shows the results of a live update.
+
+        Args:
+            field (Field): Copy of the updated field.
+            pixels (numpy.ndarray): The image of its islands.
+        """
+        self.live_thread.wait()
+        self.live_thread = None
+        if self.live:
+            self.present(field, pixels)
+        if self.live_dirty:
+            self.live_update()
+
+    def on_live_failed(self, message):
+        """Called when a live update raised an error, the next update starts over.
 
+        Args:
+            message (str): The error message.
+        """
+        self.live_thread.wait()
+        self.live_thread = None
+        # The field may be half updated, analyse it from scratch next time.
+        self.live_field = land.Field(width=self.canvas_width, height=self.canvas_height)
+        self.live_ready = False
+        self.lbl_island.setText(f"Island Areas: failed, {message}")
+        if self.live_dirty:
+            self.live_update()
+
+    def parse_input(self):
+        """Reads the barren zones from the input box.
+
+        Returns:
+            (list[Zone]): The zones, None if the input can not be parsed or has zones that are
+                reversed or out of the int32 range.
+        """
+        raw_data = self.raw_input.toPlainText()
+        if not raw_data.strip():
+            return list()
+        try:
+            parsed_input = utils.format_raw_input(raw_data)
+            zones = [land.Zone(land.Coord(x1, y1), land.Coord(x2, y2))
+                     for x1, y1, x2, y2 in parsed_input]
+        except (ValueError, IndexError):
+            return None
+        for zone in zones:
+            if zone.start.x > zone.end.x or zone.start.y > zone.end.y:
+                return None
+            if min(zone.start.x, zone.start.y) < -2 ** 31 or max(zone.end.x, zone.end.y) >= 2 ** 31:
+                return None
+        return zones
+
+    def on_cancelled(self):
+        """Called once the analysis stopped after a cancel."""
+        self.thread = None
+        self.set_running(False)
+        self.lbl_island.setText("Island Areas: cancelled")
+
+    def on_failed(self, message):
+        """Called when the analysis raised an error.
+
+        Args:
+            message (str): The error message.
+        """
+        self.thread = None
+        self.set_running(False)
+        self.lbl_island.setText(f"Island Areas: failed, {message}")
+
+    def draw_batch(self):
+        """Creates as many result labels as fit in a single frame, called by the draw timer."""
+        deadline = time.perf_counter() + self.frame_budget
+        for zone in self.pending:
+            self.results.add(ResultLabel(label=str(zone.get_size()), item=self.fertile_item,
+                                         zone=zone))
+            if time.perf_counter() > deadline:
+                # Let Qt paint this batch, the timer brings us back for the next one.
+                return
+        self.draw_timer.stop()
+        self.show_results()
+
+    def show_results(self):
+        """Fills in the labels and the results group once all result labels are created."""
         # Print islands, smallest to largest.
         print("Islands", self.field.islands_as_area())
         island_areas = " ".join(str(i) for i in self.field.islands_as_area())
         self.lbl_island.setText(f"Island Areas: {island_areas}")
         # Set the label as the total area as the largest island.
-        self.lbl_area.setText(f"Total Area: {total_area}")
+        self.lbl_area.setText(f"Total Area: {self.total_area}")
 
         # Sort the results by their zones area.
         for result in sorted(self.results, key=lambda x: x.zone.get_size()):
             # Add the result to the results layout in the UI
             self.layout_results.addWidget(result)
+        self.set_running(False)
+
+    def set_running(self, running):
+        """Enables the controls that are safe to use while analysing or not.
+
+        Args:
+            running (bool): True while an analysis or its drawing is in progress.
+        """
+        self.running = running
+        # Live mode analyses by itself, Add and Run would fight with it.
+        for button in (self.btn_add_bzone, self.btn_run):
+            button.setEnabled(not running and not self.live)
+        self.btn_reset.setEnabled(not running)
+        self.btn_cancel.setEnabled(running)
+
+    def wait_for_run(self):
+        """Blocks until the analysis and the drawing are done, handy for scripts and tests."""
+        while self.running:
+            self.app.processEvents()
+            time.sleep(0.001)
 
     def ctl_clear_zones(self):
         """CONTROL: Called by the 'Reset' button to handle resetting the data and graphics."""
-        for rectangle in self.barren_zones + self.fertile_zones:
+        for rectangle in self.barren_zones:
             self.scene.removeItem(rectangle)
+        self.remove_fertile_item()
         self.field.fertile_zones = set()
-        self.fertile_zones = list()
         self.field.barren_zones = set()
         self.barren_zones = list()
         self.clear_results()
+        if self.live:
+            self.live_field = land.Field(width=self.canvas_width, height=self.canvas_height)
+            self.live_ready = False
 
     def clear_results(self):
         """Clears the results set in preparation for incoming new results."""
@@ -290,28 +813,28 @@ class BarrenLandsWindow(QMainWindow):
         self.lbl_area.setText("Total Area:")
         self.lbl_island.setText("Island Areas:")
 
-    def draw_zone(self, zone, barren=False):
-        """Creates a QGraphicsRecItem from a Zone and adds it to the scene.
+    def remove_fertile_item(self):
+        """Removes the drawn fertile zones from the canvas."""
+        if self.fertile_item is not None:
+            self.scene.removeItem(self.fertile_item)
+            self.fertile_item = None
+
+    def draw_zone(self, zone):
+        """Creates a QGraphicsRecItem from a barren Zone and adds it to the scene.
 
         Args:
             zone (Zone): The zone to generate the rectangle from.
-            barren (bool): barren colors if True else fertile color.
 
         Returns:
             (QGraphicsRecItem): The drown rectangle that is added to the canvas.
         """
         # Build the QGraphicsRecItem from the zone data.
-        rectangle = self.scene.addRect(zone.start.x, zone.start.y,
-                                       zone.end.x - zone.start.x + 1,
-                                       zone.end.y - zone.start.y + 1)
-        if barren:
-            self.barren_zones.append(rectangle)
-            brush = self.brush_barren
-        else:
-            self.fertile_zones.append(rectangle)
-            brush = self.brush_fertile
+        rectangle = BarrenItem(zone, self.on_barren_moved)
+        rectangle.setFlag(QGraphicsItem.ItemIsMovable, self.live)
+        self.scene.addItem(rectangle)
+        self.barren_zones.append(rectangle)
         # Apply the color to the rectangle item.
-        rectangle.setBrush(brush)
+        rectangle.setBrush(self.brush_barren)
         # Remove the default border
         rectangle.setPen(Qt.NoPen)
         return rectangle
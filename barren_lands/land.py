@@ -1,7 +1,16 @@
-from itertools import product, combinations
+import bisect
+from array import array
 from collections import defaultdict
+from collections.abc import MutableSet
 
-from .visualize import display_image
+import numpy as np
+
+from .profiling import PhaseStats
+from .structures import ZoneIndex, DisjointSet, SummedAreaTable
+
+
+class AnalysisCancelled(Exception):
+    """Raised by `Field.check_zones` when the analysis was cancelled with `Field.cancel`."""
 
 
 class Field(object):
@@ -19,6 +28,30 @@ class Field(object):
         self.barren_zones = set()
         self.fertile_zones = set()
         self.islands = list()
+        self._barren_table = None
+        self._island_labels = None
+        self._cancelled = False
+        # Time spent in each phase, see `PhaseStats`.
+        self.stats = PhaseStats()
+
+    @property
+    def barren_zones(self):
+        """ZoneSet: The barren zones of the field, assigning any iterable of zones re-indexes."""
+        return self._barren_zones
+
+    @barren_zones.setter
+    def barren_zones(self, zones):
+        self._barren_zones = ZoneSet(zones, self.width, self.height)
+        self._barren_table = None
+
+    @property
+    def fertile_zones(self):
+        """ZoneSet: The fertile zones of the field, assigning any iterable of zones re-indexes."""
+        return self._fertile_zones
+
+    @fertile_zones.setter
+    def fertile_zones(self, zones):
+        self._fertile_zones = ZoneSet(zones, self.width, self.height)
 
     def check_coord(self, coord):
         """Checks to see if the Coordinate is within a barren or fertile zone.
@@ -29,20 +62,80 @@ class Field(object):
         Returns:
             True if fertile else False
         """
-        for zone in self.barren_zones:  # type: Zone
-            if zone.contains(coord):
-                # If any barren land touches this zone, return False.
-                return False
-        for zone in self.fertile_zones:
-            if zone.contains(coord):  # type: Zone
-                # We already used this coord, return False.
-                return False
-        if not self.zone.contains(coord):
+        return self.is_free(coord.x, coord.y)
+
+    def is_free(self, x, y):
+        """Same as `check_coord` without the need of a Coord.
+
+        Args:
+            x (int): The x coordinate to check.
+            y (int): The y coordinate to check.
+
+        Returns:
+            True if fertile else False
+        """
+        if not (0 <= x < self.width and 0 <= y < self.height):
             # We are outside the field. Turn that tractor around.
             return False
+        if self.barren_zones.covers(x, y):
+            # If any barren land touches this zone, return False.
+            return False
+        if self.fertile_zones.covers(x, y):
+            # We already used this coord, return False.
+            return False
         # Not used, all good.
         return True
 
+    def is_area_free(self, start_x, start_y, end_x, end_y):
+        """Checks to see if a whole rectangle is inside the field and not barren or used.
+
+        Notes:
+            The barren units are counted with the summed-area table in constant time, the used
+            units are checked against the fertile zones through their index.
+
+        Args:
+            start_x (int): The first x coordinate of the rectangle.
+            start_y (int): The first y coordinate of the rectangle.
+            end_x (int): The last x coordinate of the rectangle.
+            end_y (int): The last y coordinate of the rectangle.
+
+        Returns:
+            True if every unit is fertile and free else False
+        """
+        if not (0 <= start_x <= end_x < self.width and 0 <= start_y <= end_y < self.height):
+            return False
+        if self.barren_table().count(start_x, start_y, end_x, end_y):
+            return False
+        return not self.fertile_zones.intersects(start_x, start_y, end_x, end_y)
+
+    def barren_table(self):
+        """Gets the summed-area table of the barren units, rebuilt when the barren zones change.
+
+        Returns:
+            (SummedAreaTable): The table of the current barren zones.
+        """
+        changes = self.barren_zones.changes
+        if self._barren_table is None or self._barren_table[0] != changes:
+            table = SummedAreaTable(self.width, self.height, self.barren_zones.bounds())
+            self._barren_table = (changes, table)
+        return self._barren_table[1]
+
+    def normalize_barren(self):
+        """Replaces the barren zones by the fewest rectangles covering the same land.
+
+        Notes:
+            See `normalize_zones`. Run it before `check_zones`, the zones removed here can no
+            longer be removed with `remove_barren`.
+
+        Returns:
+            (int): How many barren zones fewer there are.
+        """
+        count = len(self.barren_zones)
+        with self.stats.phase("insert"):
+            bounds = normalize_zones(self.barren_zones, self.width, self.height)
+            self.barren_zones = ZoneStore.from_bounds(bounds)
+        return count - len(self.barren_zones)
+
     def add_zone(self, zone, barren=False):
         """Adds a zone to the appropriate zone list.
 
@@ -56,13 +149,38 @@ class Field(object):
             self.fertile_zones.add(zone)
 
     def check_zones(self):
-        """Runs the final calculation to mark the zones."""
-        for x, y in product(range(0, self.width), range(0, self.height)):
-            current_coord = Coord(x, y)
-            if self.check_coord(current_coord):
-                self.mark_zone(current_coord)
+        """Runs the final calculation to mark the zones.
+
+        Raises:
+            AnalysisCancelled: If `cancel` was called, checked between columns.
+        """
+        with self.stats.phase("mark"):
+            for x in range(0, self.width):
+                if self._cancelled:
+                    raise AnalysisCancelled(f"Cancelled at column {x} of {self.width}.")
+                y = 0
+                while y < self.height:
+                    coord = Coord(x, y)
+                    # Jump over the zones that already cover the column.
+                    zone = self.barren_zones.find(coord) or self.fertile_zones.find(coord)
+                    if zone is None:
+                        zone = self.mark_zone(coord)
+                    y = zone.end.y + 1
         # Partition zones into their respective islands.
-        self.gather_islands()
+        with self.stats.phase("islands"):
+            self.gather_islands()
+
+    def cache_kind(self):
+        """Names the way this field splits its land, fields of the same kind give the same zones.
+
+        Returns:
+            (str): The kind used in the cache key of the analysis.
+        """
+        return type(self).__name__
+
+    def cancel(self):
+        """Asks a running `check_zones` to stop, meant to be called from another thread."""
+        self._cancelled = True
 
     def mark_zone(self, zone_start):
         """Marks a zone from an input coordinate.
@@ -83,47 +201,129 @@ class Field(object):
         """Handles taking the final zones and grouping them into islands of connected zones.
 
         Notes:
+            Neighbours are found with a sweep over the zone edges and merged with a union-find,
+            instead of checking every pair of zones.
             https://stackoverflow.com/questions/2254697/how-can-i-group-an-array-of-rectangles-into-islands-of-connected-regions
         """
-        neighbours = defaultdict(set)
-        self.islands = list()
-        visited = set()
-        # Get all zone pairs and check to see if they are neighbors.
-        for zone in self.fertile_zones:
-            for n_zone in self.fertile_zones:
-                if zone != n_zone and zone.is_neighbor(n_zone):
-                    neighbours[zone.id()].add(n_zone)
-        # Re-iterate over the fertile zones
-        for zone in self.fertile_zones:
-            if zone.id() not in visited:
-                island_zones = set()
-                zone_que = set()
-                zone_que.add(zone)
-                while zone_que:
-                    z = zone_que.pop()
-                    for n in neighbours.get(z.id(), [z]):
-                        if n.id() not in visited:
-                            # This is a neighbour, add it to our island set.
-                            island_zones.add(n)
-                            # Mark that we have visited this zone
-                            visited.add(n.id())
-                            # Add the neighbour to the Que to then check for it's neighbours.
-                            zone_que.add(n)
-                if island_zones:
-                    self.islands.append(island_zones)
-        # Sort the island list from largest to smallest area
-        self.islands.sort(key=lambda i: self.get_island_volume(i), reverse=True)
+        self.islands = find_islands(self.fertile_zones.bounds())
+
+    def add_barren(self, zone):
+        """Adds a barren zone to an analysed field, only re-analysing the land it covers.
+
+        Notes:
+            Expects `check_zones` to have run. The fertile zones under the new barren zone are
+            cut around it and only the islands they belonged to are grouped again.
+
+        Args:
+            zone (Zone): The barren zone to add.
+        """
+        self.add_zone(zone, barren=True)
+        covered = self.fertile_zones.overlapping(zone)
+        pieces = [piece for fertile in covered for piece in fertile.subtract(zone)]
+        self.update_islands(covered, pieces)
+
+    def remove_barren(self, zone):
+        """Removes a barren zone from an analysed field, only re-analysing the land it frees up.
+
+        Notes:
+            Expects `check_zones` to have run. The land of the zone that is not covered by any
+            other barren zone turns into new fertile zones, merging the islands around it.
+
+        Args:
+            zone (Zone): The barren zone to remove.
+
+        Raises:
+            KeyError: If the zone is not a barren zone of this field.
+        """
+        self.barren_zones.remove(zone)
+        freed = zone.intersection(self.zone)
+        pieces = [freed] if freed else list()
+        for barren in self.barren_zones.overlapping(zone):
+            pieces = [piece for free in pieces for piece in free.subtract(barren)]
+        self.update_islands(list(), pieces)
+
+    def update_islands(self, removed, added):
+        """Swaps out fertile zones and re-groups only the islands they touch.
+
+        Notes:
+            The islands hit by the removed zones and by the zones next to the new ones are
+            looked up by their zones, grouped again and put back in order of their area.
+
+        Args:
+            removed (list[Zone]): Fertile zones that are no longer fertile.
+            added (list[Zone]): New fertile zones.
+        """
+        labels, keys = self.island_labels()
+        # The islands of the removed zones and of the zones next to the new ones change.
+        probes = list(removed)
+        for zone in removed:
+            self.fertile_zones.discard(zone)
+        for zone in added:
+            probes.extend(self.fertile_zones.overlapping(Zone(
+                Coord(zone.start.x - 1, zone.start.y - 1), Coord(zone.end.x + 1, zone.end.y + 1))))
+        for zone in added:
+            self.add_zone(zone)
+
+        changed = dict()
+        for zone in probes:
+            island = labels[(zone.start.x, zone.start.y, zone.end.x, zone.end.y)]
+            changed[id(island)] = island
+        bounds = [bounds_array(added)]
+        for island in changed.values():
+            # Islands are sorted by area, only the islands of the same area need a look.
+            index = bisect.bisect_left(keys, -island.area())
+            while self.islands[index] is not island:
+                index += 1
+            del self.islands[index]
+            del keys[index]
+            bounds.append(island.bounds())
+        bounds = np.concatenate(bounds)
+        # Drop the removed zones from the islands that held them.
+        gone = set((z.start.x, z.start.y, z.end.x, z.end.y) for z in removed)
+        for key in gone:
+            labels.pop(key, None)
+        bounds = bounds[[tuple(b) not in gone for b in bounds.tolist()]].reshape(-1, 4)
+        for island in find_islands(bounds):
+            key = -island.area()
+            index = bisect.bisect_right(keys, key)
+            self.islands.insert(index, island)
+            keys.insert(index, key)
+            for zone in zip(island.start_x, island.start_y, island.end_x, island.end_y):
+                labels[zone] = island
+
+    def island_labels(self):
+        """Gets the island of every fertile zone, rebuilt when the islands were replaced.
+
+        Notes:
+            The islands are sorted from largest to smallest area on a rebuild, the list itself
+            is kept so the labels stay valid while `update_islands` edits it in place.
+
+        Returns:
+            (tuple): The island of each zone by its `start_x, start_y, end_x, end_y` and the
+                negative area of each island, in the order of the islands.
+        """
+        if self._island_labels is None or self._island_labels[0] is not self.islands:
+            self.islands.sort(key=self.get_island_volume, reverse=True)
+            labels = dict()
+            for island in self.islands:
+                for zone in zip(island.start_x, island.start_y, island.end_x, island.end_y):
+                    labels[zone] = island
+            keys = [-self.get_island_volume(island) for island in self.islands]
+            self._island_labels = (self.islands, labels, keys)
+        return self._island_labels[1:]
 
     @staticmethod
     def get_island_volume(island):
         """Get the volume of an list of zones.
 
         Args:
-            island (list[Zone]): List of zones that make up the island.
+            island (ZoneStore|list[Zone]): Zones that make up the island.
 
         Returns:
             (int): The volume of the island.
         """
+        if isinstance(island, ZoneStore):
+            return island.area()
         return sum(zone.get_size() for zone in island)
 
     def islands_as_area(self):
@@ -132,11 +332,10 @@ class Field(object):
         Returns:
             volume_list (list[int]): List of each islands area sorted from smallest to largest.
         """
-        volume_list = list()
-        for island in self.islands:
-            volume_list.append(self.get_island_volume(island))
-        volume_list.sort()
-        return volume_list
+        with self.stats.phase("sort"):
+            volume_list = np.array([self.get_island_volume(i) for i in self.islands],
+                                   dtype=np.int64)
+            return np.sort(volume_list).tolist()
 
     def get_end(self, coord):
         """Gets the last unmarked coordinate in the same row.
@@ -147,14 +346,9 @@ class Field(object):
         Returns:
             end (Coord): The last available coordinate.
         """
-        end = coord.copy()
-        for i in range(coord.x, self.width + 1):
-            # If end is still within the field
-            if self.check_coord(end.right()):
-                end.x += 1
-            else:
-                break
-        return end
+        end_x = _grow(lambda x: self.is_area_free(coord.x, coord.y, x, coord.y),
+                      coord.x, self.width - 1)
+        return Coord(end_x, coord.y)
 
     def get_rows(self, start, end):
         """Given a start and end of a single row, finds all available sub rows.
@@ -166,16 +360,10 @@ class Field(object):
         Returns:
             last (Coord): The Opposite bounding coordinate from the start.
         """
-        row_ids = range(start.x, end.x + 1)
-        last = end.copy()
-        for y in range(start.y, self.height):
-            # Make sure each coord in the zone is fertile and free
-            row_data = [self.check_coord(Coord(i, y)) for i in row_ids]
-            if all(row_data):
-                last = Coord(end.x, y)
-            else:
-                break
-        return last
+        # Make sure each coord in the zone is fertile and free
+        last_y = _grow(lambda y: self.is_area_free(start.x, start.y, end.x, y),
+                       end.y, self.height - 1)
+        return Coord(end.x, last_y)
 
     def display(self, test=False):
         """Triggers a render of the resulting Field.
@@ -183,12 +371,605 @@ class Field(object):
         Args:
             test (bool): If running a pytest, dont display the image.
         """
-        display_image(self.islands, self.width, self.height, test=test)
+        # Imported here so the analysis does not need PIL.
+        from .visualize import display_image
+        with self.stats.phase("render"):
+            display_image(self.islands, self.width, self.height, test=test)
+
+    def render(self, path=None, image_format="PNG", **kwargs):
+        """Renders the resulting Field in memory, without saving or showing it.
+
+        Args:
+            path (str): Also write the image to this file if provided.
+            image_format (str): The PIL image format to encode with.
+            **kwargs: Passed on to `visualize.render_image`.
+
+        Returns:
+            (bytes): The encoded image.
+        """
+        from .visualize import render_bytes
+        with self.stats.phase("render"):
+            return render_bytes(self.islands, self.width, self.height, image_format=image_format,
+                                path=path, **kwargs)
+
+    def export_png(self, path, **kwargs):
+        """Streams the resulting Field into a PNG file, for fields too large to render at once.
+
+        Args:
+            path (str): The PNG file to write.
+            **kwargs: Passed on to `visualize.export_png`.
+        """
+        from .visualize import export_png
+        with self.stats.phase("render"):
+            export_png(self.islands, self.width, self.height, path, **kwargs)
+
+
+def _grow(free, low, high):
+    """Finds how far an extent can grow by galloping and then binary searching.
+
+    Args:
+        free (callable): Takes a value, True if the extent up to it is free. Once False it has to
+            stay False for every larger value.
+        low (int): The value the extent starts at, expected to be free.
+        high (int): The largest value the extent may grow to.
+
+    Returns:
+        (int): The largest free value, `low` if nothing past it is free.
+    """
+    step = 1
+    while low < high:
+        probe = min(low + step, high)
+        if not free(probe):
+            high = probe - 1
+            break
+        low = probe
+        step *= 2
+    while low < high:
+        middle = (low + high + 1) // 2
+        if free(middle):
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def touching_zones(bounds):
+    """Finds the pairs of zones that share an edge or a corner.
+
+    Notes:
+        Expects zones that do not overlap, like the fertile zones of a Field. Zones can only
+        touch across the line one of them ends and the other one starts on, so the zone edges
+        are bucketed per line and each line is swept in order.
+
+    Args:
+        bounds (list[tuple[int]]): `(start_x, start_y, end_x, end_y)` of each zone.
+
+    Yields:
+        (tuple[int]): Index pair of two touching zones.
+    """
+    # line -> ([closing edges], [opening edges]) as (start, end, index)
+    vertical = defaultdict(lambda: (list(), list()))
+    horizontal = defaultdict(lambda: (list(), list()))
+    for i, (start_x, start_y, end_x, end_y) in enumerate(bounds):
+        vertical[end_x + 1][0].append((start_y, end_y, i))
+        vertical[start_x][1].append((start_y, end_y, i))
+        horizontal[end_y + 1][0].append((start_x, end_x, i))
+        horizontal[start_y][1].append((start_x, end_x, i))
+
+    for lines in (vertical, horizontal):
+        for closing, opening in lines.values():
+            if not closing or not opening:
+                continue
+            closing.sort()
+            opening.sort()
+            first = 0
+            for start, end, i in closing:
+                # Extend by 1 to have corner zones touch.
+                while first < len(opening) and opening[first][1] + 1 < start:
+                    first += 1
+                j = first
+                while j < len(opening) and opening[j][0] <= end + 1:
+                    yield i, opening[j][2]
+                    j += 1
+
+
+def bounds_array(zones):
+    """Collects the bounding coordinates of zones into an array.
+
+    Args:
+        zones (iterable[Zone]|ZoneStore|numpy.ndarray): The zones to collect.
+
+    Returns:
+        (numpy.ndarray): `(N, 4)` int64 array of `start_x, start_y, end_x, end_y`.
+    """
+    if isinstance(zones, ZoneStore):
+        return zones.bounds()
+    if isinstance(zones, np.ndarray):
+        return zones.astype(np.int64, copy=False).reshape(-1, 4)
+    bounds = [(z.start.x, z.start.y, z.end.x, z.end.y) for z in zones]
+    return np.array(bounds, dtype=np.int64).reshape(-1, 4)
+
+
+def clip_bounds(bounds, width, height):
+    """Drops the reversed zones and the zones outside of a field, clipping the rest to it.
+
+    Args:
+        bounds (numpy.ndarray): `(N, 4)` bounds of the zones.
+        width (int): The width of the field.
+        height (int): The height of the field.
+
+    Returns:
+        (numpy.ndarray): The bounds of the zones inside of the field.
+    """
+    inside = ((bounds[:, 0] <= bounds[:, 2]) & (bounds[:, 1] <= bounds[:, 3]) &
+              (bounds[:, 0] < width) & (bounds[:, 1] < height) &
+              (bounds[:, 2] >= 0) & (bounds[:, 3] >= 0))
+    return np.clip(bounds[inside], 0, [width - 1, height - 1, width - 1, height - 1])
+
+
+def normalize_zones(zones, width, height):
+    """Shrinks a set of zones to the fewest rectangles that cover the same units of a field.
+
+    Notes:
+        Zones are clipped to the field, zones inside of another zone are dropped and zones
+        whose union is still a rectangle are merged. Merging can create new containments and
+        merges, so the passes repeat until nothing changes.
+
+    Args:
+        zones (iterable[Zone]|ZoneStore|numpy.ndarray): The zones to normalize.
+        width (int): The width of the field.
+        height (int): The height of the field.
+
+    Returns:
+        (numpy.ndarray): `(N, 4)` int64 array of the normalized bounds.
+    """
+    bounds = clip_bounds(bounds_array(zones), width, height)
+    count = -1
+    while count != len(bounds):
+        count = len(bounds)
+        bounds = _drop_contained(np.unique(bounds, axis=0))
+        bounds = _merge_runs(_merge_runs(bounds, 0), 1)
+    return bounds
+
+
+def _drop_contained(bounds):
+    """Drops the zones that lie inside of another zone.
+
+    Notes:
+        Sorted by their start x and then by their end x from last to first, a zone only comes
+        after the zones that contain it. Sweeping in that order, the kept zones are indexed by
+        the units they cover and a zone only has to be checked against the kept zones covering
+        its start.
+
+    Args:
+        bounds (numpy.ndarray): `(N, 4)` bounds without duplicates.
+
+    Returns:
+        (numpy.ndarray): The bounds of the zones that are not contained.
+    """
+    if not len(bounds):
+        return bounds
+    order = np.lexsort((-bounds[:, 3], bounds[:, 1], -bounds[:, 2], bounds[:, 0]))
+    sizes = np.maximum(bounds[:, 2] - bounds[:, 0], bounds[:, 3] - bounds[:, 1]) + 1
+    # Buckets about the size of a zone keep both the buckets per zone and per lookup few.
+    index = ZoneIndex(int(bounds[:, 2].max()) + 1, int(bounds[:, 3].max()) + 1,
+                      bucket_size=max(16, int(np.median(sizes))))
+    kept = dict()
+    keep = np.zeros(len(bounds), dtype=bool)
+    for row, (sx, sy, ex, ey) in zip(order.tolist(), bounds[order].tolist()):
+        for other in index.candidates(sx, sy):
+            osx, osy, oex, oey = kept[other]
+            if osx <= sx and osy <= sy and oex >= ex and oey >= ey:
+                break
+        else:
+            keep[row] = True
+            kept[row] = (sx, sy, ex, ey)
+            index.insert(row, sx, sy, ex, ey)
+    return bounds[keep]
+
+
+def _merge_runs(bounds, axis):
+    """Merges the zones that line up and overlap or touch along one axis.
+
+    Args:
+        bounds (numpy.ndarray): `(N, 4)` bounds of the zones.
+        axis (int): 0 merges zones of the same x extent along y, 1 the other way around.
+
+    Returns:
+        (numpy.ndarray): The merged bounds.
+    """
+    # Columns of the shared extent and of the extent to merge along.
+    same_start, same_end, start, end = (0, 2, 1, 3) if axis == 0 else (1, 3, 0, 2)
+    order = np.lexsort((bounds[:, start], bounds[:, same_end], bounds[:, same_start]))
+    merged = list()
+    for zone in bounds[order].tolist():
+        last = merged[-1] if merged else None
+        if (last and last[same_start] == zone[same_start] and last[same_end] == zone[same_end]
+                and zone[start] <= last[end] + 1):
+            last[end] = max(last[end], zone[end])
+        else:
+            merged.append(zone)
+    return np.array(merged, dtype=np.int64).reshape(-1, 4)
+
+
+def adjacency(zones, diagonal=True):
+    """Finds every pair of neighbouring zones in one vectorized pass.
+
+    Notes:
+        Zones are sorted by their start x, so the only candidates of a zone are the ones that
+        start before its end. Those candidates are then filtered on their y extent.
+
+    Args:
+        zones (iterable[Zone]|ZoneStore|numpy.ndarray): Zones or an `(N, 4)` array of bounds.
+        diagonal (bool): Count zones touching by a corner only, see `Zone.is_neighbor`.
+
+    Returns:
+        (numpy.ndarray): `(M, 2)` array of index pairs, the smaller index first.
+    """
+    bounds = bounds_array(zones)
+    order = np.argsort(bounds[:, 0], kind="stable")
+    start_x, start_y, end_x, end_y = bounds[order].T
+    # Every zone after i in the sorted order that starts before the end of i (+1) is a candidate.
+    first = np.arange(len(order)) + 1
+    counts = np.maximum(np.searchsorted(start_x, end_x + 1, side="right") - first, 0)
+    zone_a = np.repeat(first - 1, counts)
+    zone_b = np.repeat(first, counts) + np.arange(counts.sum()) - np.repeat(
+        np.cumsum(counts) - counts, counts)
+
+    touch_y = (start_y[zone_a] <= end_y[zone_b] + 1) & (start_y[zone_b] <= end_y[zone_a] + 1)
+    if diagonal:
+        keep = touch_y
+    else:
+        overlap_x = start_x[zone_b] <= end_x[zone_a]
+        overlap_y = (start_y[zone_a] <= end_y[zone_b]) & (start_y[zone_b] <= end_y[zone_a])
+        keep = (overlap_x & touch_y) | overlap_y
+    pairs = np.stack((order[zone_a[keep]], order[zone_b[keep]]), axis=1)
+    pairs.sort(axis=1)
+    return pairs
+
+
+def find_islands(bounds):
+    """Groups touching zones into islands.
+
+    Args:
+        bounds (numpy.ndarray): `(N, 4)` bounds of zones that do not overlap.
+
+    Returns:
+        (list[ZoneStore]): The islands sorted from largest to smallest area.
+    """
+    groups = DisjointSet(len(bounds))
+    for zone_a, zone_b in touching_zones(bounds.tolist()):
+        groups.union(zone_a, zone_b)
+    islands = np.array([groups.find(i) for i in range(len(bounds))], dtype=np.int64)
+    return group_islands(bounds, islands)
+
+
+def group_islands(bounds, islands):
+    """Splits zones into islands.
+
+    Args:
+        bounds (numpy.ndarray): `(N, 4)` bounds of the zones.
+        islands (numpy.ndarray): Island label of each zone.
+
+    Returns:
+        (list[ZoneStore]): The islands sorted from largest to smallest area.
+    """
+    if not len(bounds):
+        return list()
+    order = np.argsort(islands, kind="stable")
+    starts = np.flatnonzero(np.r_[True, np.diff(islands[order]) != 0])
+    sizes = (bounds[:, 2] - bounds[:, 0] + 1) * (bounds[:, 3] - bounds[:, 1] + 1)
+    areas = np.add.reduceat(sizes[order], starts)
+    groups = np.split(order, starts[1:])
+    return [ZoneStore.from_bounds(bounds[groups[i]]) for i in np.argsort(-areas, kind="stable")]
+
+
+class ZoneStore(MutableSet):
+    """Compact collection of zones stored as columns of int32 bounds.
+
+    Notes:
+        Only the bounds are stored, Zone objects are created on the fly when iterating. Bulk
+        operations like `area` run on the columns directly.
+    """
+
+    def __init__(self, zones=()):
+        """ZoneStore initialization.
+
+        Args:
+            zones (iterable[Zone]): Zones to start the collection with.
+        """
+        # Bumped on every change, lets callers cache what they derive from the zones.
+        self.changes = 0
+        self.start_x = array("i")
+        self.start_y = array("i")
+        self.end_x = array("i")
+        self.end_y = array("i")
+        if isinstance(zones, ZoneStore):
+            self.extend_bounds(zones.bounds())
+        else:
+            for zone in zones:
+                self.add(zone)
+
+    @classmethod
+    def from_bounds(cls, bounds, *args):
+        """Creates a collection from an array of bounds.
+
+        Args:
+            bounds (numpy.ndarray): `(N, 4)` array of `start_x, start_y, end_x, end_y`.
+            *args: Passed on to the initialization of the class.
+
+        Returns:
+            (ZoneStore): The new collection.
+        """
+        store = cls((), *args)
+        store.extend_bounds(bounds)
+        return store
+
+    def add(self, zone):
+        """Adds a zone if it is not in the collection yet.
+
+        Args:
+            zone (Zone): The zone to add.
+        """
+        if zone not in self:
+            self._append(zone.start.x, zone.start.y, zone.end.x, zone.end.y)
+
+    def extend_bounds(self, bounds):
+        """Adds zones in bulk without checking for duplicates.
+
+        Notes:
+            The columns are extended straight from the array data, no Zone or Coord objects
+            are created.
+
+        Args:
+            bounds (numpy.ndarray): `(N, 4)` array of `start_x, start_y, end_x, end_y`.
+
+        Raises:
+            OverflowError: If a bound does not fit into an int32.
+        """
+        bounds = np.asarray(bounds).reshape(-1, 4)
+        if not len(bounds):
+            return
+        limits = np.iinfo(np.int32)
+        if bounds.min() < limits.min or bounds.max() > limits.max:
+            raise OverflowError("Zone bounds have to fit into an int32.")
+        columns = np.ascontiguousarray(bounds.T, dtype=np.int32)
+        for column, values in zip((self.start_x, self.start_y, self.end_x, self.end_y), columns):
+            column.frombytes(values.tobytes())
+        self.changes += 1
+
+    def discard(self, zone):
+        """Removes a zone if it is present.
+
+        Args:
+            zone (Zone): The zone to remove.
+        """
+        row = self._row(zone)
+        if row is not None:
+            self._remove_row(row)
+
+    def clear(self):
+        """Removes all zones."""
+        for column in (self.start_x, self.start_y, self.end_x, self.end_y):
+            del column[:]
+        self.changes += 1
+
+    def bounds(self):
+        """Gets the bounds of all zones.
+
+        Returns:
+            (numpy.ndarray): `(N, 4)` int64 array of `start_x, start_y, end_x, end_y`.
+        """
+        bounds = np.empty((len(self), 4), dtype=np.int64)
+        for i, column in enumerate((self.start_x, self.start_y, self.end_x, self.end_y)):
+            if column:
+                bounds[:, i] = np.frombuffer(column, dtype=np.int32)
+        return bounds
+
+    def area(self):
+        """Calculates the 2D volume of all zones together.
+
+        Returns:
+            (int): The volume in units.
+        """
+        bounds = self.bounds()
+        sizes = (bounds[:, 2] - bounds[:, 0] + 1) * (bounds[:, 3] - bounds[:, 1] + 1)
+        return int(sizes.sum())
+
+    def _append(self, start_x, start_y, end_x, end_y):
+        """Stores the bounds of a zone in a new row.
+
+        Returns:
+            (int): The row of the new zone.
+        """
+        self.start_x.append(start_x)
+        self.start_y.append(start_y)
+        self.end_x.append(end_x)
+        self.end_y.append(end_y)
+        self.changes += 1
+        return len(self.start_x) - 1
+
+    def _row(self, zone):
+        """Finds the row of a zone.
+
+        Args:
+            zone (Zone): The zone to look for.
+
+        Returns:
+            (int|None): The row of the zone, None if it is not present.
+        """
+        if not isinstance(zone, Zone) or not self.start_x:
+            return None
+        bounds = self.bounds()
+        found = np.flatnonzero((bounds == (zone.start.x, zone.start.y, zone.end.x, zone.end.y))
+                               .all(axis=1))
+        return int(found[0]) if len(found) else None
+
+    def _remove_row(self, row):
+        """Removes a row by moving the last row into its place.
+
+        Args:
+            row (int): The row to remove.
+        """
+        for column in (self.start_x, self.start_y, self.end_x, self.end_y):
+            column[row] = column[-1]
+            column.pop()
+        self.changes += 1
+
+    def _zone(self, row):
+        """Creates the Zone of a row.
+
+        Args:
+            row (int): The row of the zone.
+
+        Returns:
+            (Zone): The zone.
+        """
+        return Zone(Coord(self.start_x[row], self.start_y[row]),
+                    Coord(self.end_x[row], self.end_y[row]))
+
+    def __contains__(self, zone):
+        return self._row(zone) is not None
+
+    def __iter__(self):
+        for row in range(len(self)):
+            yield self._zone(row)
+
+    def __len__(self):
+        return len(self.start_x)
+
+    def __repr__(self):
+        """Used for debugging with print ;)
+
+        Returns:
+            (str): Formatted results of this collection.
+        """
+        return f"{type(self).__name__}({list(self)})"
+
+
+class ZoneSet(ZoneStore):
+    """Compact set of zones backed by a spatial index for fast coordinate lookups."""
+
+    def __init__(self, zones=(), width=1, height=1):
+        """ZoneSet initialization.
+
+        Args:
+            zones (iterable[Zone]): Zones to start the set with.
+            width (int): The width of the indexed area, usually the Field width.
+            height (int): The height of the indexed area, usually the Field height.
+        """
+        self._index = ZoneIndex(width, height)
+        ZoneStore.__init__(self, zones)
+
+    def clear(self):
+        """Removes all zones."""
+        ZoneStore.clear(self)
+        self._index.clear()
+
+    def covers(self, x, y):
+        """Checks to see if any zone contains a coordinate.
+
+        Args:
+            x (int): The x coordinate.
+            y (int): The y coordinate.
+
+        Returns:
+            (bool): True if a zone contains the coordinate else False.
+        """
+        start_x, start_y, end_x, end_y = self.start_x, self.start_y, self.end_x, self.end_y
+        for row in self._index.candidates(x, y):
+            if start_x[row] <= x <= end_x[row] and start_y[row] <= y <= end_y[row]:
+                return True
+        return False
+
+    def find(self, coord):
+        """Finds a zone containing the coordinate.
+
+        Args:
+            coord (Coord): The coordinate to look up.
+
+        Returns:
+            (Zone|None): A zone containing the coordinate, None if there is none.
+        """
+        start_x, start_y, end_x, end_y = self.start_x, self.start_y, self.end_x, self.end_y
+        for row in self._index.candidates(coord.x, coord.y):
+            if start_x[row] <= coord.x <= end_x[row] and start_y[row] <= coord.y <= end_y[row]:
+                return self._zone(row)
+        return None
+
+    def intersects(self, start_x, start_y, end_x, end_y):
+        """Checks to see if any zone overlaps a rectangle.
+
+        Args:
+            start_x (int): The first x coordinate of the rectangle.
+            start_y (int): The first y coordinate of the rectangle.
+            end_x (int): The last x coordinate of the rectangle.
+            end_y (int): The last y coordinate of the rectangle.
+
+        Returns:
+            (bool): True if a zone overlaps the rectangle else False.
+        """
+        for row in self._index.candidates_of(start_x, start_y, end_x, end_y):
+            if (self.start_x[row] <= end_x and start_x <= self.end_x[row] and
+                    self.start_y[row] <= end_y and start_y <= self.end_y[row]):
+                return True
+        return False
+
+    def overlapping(self, zone):
+        """Finds all zones of this set that overlap a zone.
+
+        Args:
+            zone (Zone): The zone to check against.
+
+        Returns:
+            (list[Zone]): The overlapping zones.
+        """
+        rows = self._index.candidates_of(zone.start.x, zone.start.y, zone.end.x, zone.end.y)
+        return [self._zone(row) for row in sorted(rows)
+                if self.start_x[row] <= zone.end.x and zone.start.x <= self.end_x[row] and
+                self.start_y[row] <= zone.end.y and zone.start.y <= self.end_y[row]]
+
+    def extend_bounds(self, bounds):
+        first = len(self)
+        ZoneStore.extend_bounds(self, bounds)
+        insert = self._index.insert
+        for row, start_x, start_y, end_x, end_y in zip(
+                range(first, len(self)), self.start_x[first:], self.start_y[first:],
+                self.end_x[first:], self.end_y[first:]):
+            insert(row, start_x, start_y, end_x, end_y)
+
+    def _append(self, start_x, start_y, end_x, end_y):
+        row = ZoneStore._append(self, start_x, start_y, end_x, end_y)
+        self._index.insert(row, start_x, start_y, end_x, end_y)
+        return row
+
+    def _row(self, zone):
+        if not isinstance(zone, Zone):
+            return None
+        bounds = (zone.start.x, zone.start.y, zone.end.x, zone.end.y)
+        for row in self._index.candidates(zone.start.x, zone.start.y):
+            if (self.start_x[row], self.start_y[row], self.end_x[row], self.end_y[row]) == bounds:
+                return row
+        return None
+
+    def _remove_row(self, row):
+        last = len(self) - 1
+        self._index.remove(row, self.start_x[row], self.start_y[row],
+                           self.end_x[row], self.end_y[row])
+        if row != last:
+            # The last row moves into the freed up row.
+            last_bounds = (self.start_x[last], self.start_y[last],
+                           self.end_x[last], self.end_y[last])
+            self._index.remove(last, *last_bounds)
+            self._index.insert(row, *last_bounds)
+        ZoneStore._remove_row(self, row)
 
 
 class Coord(object):
     """Representation of one unit within a Zone"""
 
+    __slots__ = ("x", "y")
+
     def __init__(self, x, y):
         self.x = x
         self.y = y
@@ -228,6 +1009,8 @@ class Coord(object):
 class Zone(object):
     """Class to handle storing zone information from within the Field."""
 
+    __slots__ = ("start", "end")
+
     def __init__(self, start, end):
         """Representation of a zone within a Field.
 
@@ -291,22 +1074,67 @@ class Zone(object):
         within_y = self.start.y <= coord.y <= self.end.y
         return within_x and within_y
 
-    def is_neighbor(self, zone):
+    def intersection(self, zone):
+        """Finds the part of this zone that is shared with another zone.
+
+        Args:
+            zone (Zone): The other zone.
+
+        Returns:
+            (Zone|None): The shared zone, None if they do not overlap.
+        """
+        start = Coord(max(self.start.x, zone.start.x), max(self.start.y, zone.start.y))
+        end = Coord(min(self.end.x, zone.end.x), min(self.end.y, zone.end.y))
+        if start.x > end.x or start.y > end.y:
+            return None
+        return Zone(start, end)
+
+    def subtract(self, zone):
+        """Cuts another zone out of this zone.
+
+        Args:
+            zone (Zone): The zone to cut out.
+
+        Returns:
+            pieces (list[Zone]): Up to 4 zones covering what is left of this zone.
+        """
+        cut = self.intersection(zone)
+        if cut is None:
+            return [self]
+        pieces = list()
+        if self.start.y < cut.start.y:
+            # Everything above the cut.
+            pieces.append(Zone(self.start.copy(), Coord(self.end.x, cut.start.y - 1)))
+        if cut.end.y < self.end.y:
+            # Everything below the cut.
+            pieces.append(Zone(Coord(self.start.x, cut.end.y + 1), self.end.copy()))
+        if self.start.x < cut.start.x:
+            # Left of the cut, within its rows.
+            pieces.append(Zone(Coord(self.start.x, cut.start.y), Coord(cut.start.x - 1, cut.end.y)))
+        if cut.end.x < self.end.x:
+            # Right of the cut, within its rows.
+            pieces.append(Zone(Coord(cut.end.x + 1, cut.start.y), Coord(self.end.x, cut.end.y)))
+        return pieces
+
+    def is_neighbor(self, zone, diagonal=True):
         """Checks to see if another zone is considered a neighbour.
 
         Args:
             zone (Zone): Zone to check if is neighbour.
+            diagonal (bool): Zones touching by a corner only are neighbours (8-connected) if
+                True else they have to share part of an edge (4-connected).
 
         Returns:
             (bool): True if neighbour else False
         """
-        for edge in zone.boundary():
-            # Extend by 1 to have border zones intersect.
-            within_x = (self.start.x - 1) <= edge.x <= (self.end.x + 1)
-            within_y = (self.start.y - 1) <= edge.y <= (self.end.y + 1)
-            if within_x and within_y:
-                return True
-        return False
+        # Extend by 1 to have border zones intersect.
+        touch_x = self.start.x - 1 <= zone.end.x and zone.start.x <= self.end.x + 1
+        touch_y = self.start.y - 1 <= zone.end.y and zone.start.y <= self.end.y + 1
+        if diagonal:
+            return touch_x and touch_y
+        overlap_x = self.start.x <= zone.end.x and zone.start.x <= self.end.x
+        overlap_y = self.start.y <= zone.end.y and zone.start.y <= self.end.y
+        return (touch_x and overlap_y) or (overlap_x and touch_y)
 
     def boundary(self):
         """Find the outer perimeter of the zone and return all coordinates.
@@ -344,6 +1172,22 @@ class Zone(object):
         elif isinstance(other, Zone):
             return self.get_size() + other.get_size()
 
+    def __eq__(self, other):
+        """Zone comparison, zones with the same bounds are equal.
+
+        Args:
+            other (Zone): Other zone to check.
+        """
+        return isinstance(other, Zone) and self.start == other.start and self.end == other.end
+
+    def __hash__(self):
+        """Hashing capabilities to allow for use in sets.
+
+        Returns:
+            (hash): Hashed value using the bounds.
+        """
+        return hash((self.start.x, self.start.y, self.end.x, self.end.y))
+
     def __repr__(self):
         """Used for debugging with print ;)
 
@@ -0,0 +1,389 @@
+import json
+from collections import defaultdict
+from contextlib import contextmanager
+
+from . import areas as area_sweep
+from .land import Field, Zone, ZoneSet, Coord
+from .structures import DisjointSet
+
+
+class Metrics(object):
+    """Counters and summaries of what an analysis did, dumped as JSON or Prometheus text.
+
+    Notes:
+        Counters are keyed by their name and labels. Summaries keep the count, sum and max of
+        the observed values.
+    """
+
+    descriptions = {
+        "check_coord_total": "Coordinates checked with Field.check_coord, by outcome.",
+        "area_checks_total": "Rectangles checked with Field.is_area_free, by outcome.",
+        "zone_contains_total": "Zone.contains tests, only direct calls, no analysis uses them.",
+        "zone_neighbor_total": "Zone.is_neighbor tests, only direct calls, no analysis uses them.",
+        "zone_lookups_total": "ZoneSet lookups, by method and outcome.",
+        "coords_allocated_total": "Coord objects created.",
+        "unions_total": "DisjointSet.union calls, by whether they merged two groups.",
+        "area_runs_total": "Free runs opened by the island_areas sweep.",
+        "area_recuts_total": "Windows of changed columns recut by the island_areas sweep.",
+        "zones_created_total": "Fertile zones created by check_zones.",
+        "zones_per_island": "Fertile zones in each island after check_zones.",
+    }
+    # Every labelled series of the counters, they are all exported even when nothing was counted.
+    series = {
+        "check_coord_total": [{"outcome": outcome}
+                              for outcome in ("free", "barren", "fertile", "out_of_bounds")],
+        "area_checks_total": [{"outcome": "free"}, {"outcome": "blocked"}],
+        "zone_contains_total": [{}],
+        "zone_neighbor_total": [{}],
+        "zone_lookups_total": [{"method": method, "outcome": outcome}
+                               for method in ("covers", "find", "intersects")
+                               for outcome in ("hit", "miss")],
+        "coords_allocated_total": [{}],
+        "unions_total": [{"outcome": "merged"}, {"outcome": "same"}],
+        "area_runs_total": [{}],
+        "area_recuts_total": [{}],
+        "zones_created_total": [{}],
+    }
+    summaries_of = ("zones_per_island",)
+
+    def __init__(self):
+        """Metrics initialization."""
+        self.counters = defaultdict(int)
+        self.summaries = dict()
+        self.reset()
+
+    def reset(self):
+        """Sets all counters and summaries back to 0."""
+        self.counters.clear()
+        self.summaries.clear()
+        for name, labelled in self.series.items():
+            for labels in labelled:
+                self.counters[(name, tuple(sorted(labels.items())))] = 0
+        for name in self.summaries_of:
+            self.summaries[name] = (0, 0, 0)
+
+    def increment(self, name, amount=1, **labels):
+        """Adds to a counter.
+
+        Args:
+            name (str): The counter.
+            amount (int): How much to add.
+            **labels: Labels that keep apart different kinds of the same counter.
+        """
+        self.counters[(name, tuple(sorted(labels.items())))] += amount
+
+    def observe(self, name, value):
+        """Adds a value to a summary.
+
+        Args:
+            name (str): The summary.
+            value (int|float): The observed value.
+        """
+        count, total, largest = self.summaries.get(name, (0, 0, value))
+        self.summaries[name] = (count + 1, total + value, max(largest, value) if count else value)
+
+    def as_dict(self):
+        """Gets all counters and summaries as plain data.
+
+        Returns:
+            (dict): `counters` as a list of `name, labels, value` records and `summaries` by
+                name with their `count`, `sum` and `max`.
+        """
+        counters = [{"name": name, "labels": dict(labels), "value": value}
+                    for (name, labels), value in sorted(self.counters.items())]
+        summaries = {name: {"count": count, "sum": total, "max": largest}
+                     for name, (count, total, largest) in sorted(self.summaries.items())}
+        return {"counters": counters, "summaries": summaries}
+
+    def to_json(self, indent=None):
+        """Dumps the metrics as JSON.
+
+        Args:
+            indent (int): Indent of the JSON, a single line if not provided.
+
+        Returns:
+            (str): The JSON document.
+        """
+        return json.dumps(self.as_dict(), indent=indent)
+
+    def to_prometheus(self, prefix="barren_lands"):
+        """Dumps the metrics in the Prometheus text exposition format.
+
+        Args:
+            prefix (str): Put in front of every metric name.
+
+        Returns:
+            (str): The metrics, one sample per line.
+        """
+        grouped = defaultdict(list)
+        for (name, labels), value in sorted(self.counters.items()):
+            grouped[name].append((labels, value))
+        lines = list()
+        for name, samples in grouped.items():
+            metric = f"{prefix}_{name}"
+            lines.extend(_header(metric, self.descriptions.get(name), "counter"))
+            for labels, value in samples:
+                text = ",".join(f'{key}="{label}"' for key, label in labels)
+                lines.append(f"{metric}{{{text}}} {value}" if text else f"{metric} {value}")
+        for name, (count, total, largest) in sorted(self.summaries.items()):
+            metric = f"{prefix}_{name}"
+            lines.extend(_header(metric, self.descriptions.get(name), "summary"))
+            lines.append(f"{metric}_count {count}")
+            lines.append(f"{metric}_sum {total}")
+            lines.extend(_header(f"{metric}_max", self.descriptions.get(name), "gauge"))
+            lines.append(f"{metric}_max {largest}")
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path):
+        """Writes the metrics to a file, as Prometheus text for `.prom` files else as JSON.
+
+        Args:
+            path (str): The file to write.
+        """
+        text = self.to_prometheus() if str(path).endswith(".prom") else self.to_json(indent=2)
+        with open(path, "w") as metrics_file:
+            metrics_file.write(text)
+
+
+def _header(metric, description, kind):
+    """Builds the HELP and TYPE lines of a Prometheus metric.
+
+    Args:
+        metric (str): The full metric name.
+        description (str): The help text, left out if not provided.
+        kind (str): The Prometheus metric type.
+
+    Returns:
+        (list[str]): The header lines.
+    """
+    lines = [f"# HELP {metric} {description}"] if description else list()
+    return lines + [f"# TYPE {metric} {kind}"]
+
+
+# The metrics the counters write to while they are enabled.
+METRICS = Metrics()
+# The Field classes whose check_zones are counted, see `register_engine`.
+ENGINES = [Field]
+# The original methods that were wrapped, to put back on `disable`.
+_originals = dict()
+# Marks a wrapped method that was inherited, it is deleted again on `disable`.
+_INHERITED = object()
+# The metrics counted into while enabled, None while disabled.
+_active = [None]
+# How deep check_zones runs are nested, tiles analysed in this process count as one run.
+_depth = [0]
+
+
+def register_engine(*engines):
+    """Counts the `check_zones` of Field classes besides the base Field.
+
+    Notes:
+        Engines registered while counting is enabled are counted from then on.
+
+    Args:
+        *engines (type): The Field classes to count.
+    """
+    for engine in engines:
+        if engine in ENGINES:
+            continue
+        ENGINES.append(engine)
+        if _active[0] is not None:
+            _count_engine(engine, _active[0])
+
+
+def enable(metrics=None):
+    """Starts counting the hot paths.
+
+    Notes:
+        The counted methods are swapped for counting wrappers, while disabled the originals
+        run and counting costs nothing. Counting slows the analysis down, only turn it on to
+        explain a layout or to compare algorithms. Only the `check_zones` of the `ENGINES`
+        are counted, add others with `register_engine`.
+
+    Args:
+        metrics (Metrics): Where to count, the module wide `METRICS` if not provided.
+
+    Returns:
+        (Metrics): The metrics that are counted into.
+
+    Raises:
+        RuntimeError: If counting is already enabled, the running count would stop silently.
+    """
+    if _active[0] is not None:
+        raise RuntimeError("Counting is already enabled, disable it first.")
+    metrics = metrics or METRICS
+    counters = metrics.counters
+    coords = ("coords_allocated_total", ())
+    contains = ("zone_contains_total", ())
+    neighbors = ("zone_neighbor_total", ())
+    outcomes = {outcome: ("check_coord_total", (("outcome", outcome),))
+                for outcome in ("free", "barren", "fertile", "out_of_bounds")}
+    areas = {free: ("area_checks_total", (("outcome", "free" if free else "blocked"),))
+             for free in (True, False)}
+    lookups = {(method, hit): ("zone_lookups_total",
+                               (("method", method), ("outcome", "hit" if hit else "miss")))
+               for method in ("covers", "find", "intersects") for hit in (True, False)}
+    unions = {merged: ("unions_total", (("outcome", "merged" if merged else "same"),))
+              for merged in (True, False)}
+    runs = ("area_runs_total", ())
+    recuts = ("area_recuts_total", ())
+
+    coord_init = _wrap(Coord, "__init__")
+    zone_contains = _wrap(Zone, "contains")
+    zone_is_neighbor = _wrap(Zone, "is_neighbor")
+    field_is_free = _wrap(Field, "is_free")
+    field_is_area_free = _wrap(Field, "is_area_free")
+    set_covers = _wrap(ZoneSet, "covers")
+    set_find = _wrap(ZoneSet, "find")
+    set_intersects = _wrap(ZoneSet, "intersects")
+    set_union = _wrap(DisjointSet, "union")
+    sweep_recut = _wrap(area_sweep, "_recut")
+
+    def count_coord(coord, x, y):
+        counters[coords] += 1
+        coord_init(coord, x, y)
+
+    def count_contains(zone, coord):
+        counters[contains] += 1
+        return zone_contains(zone, coord)
+
+    def count_is_neighbor(zone, other, diagonal=True):
+        counters[neighbors] += 1
+        return zone_is_neighbor(zone, other, diagonal)
+
+    def count_is_free(field, x, y):
+        free = field_is_free(field, x, y)
+        if free:
+            outcome = "free"
+        elif not (0 <= x < field.width and 0 <= y < field.height):
+            outcome = "out_of_bounds"
+        elif set_covers(field.barren_zones, x, y):
+            outcome = "barren"
+        else:
+            outcome = "fertile"
+        counters[outcomes[outcome]] += 1
+        return free
+
+    def count_is_area_free(field, start_x, start_y, end_x, end_y):
+        free = field_is_area_free(field, start_x, start_y, end_x, end_y)
+        counters[areas[free]] += 1
+        return free
+
+    def count_covers(zones, x, y):
+        hit = set_covers(zones, x, y)
+        counters[lookups[("covers", hit)]] += 1
+        return hit
+
+    def count_find(zones, coord):
+        zone = set_find(zones, coord)
+        counters[lookups[("find", zone is not None)]] += 1
+        return zone
+
+    def count_intersects(zones, start_x, start_y, end_x, end_y):
+        hit = set_intersects(zones, start_x, start_y, end_x, end_y)
+        counters[lookups[("intersects", hit)]] += 1
+        return hit
+
+    def count_union(groups, item_a, item_b):
+        counters[unions[groups.find(item_a) != groups.find(item_b)]] += 1
+        set_union(groups, item_a, item_b)
+
+    def count_recut(top, changed, run_first, run_last, coverage, axis_x, free_runs, run_areas,
+                    run_unions):
+        before = len(run_areas)
+        sweep_recut(top, changed, run_first, run_last, coverage, axis_x, free_runs, run_areas,
+                    run_unions)
+        counters[runs] += len(run_areas) - before
+        counters[recuts] += 1
+
+    Coord.__init__ = count_coord
+    Zone.contains = count_contains
+    Zone.is_neighbor = count_is_neighbor
+    Field.is_free = count_is_free
+    Field.is_area_free = count_is_area_free
+    ZoneSet.covers = count_covers
+    ZoneSet.find = count_find
+    ZoneSet.intersects = count_intersects
+    DisjointSet.union = count_union
+    area_sweep._recut = count_recut
+    _active[0] = metrics
+    for engine in ENGINES:
+        _count_engine(engine, metrics)
+    return metrics
+
+
+def disable():
+    """Stops counting, putting the original methods back."""
+    for (owner, name), method in _originals.items():
+        if method is _INHERITED:
+            delattr(owner, name)
+        else:
+            setattr(owner, name, method)
+    _originals.clear()
+    _active[0] = None
+
+
+@contextmanager
+def counting(metrics=None):
+    """Counts the hot paths of the code run inside of the context.
+
+    Args:
+        metrics (Metrics): Where to count, a new Metrics if not provided.
+
+    Yields:
+        (Metrics): The metrics that are counted into.
+    """
+    metrics = enable(metrics or Metrics())
+    try:
+        yield metrics
+    finally:
+        disable()
+
+
+def _wrap(owner, name):
+    """Remembers a method that is about to be wrapped.
+
+    Args:
+        owner (type|module): The class or module of the method.
+        name (str): The name of the method.
+
+    Returns:
+        (function): The original method, inherited ones are looked up on the bases.
+    """
+    _originals[(owner, name)] = vars(owner).get(name, _INHERITED)
+    return getattr(owner, name)
+
+
+def _count_engine(engine, metrics):
+    """Swaps the `check_zones` of a Field class for a counting one.
+
+    Args:
+        engine (type): The Field class.
+        metrics (Metrics): Where to count.
+    """
+    if (engine, "check_zones") not in _originals:
+        engine.check_zones = _counted_check_zones(_wrap(engine, "check_zones"), metrics)
+
+
+def _counted_check_zones(check_zones, metrics):
+    """Wraps a `check_zones` to count the zones it created and how they spread over islands.
+
+    Args:
+        check_zones (function): The original method.
+        metrics (Metrics): Where to count.
+
+    Returns:
+        (function): The counting method.
+    """
+    def count_check_zones(field):
+        before = len(field.fertile_zones)
+        _depth[0] += 1
+        try:
+            check_zones(field)
+        finally:
+            _depth[0] -= 1
+        if _depth[0] == 0:
+            metrics.increment("zones_created_total", len(field.fertile_zones) - before)
+            for island in field.islands:
+                metrics.observe("zones_per_island", len(island))
+    return count_check_zones
@@ -0,0 +1,133 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .land import Field, touching_zones, group_islands
+from .grid import GridField
+from .structures import DisjointSet
+
+
+class TiledField(Field):
+    """Field that splits its analysis into tiles and runs them on multiple processes.
+
+    Notes:
+        Every tile is analysed on its own by the `engine` Field class, zones are cut at the tile
+        seams. The islands of the tiles are then merged where their zones touch across a seam,
+        which gives the same islands as analysing the whole field at once.
+    """
+
+    def __init__(self, width, height, tile_size=512, workers=None, engine=GridField):
+        """TiledField initialization.
+
+        Args:
+            width (int): The max width of the Field.
+            height (int): The max height of the Field.
+            tile_size (int): The width and height of each tile.
+            workers (int): Amount of processes to run, defaults to the amount of cpus. With 1
+                the tiles run in this process.
+            engine (type): The Field class used to analyse each tile.
+        """
+        Field.__init__(self, width, height)
+        self.tile_size = tile_size
+        self.workers = workers or os.cpu_count() or 1
+        self.engine = engine
+
+    def cache_kind(self):
+        """Names the way this field splits its land, the engine and the tile size included.
+
+        Returns:
+            (str): The kind used in the cache key of the analysis.
+        """
+        return f"{type(self).__name__}:{self.engine.__name__}:{self.tile_size}"
+
+    def tiles(self):
+        """Splits the field into tiles.
+
+        Returns:
+            (list[tuple[int]]): `(origin_x, origin_y, width, height)` of each tile.
+        """
+        size = self.tile_size
+        return [(x, y, min(size, self.width - x), min(size, self.height - y))
+                for x in range(0, self.width, size) for y in range(0, self.height, size)]
+
+    def check_zones(self):
+        """Runs the final calculation to mark the zones."""
+        # The tiles mark and group their own zones, their islands are merged afterwards.
+        with self.stats.phase("mark"):
+            barren = self.barren_zones.bounds()
+            jobs = list()
+            for origin_x, origin_y, width, height in self.tiles():
+                # Only send the barren zones that reach into the tile.
+                inside = ((barren[:, 0] < origin_x + width) & (barren[:, 2] >= origin_x) &
+                          (barren[:, 1] < origin_y + height) & (barren[:, 3] >= origin_y))
+                jobs.append((self.engine, origin_x, origin_y, width, height, barren[inside]))
+
+            if self.workers == 1 or len(jobs) == 1:
+                results = [analyze_tile(*job) for job in jobs]
+            else:
+                with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                    results = list(pool.map(analyze_tile, *zip(*jobs)))
+
+        # Give the islands of every tile their own number.
+        with self.stats.phase("islands"):
+            bounds = list()
+            islands = list()
+            offset = 0
+            for tile_bounds, tile_islands, count in results:
+                bounds.append(tile_bounds)
+                islands.append(tile_islands + offset)
+                offset += count
+            bounds = np.concatenate(bounds) if bounds else np.empty((0, 4), dtype=np.int64)
+            islands = np.concatenate(islands) if islands else np.empty(0, dtype=np.int64)
+            self.fertile_zones.extend_bounds(bounds)
+            self.islands = group_islands(bounds, self.stitch(bounds, islands, offset))
+
+    def stitch(self, bounds, islands, count):
+        """Merges the islands of zones that touch across a tile seam.
+
+        Args:
+            bounds (numpy.ndarray): `(N, 4)` bounds of every zone.
+            islands (numpy.ndarray): The island number of each zone.
+            count (int): The amount of island numbers.
+
+        Returns:
+            (numpy.ndarray): The merged island number of each zone.
+        """
+        size = self.tile_size
+        seam = (((bounds[:, 0] % size == 0) & (bounds[:, 0] > 0)) |
+                ((bounds[:, 2] + 1) % size == 0) |
+                ((bounds[:, 1] % size == 0) & (bounds[:, 1] > 0)) |
+                ((bounds[:, 3] + 1) % size == 0))
+        rows = np.flatnonzero(seam)
+        groups = DisjointSet(count)
+        for zone_a, zone_b in touching_zones(bounds[rows].tolist()):
+            groups.union(islands[rows[zone_a]], islands[rows[zone_b]])
+        roots = np.array([groups.find(i) for i in range(count)], dtype=np.int64)
+        return roots[islands] if count else islands
+
+
+def analyze_tile(engine, origin_x, origin_y, width, height, barren):
+    """Analyses a single tile of a field, used by the worker processes.
+
+    Args:
+        engine (type): The Field class to analyse the tile with.
+        origin_x (int): The x coordinate of the tile in the field.
+        origin_y (int): The y coordinate of the tile in the field.
+        width (int): The width of the tile.
+        height (int): The height of the tile.
+        barren (numpy.ndarray): `(N, 4)` bounds of the barren zones in field coordinates.
+
+    Returns:
+        (tuple): `(bounds, islands, count)` fertile zone bounds in field coordinates, the island
+            number of each zone and the amount of islands.
+    """
+    offset = np.array([origin_x, origin_y, origin_x, origin_y], dtype=np.int64)
+    field = engine(width, height)
+    field.barren_zones.extend_bounds(barren - offset)
+    field.check_zones()
+    bounds = [island.bounds() + offset for island in field.islands]
+    islands = [np.full(len(b), i, dtype=np.int64) for i, b in enumerate(bounds)]
+    if not bounds:
+        return np.empty((0, 4), dtype=np.int64), np.empty(0, dtype=np.int64), 0
+    return np.concatenate(bounds), np.concatenate(islands), len(bounds)
@@ -0,0 +1,233 @@
+from collections import deque
+
+import numpy as np
+
+from .grid import CompressedField
+
+
+class PartitionField(CompressedField):
+    """Field that splits its land into the fewest rectangles possible.
+
+    Notes:
+        Runs on the same compressed grid as `CompressedField`, but cuts the land along chords
+        between its reflex corners instead of scanning greedily, following:
+            https://arxiv.org/pdf/0908.3916v1.pdf
+        The islands cover the same land, made out of far fewer zones.
+    """
+
+    def split(self, free):
+        """Splits the free land of the compressed grid into the fewest rectangles.
+
+        Args:
+            free (numpy.ndarray): `(height, width)` boolean mask of available compressed units.
+
+        Returns:
+            (numpy.ndarray): `(N, 4)` int64 array of `start_x, start_y, end_x, end_y` of each
+                rectangle in compressed units.
+        """
+        return minimum_partition(free)
+
+
+def minimum_partition(free):
+    """Splits the free units of a mask into the fewest rectangles.
+
+    Notes:
+        Every reflex corner of the free land needs a cut. A chord joining two reflex corners
+        settles both with one cut, so the largest set of chords that do not cross is cut first.
+        Horizontal and vertical chords only cross each other, which makes that set the maximum
+        independent set of a bipartite graph, found through a maximum matching (Konig's
+        theorem). The reflex corners left over get a vertical cut each, up to the first cut or
+        edge they run into.
+
+    Args:
+        free (numpy.ndarray): `(height, width)` boolean mask of available units.
+
+    Returns:
+        (numpy.ndarray): `(N, 4)` int64 array of `start_x, start_y, end_x, end_y` of each
+            rectangle in units of the mask.
+    """
+    height, width = free.shape
+    padded = np.zeros((height + 2, width + 2), dtype=bool)
+    padded[1:-1, 1:-1] = free
+    # Grid lines between two free units, cuts can only run along these.
+    h_interior = padded[:-1, 1:-1] & padded[1:, 1:-1]
+    v_interior = padded[1:-1, :-1] & padded[1:-1, 1:]
+    # A grid point with three free units around it is a reflex corner.
+    reflex = (padded[:-1, :-1].astype(np.int8) + padded[:-1, 1:] +
+              padded[1:, :-1] + padded[1:, 1:]) == 3
+
+    h_chords = _chords(h_interior, reflex)
+    v_chords = _chords(v_interior.T, reflex.T)
+    cut_h = np.zeros((height + 1, width), dtype=bool)
+    cut_v = np.zeros((height, width + 1), dtype=bool)
+    h_kept, v_kept = _independent_chords(h_chords, v_chords)
+    for y, start_x, end_x in h_chords[h_kept].tolist():
+        cut_h[y, start_x:end_x] = True
+    for x, start_y, end_y in v_chords[v_kept].tolist():
+        cut_v[start_y:end_y, x] = True
+
+    # Cut up or down from the reflex corners no chord settled.
+    south_free = padded[1:, :-1] & padded[1:, 1:]
+    for y, x in zip(*np.nonzero(reflex)):
+        if not _touches_cut(y, x, cut_h, cut_v):
+            _cut_vertical(y, x, 1 if south_free[y, x] else -1, v_interior, cut_h, cut_v)
+
+    return _rectangles(free, cut_h | ~h_interior, cut_v | ~v_interior)
+
+
+def _chords(interior, reflex):
+    """Finds the chords joining two reflex corners along the lines of one axis.
+
+    Notes:
+        A reflex corner always has grid line on one side that is not interior, so it can only
+        sit at the end of a run of interior grid line. Runs with reflex corners at both ends
+        are the chords.
+
+    Args:
+        interior (numpy.ndarray): `(lines, segments)` mask of the interior grid line segments.
+        reflex (numpy.ndarray): `(lines, segments + 1)` mask of the reflex grid points.
+
+    Returns:
+        (numpy.ndarray): `(N, 3)` int64 array of `line, start, end` grid points of each chord.
+    """
+    steps = np.diff(np.pad(interior.astype(np.int8), ((0, 0), (1, 1))), axis=1)
+    lines, starts = np.nonzero(steps == 1)
+    _, ends = np.nonzero(steps == -1)
+    chords = reflex[lines, starts] & reflex[lines, ends]
+    return np.stack((lines[chords], starts[chords], ends[chords]), axis=1).astype(np.int64)
+
+
+def _independent_chords(h_chords, v_chords):
+    """Picks the largest set of chords that do not cross or share an end.
+
+    Args:
+        h_chords (numpy.ndarray): `(N, 3)` horizontal `y, start_x, end_x` chords.
+        v_chords (numpy.ndarray): `(M, 3)` vertical `x, start_y, end_y` chords.
+
+    Returns:
+        (tuple[numpy.ndarray]): Boolean masks of the kept horizontal and vertical chords.
+    """
+    edges = list()
+    for y, start_x, end_x in h_chords.tolist():
+        edges.append(np.flatnonzero((v_chords[:, 0] >= start_x) & (v_chords[:, 0] <= end_x) &
+                                    (v_chords[:, 1] <= y) & (v_chords[:, 2] >= y)).tolist())
+    match_h, match_v = _max_matching(edges, len(v_chords))
+
+    # Konig: walk alternating paths from the unmatched horizontal chords. The reached horizontal
+    # chords and the vertical chords that were not reached do not cross each other.
+    reached_h = np.zeros(len(h_chords), dtype=bool)
+    reached_v = np.zeros(len(v_chords), dtype=bool)
+    queue = deque(i for i in range(len(h_chords)) if match_h[i] < 0)
+    reached_h[list(queue)] = True
+    while queue:
+        for v in edges[queue.popleft()]:
+            if not reached_v[v]:
+                reached_v[v] = True
+                h = match_v[v]
+                if h >= 0 and not reached_h[h]:
+                    reached_h[h] = True
+                    queue.append(h)
+    return reached_h, ~reached_v
+
+
+def _max_matching(edges, count):
+    """Maximum bipartite matching with augmenting paths.
+
+    Args:
+        edges (list[list[int]]): The right items each left item is connected to.
+        count (int): The amount of right items.
+
+    Returns:
+        (tuple[list[int]]): The match of each left and of each right item, -1 if unmatched.
+    """
+    match_left = [-1] * len(edges)
+    match_right = [-1] * count
+    for left in range(len(edges)):
+        # Depth first search for an augmenting path, kept iterative for long paths.
+        seen = set()
+        stack = [(left, iter(edges[left]))]
+        parents = list()
+        while stack:
+            node, options = stack[-1]
+            for right in options:
+                if right in seen:
+                    continue
+                seen.add(right)
+                if match_right[right] < 0:
+                    # Flip the matches along the path.
+                    for path_left, path_right in parents + [(node, right)]:
+                        match_left[path_left] = path_right
+                        match_right[path_right] = path_left
+                    stack = list()
+                    break
+                parents.append((node, right))
+                stack.append((match_right[right], iter(edges[match_right[right]])))
+                break
+            else:
+                stack.pop()
+                if parents:
+                    parents.pop()
+    return match_left, match_right
+
+
+def _touches_cut(y, x, cut_h, cut_v):
+    """Checks to see if any cut ends at or runs through a grid point.
+
+    Args:
+        y (int): The y of the grid point.
+        x (int): The x of the grid point.
+        cut_h (numpy.ndarray): Cuts along the horizontal grid line segments.
+        cut_v (numpy.ndarray): Cuts along the vertical grid line segments.
+
+    Returns:
+        (bool): True if a cut touches the point else False.
+    """
+    height, width = cut_v.shape[0], cut_h.shape[1]
+    return bool((x > 0 and cut_h[y, x - 1]) or (x < width and cut_h[y, x]) or
+                (y > 0 and cut_v[y - 1, x]) or (y < height and cut_v[y, x]))
+
+
+def _cut_vertical(y, x, step, v_interior, cut_h, cut_v):
+    """Cuts along a vertical grid line until it meets an edge or another cut.
+
+    Args:
+        y (int): The y of the grid point to start from.
+        x (int): The x of the grid line.
+        step (int): 1 to cut down, -1 to cut up.
+        v_interior (numpy.ndarray): Mask of the interior vertical grid line segments.
+        cut_h (numpy.ndarray): Cuts along the horizontal grid line segments.
+        cut_v (numpy.ndarray): Cuts along the vertical grid line segments, modified in place.
+    """
+    height, width = cut_v.shape[0], cut_h.shape[1]
+    while True:
+        segment = y if step > 0 else y - 1
+        if not (0 <= segment < height) or not v_interior[segment, x] or cut_v[segment, x]:
+            return
+        cut_v[segment, x] = True
+        y += step
+        if (x > 0 and cut_h[y, x - 1]) or (x < width and cut_h[y, x]):
+            return
+
+
+def _rectangles(free, h_walls, v_walls):
+    """Reads the rectangles out of a mask that is fully cut up.
+
+    Args:
+        free (numpy.ndarray): `(height, width)` boolean mask of available units.
+        h_walls (numpy.ndarray): `(height + 1, width)` horizontal edges and cuts.
+        v_walls (numpy.ndarray): `(height, width + 1)` vertical edges and cuts.
+
+    Returns:
+        (numpy.ndarray): `(N, 4)` int64 array of `start_x, start_y, end_x, end_y`.
+    """
+    height, width = free.shape
+    # Every rectangle starts at a unit with walls above and to the left.
+    start_y, start_x = np.nonzero(free & h_walls[:-1, :] & v_walls[:, :-1])
+    # The next wall right of and below every grid line segment.
+    next_v = np.where(v_walls, np.arange(width + 1), width + 1)
+    next_v = np.minimum.accumulate(next_v[:, ::-1], axis=1)[:, ::-1]
+    next_h = np.where(h_walls, np.arange(height + 1)[:, None], height + 1)
+    next_h = np.minimum.accumulate(next_h[::-1], axis=0)[::-1]
+    end_x = next_v[start_y, start_x + 1] - 1
+    end_y = next_h[start_y + 1, start_x] - 1
+    return np.stack((start_x, start_y, end_x, end_y), axis=1).astype(np.int64)
@@ -0,0 +1,97 @@
+import time
+from contextlib import contextmanager
+
+
+class PhaseStats(object):
+    """Wall-clock time spent in each phase of an analysis.
+
+    Notes:
+        Times add up over repeated runs of a phase, `reset` starts over. The phases are:
+            parse: Reading the barren zones from the input.
+            insert: Adding and normalizing the barren zones.
+            mark: Marking the fertile zones, `check_zones` without the islands.
+            islands: Grouping the fertile zones into islands.
+            sort: Sorting the island areas.
+            render: Drawing or writing the image.
+    """
+
+    phases = ("parse", "insert", "mark", "islands", "sort", "render")
+
+    def __init__(self):
+        """PhaseStats initialization."""
+        self.seconds = dict()
+        self.calls = dict()
+        self.reset()
+
+    def reset(self):
+        """Clears the times of all phases."""
+        self.seconds = dict.fromkeys(self.phases, 0.0)
+        self.calls = dict.fromkeys(self.phases, 0)
+
+    @contextmanager
+    def phase(self, name):
+        """Times the code run inside of the context as part of a phase.
+
+        Args:
+            name (str): The phase, usually one of `phases`.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[name] = self.seconds.get(name, 0.0) + time.perf_counter() - start
+            self.calls[name] = self.calls.get(name, 0) + 1
+
+    def total(self):
+        """Gets the time of all phases together.
+
+        Returns:
+            (float): The seconds spent in all phases.
+        """
+        return sum(self.seconds.values())
+
+    def as_dict(self):
+        """Gets the stats as plain data, ready for JSON.
+
+        Returns:
+            (dict): The `seconds` and `calls` of each phase.
+        """
+        return {name: {"seconds": self.seconds[name], "calls": self.calls[name]}
+                for name in self.seconds}
+
+    def report(self):
+        """Formats the stats into a table, one phase per line.
+
+        Returns:
+            (str): The time, share of the total and amount of calls of every phase.
+        """
+        total = self.total()
+        lines = ["Phase        Seconds   Share  Calls"]
+        for name, seconds in self.seconds.items():
+            share = seconds / total * 100 if total else 0.0
+            lines.append(f"{name:<10} {seconds:>9.4f} {share:>6.1f}% {self.calls[name]:>6}")
+        lines.append(f"{'total':<10} {total:>9.4f}")
+        return "\n".join(lines)
+
+
+@contextmanager
+def profiled(path=None):
+    """Runs the code inside of the context under cProfile and dumps the stats to a file.
+
+    Notes:
+        Read the dump back with `pstats.Stats(path)` or tools like snakeviz.
+
+    Args:
+        path (str): The pstats file to write, nothing is profiled if not provided.
+    """
+    if not path:
+        yield None
+        return
+    import cProfile
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
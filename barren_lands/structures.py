@@ -0,0 +1,278 @@
+from collections import defaultdict
+
+import numpy as np
+
+
+class ZoneIndex(object):
+    """Uniform bucket grid to quickly find the zones that cover a coordinate.
+
+    Notes:
+        Zones are stored by an integer key alongside their bounds, so the index holds no zone
+        objects and the caller keeps the bounds to run the exact checks against.
+    """
+
+    # Most buckets along one side, keeps huge zones from spreading over millions of buckets.
+    max_buckets = 64
+
+    def __init__(self, width, height, bucket_size=None):
+        """ZoneIndex initialization.
+
+        Notes:
+            Zones reaching outside of the width/height are stored in the outer buckets, so
+            lookups outside of the field still find them.
+
+        Args:
+            width (int): The width of the area to index.
+            height (int): The height of the area to index.
+            bucket_size (int): The width and height of each bucket in units. Picked from the
+                size of the area if not provided.
+        """
+        if bucket_size is None:
+            bucket_size = max(16, -(-max(width, height) // self.max_buckets))
+        self.bucket_size = bucket_size
+        self.columns = max((width - 1) // bucket_size + 1, 1)
+        self.rows = max((height - 1) // bucket_size + 1, 1)
+        self.buckets = defaultdict(list)
+
+    def bucket(self, x, y):
+        """Gets the bucket that holds a coordinate.
+
+        Args:
+            x (int): The x coordinate.
+            y (int): The y coordinate.
+
+        Returns:
+            (int): The bucket key, clamped to the grid.
+        """
+        column = min(max(x // self.bucket_size, 0), self.columns - 1)
+        row = min(max(y // self.bucket_size, 0), self.rows - 1)
+        return column * self.rows + row
+
+    def buckets_of(self, start_x, start_y, end_x, end_y):
+        """Gets every bucket a rectangle overlaps.
+
+        Args:
+            start_x (int): The first x coordinate of the rectangle.
+            start_y (int): The first y coordinate of the rectangle.
+            end_x (int): The last x coordinate of the rectangle.
+            end_y (int): The last y coordinate of the rectangle.
+
+        Returns:
+            (list[int]): The bucket keys.
+        """
+        # Reversed rectangles are stored as they are, index them over the units they span.
+        if start_x > end_x:
+            start_x, end_x = end_x, start_x
+        if start_y > end_y:
+            start_y, end_y = end_y, start_y
+        size, last_column, last_row = self.bucket_size, self.columns - 1, self.rows - 1
+        first_column = min(max(start_x // size, 0), last_column)
+        first_row = min(max(start_y // size, 0), last_row)
+        rows = range(first_row, min(max(end_y // size, first_row), last_row) + 1)
+        return [column * self.rows + row
+                for column in range(first_column,
+                                    min(max(end_x // size, first_column), last_column) + 1)
+                for row in rows]
+
+    def insert(self, key, start_x, start_y, end_x, end_y):
+        """Adds a rectangle to the index.
+
+        Args:
+            key (int): The key to store the rectangle by.
+            start_x (int): The first x coordinate of the rectangle.
+            start_y (int): The first y coordinate of the rectangle.
+            end_x (int): The last x coordinate of the rectangle.
+            end_y (int): The last y coordinate of the rectangle.
+        """
+        for bucket in self.buckets_of(start_x, start_y, end_x, end_y):
+            self.buckets[bucket].append(key)
+
+    def remove(self, key, start_x, start_y, end_x, end_y):
+        """Removes a rectangle from the index.
+
+        Args:
+            key (int): The key the rectangle is stored by.
+            start_x (int): The first x coordinate of the rectangle.
+            start_y (int): The first y coordinate of the rectangle.
+            end_x (int): The last x coordinate of the rectangle.
+            end_y (int): The last y coordinate of the rectangle.
+        """
+        for bucket in self.buckets_of(start_x, start_y, end_x, end_y):
+            keys = self.buckets[bucket]
+            keys.remove(key)
+            if not keys:
+                del self.buckets[bucket]
+
+    def clear(self):
+        """Removes all rectangles from the index."""
+        self.buckets = defaultdict(list)
+
+    def candidates(self, x, y):
+        """Gets the keys of the rectangles that may contain a coordinate.
+
+        Args:
+            x (int): The x coordinate.
+            y (int): The y coordinate.
+
+        Returns:
+            (list[int]): The keys stored in the bucket of the coordinate.
+        """
+        size = self.bucket_size
+        column = min(max(x // size, 0), self.columns - 1)
+        row = min(max(y // size, 0), self.rows - 1)
+        return self.buckets.get(column * self.rows + row, ())
+
+    def candidates_of(self, start_x, start_y, end_x, end_y):
+        """Gets the keys of the rectangles that may overlap a rectangle.
+
+        Args:
+            start_x (int): The first x coordinate of the rectangle.
+            start_y (int): The first y coordinate of the rectangle.
+            end_x (int): The last x coordinate of the rectangle.
+            end_y (int): The last y coordinate of the rectangle.
+
+        Returns:
+            keys (set[int]): The keys stored in the buckets of the rectangle.
+        """
+        keys = set()
+        for bucket in self.buckets_of(start_x, start_y, end_x, end_y):
+            keys.update(self.buckets.get(bucket, ()))
+        return keys
+
+
+class DisjointSet(object):
+    """Union-find over the integers `0..size - 1`."""
+
+    def __init__(self, size):
+        """DisjointSet initialization.
+
+        Args:
+            size (int): The amount of items, each starting in its own group.
+        """
+        self.parent = list(range(size))
+        self.size = [1] * size
+
+    def find(self, item):
+        """Finds the representative item of the group an item belongs to.
+
+        Args:
+            item (int): The item to look up.
+
+        Returns:
+            (int): The representative of the group.
+        """
+        parent = self.parent
+        while parent[item] != item:
+            # Path halving, point every other item at its grandparent.
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, item_a, item_b):
+        """Merges the groups of two items.
+
+        Args:
+            item_a (int): Item of the first group.
+            item_b (int): Item of the second group.
+        """
+        root_a = self.find(item_a)
+        root_b = self.find(item_b)
+        if root_a == root_b:
+            return
+        # Hang the smaller group under the bigger one.
+        if self.size[root_a] < self.size[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        self.size[root_a] += self.size[root_b]
+
+    def groups(self):
+        """Collects the items of each group.
+
+        Returns:
+            (list[list[int]]): The items of every group.
+        """
+        groups = defaultdict(list)
+        for item in range(len(self.parent)):
+            groups[self.find(item)].append(item)
+        return list(groups.values())
+
+
+class SummedAreaTable(object):
+    """Integral image of covered units, counts the covered units of any rectangle in constant time.
+
+    Notes:
+        Units covered by more than one rectangle are counted once.
+    """
+
+    def __init__(self, width, height, bounds):
+        """SummedAreaTable initialization.
+
+        Args:
+            width (int): The width of the area.
+            height (int): The height of the area.
+            bounds (numpy.ndarray): `(N, 4)` array of `start_x, start_y, end_x, end_y` of the
+                covering rectangles, clipped to the area.
+        """
+        self.width = width
+        self.height = height
+        bounds = np.asarray(bounds, dtype=np.int64).reshape(-1, 4)
+        start_x = np.clip(bounds[:, 0], 0, width)
+        start_y = np.clip(bounds[:, 1], 0, height)
+        end_x = np.clip(bounds[:, 2] + 1, 0, width)
+        end_y = np.clip(bounds[:, 3] + 1, 0, height)
+        keep = (start_x < end_x) & (start_y < end_y)
+        # A single array is summed in place three times: the corners of every rectangle into
+        # the coverage, the coverage into covered units and those into the table. Shifted by a
+        # row and a column, the first row and column of the table stay 0.
+        dtype = np.int32 if width * height < 2 ** 31 else np.int64
+        table = burn_corners((height + 2, width + 2), start_x[keep] + 1, start_y[keep] + 1,
+                             end_x[keep] + 1, end_y[keep] + 1, dtype=dtype)
+        np.greater(table, 0, out=table, casting="unsafe")
+        for axis in (0, 1):
+            table.cumsum(axis=axis, dtype=dtype, out=table)
+        self.table = table[:height + 1, :width + 1]
+
+    def count(self, start_x, start_y, end_x, end_y):
+        """Counts the covered units of a rectangle inside the area.
+
+        Args:
+            start_x (int): The first x coordinate of the rectangle.
+            start_y (int): The first y coordinate of the rectangle.
+            end_x (int): The last x coordinate of the rectangle.
+            end_y (int): The last y coordinate of the rectangle.
+
+        Returns:
+            (int): The amount of covered units.
+        """
+        table = self.table
+        return int(table[end_y + 1, end_x + 1] - table[start_y, end_x + 1] -
+                   table[end_y + 1, start_x] + table[start_y, start_x])
+
+
+def burn_corners(shape, start_x, start_y, end_x, end_y, values=1, dtype=np.int32):
+    """Sums values over rectangles by marking their corners and running sums over both axes.
+
+    Notes:
+        Like a summed-area table in reverse, every rectangle costs four marks no matter its
+        size. The sums are taken in place in `dtype`, without any temporary arrays.
+
+    Args:
+        shape (tuple[int]): The rows and columns of the array, past the last end of each axis.
+        start_x (numpy.ndarray): The first column of each rectangle.
+        start_y (numpy.ndarray): The first row of each rectangle.
+        end_x (numpy.ndarray): The column right after each rectangle.
+        end_y (numpy.ndarray): The row right after each rectangle.
+        values (int|numpy.ndarray): The value of every rectangle or of each of them.
+        dtype (type): The dtype of the array.
+
+    Returns:
+        (numpy.ndarray): The sum of the values of the rectangles covering each cell.
+    """
+    summed = np.zeros(shape, dtype=dtype)
+    np.add.at(summed, (start_y, start_x), values)
+    np.add.at(summed, (start_y, end_x), -values)
+    np.add.at(summed, (end_y, start_x), -values)
+    np.add.at(summed, (end_y, end_x), values)
+    for axis in (0, 1):
+        summed.cumsum(axis=axis, dtype=dtype, out=summed)
+    return summed
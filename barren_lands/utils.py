@@ -1,4 +1,7 @@
 from pathlib import Path
+
+import numpy as np
+
 from .land import Coord, Zone
 
 
@@ -36,6 +39,84 @@ def format_raw_input(user_input):
     return [[int(i) for i in r.split(" ")] for r in raw_inputs]
 
 
+def format_stdin_input(user_input):
+    """Format a scenario line from STDIN into zones.
+
+    Args:
+        user_input (str): A line like `{"48 192 351 207", "48 392 351 407"}`.
+
+    Returns:
+        (list[Zone]): The zones of each coordinate set, empty for `{}`.
+    """
+    raw_input = user_input.strip().lstrip("{").rstrip("}")
+    if not raw_input.strip():
+        return list()
+    return [Zone(Coord(v[0], v[1]), Coord(v[2], v[3])) for v in format_raw_input(raw_input)]
+
+
+def load_bounds(path):
+    """Reads barren zones in bulk from a file, without creating a Zone for each of them.
+
+    Notes:
+        The format follows the suffix of the file:
+            .csv/.txt: One `start_x,start_y,end_x,end_y` zone per line, an optional header line
+                and `#` comments are skipped.
+            .npy: A NumPy `(N, 4)` integer array, memory-mapped.
+            .bin/.raw/.i32: Raw little-endian int32 `start_x start_y end_x end_y` records,
+                memory-mapped.
+
+    Args:
+        path (str): The file to read.
+
+    Returns:
+        (numpy.ndarray): `(N, 4)` integer array of `start_x, start_y, end_x, end_y`, backed by
+            the file for the memory-mapped formats.
+
+    Raises:
+        ValueError: If the suffix is unknown or the data is not made of 4 integer columns.
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix in (".csv", ".txt"):
+        bounds = _load_csv_bounds(path)
+    elif suffix == ".npy":
+        bounds = np.load(path, mmap_mode="r")
+        if bounds.ndim != 2 or bounds.shape[1] != 4 or bounds.dtype.kind not in "iu":
+            raise ValueError(f"Expected an (N, 4) integer array in {path}, got "
+                             f"{bounds.shape} {bounds.dtype}.")
+    elif suffix in (".bin", ".raw", ".i32"):
+        size = path.stat().st_size
+        if size % 16:
+            raise ValueError(f"{path} is not made of 16 byte int32 records.")
+        if not size:
+            # Empty files can not be memory-mapped.
+            return np.empty((0, 4), dtype="<i4")
+        bounds = np.memmap(path, dtype="<i4", mode="r").reshape(-1, 4)
+    else:
+        raise ValueError(f"Unknown zones file format {suffix!r}, use .csv, .npy or .bin.")
+    return bounds
+
+
+def _load_csv_bounds(path):
+    """Reads barren zones from a CSV file.
+
+    Args:
+        path (Path): The file to read.
+
+    Returns:
+        (numpy.ndarray): `(N, 4)` int64 array of `start_x, start_y, end_x, end_y`.
+    """
+    with open(path) as csv_file:
+        first = csv_file.readline()
+    # A first line with letters is a header.
+    header = any(character.isalpha() for character in first.split("#")[0])
+    bounds = np.loadtxt(path, delimiter=",", dtype=np.int64, comments="#",
+                        skiprows=int(header), ndmin=2)
+    if bounds.size and bounds.shape[1] != 4:
+        raise ValueError(f"Expected 4 columns in {path}, got {bounds.shape[1]}.")
+    return bounds.reshape(-1, 4)
+
+
 def get_icon():
     """Gets the icon file from the resources directory.
 
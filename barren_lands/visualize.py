@@ -1,10 +1,17 @@
-import random
+import io
+import zlib
+import struct
 from pathlib import Path
-from PIL import Image, ImageDraw
 
+import numpy as np
+from PIL import Image
 
-def display_image(islands, width=40, height=60, base=(20, 20, 20), test=False):
-    """Renders and image with random colors for each zone in bounds.
+from .land import bounds_array
+from .structures import burn_corners
+
+
+def display_image(islands, width=40, height=60, base=(20, 20, 20), test=False, path=None):
+    """Renders and image with a color for each zone in bounds.
 
     Args:
         islands (list[set]): list of grouped zones.
@@ -12,20 +19,219 @@ def display_image(islands, width=40, height=60, base=(20, 20, 20), test=False):
         height (int): Height of the image.
         base (tuple): The color to initially fill in the image with.
         test (bool): Used to disable show if running pytest.
-    """
-    img = Image.new("RGBA", size=(width, height), color=base)
-    drawer = ImageDraw.Draw(img)
-    img_out = Path(__file__).parent.parent.joinpath("grid.png")
-
-    for i, island in enumerate(islands):
-        for zone in island:
-            # Get a random color
-            rand_color = list(random.randint(0, 255) for i in range(3))
-            rand_color.append(10 if i else 255)
-            # Draw the zone.
-            drawer.rectangle(zone.rectangle(), fill=tuple(rand_color))
+        path (str): Where to save the image, defaults to `grid.png` next to the package.
 
+    Returns:
+        img (Image): The rendered image.
+    """
+    img = render_image(islands, width, height, base=base, by_zone=True)
     # Display the image
     vis = img.show() if not test else None
     # Save it out.
+    img_out = path or Path(__file__).parent.parent.joinpath("grid.png")
     img.save(img_out, format="png")
+    return img
+
+
+def render_image(islands, width=40, height=60, base=(20, 20, 20), by_zone=False, seed=0):
+    """Renders islands into an image in memory.
+
+    Notes:
+        The islands are burnt into a label array first, which is turned into colors with a
+        single lookup into the palette instead of drawing every zone on its own. The largest
+        island is opaque, the others are faint.
+
+    Args:
+        islands (list[ZoneStore|list[Zone]]): The islands, largest first.
+        width (int): Width of the image.
+        height (int): Height of the image.
+        base (tuple): The color of the land that is not part of an island.
+        by_zone (bool): Give every zone its own color instead of every island.
+        seed (int): Seed of the palette, the same seed always gives the same colors.
+
+    Returns:
+        (Image): The RGBA image.
+    """
+    labels, owners = island_labels(islands, width, height, by_zone=by_zone)
+    return Image.fromarray(label_colors(owners, base, seed)[labels], "RGBA")
+
+
+def render_bytes(islands, width=40, height=60, image_format="PNG", path=None, **kwargs):
+    """Renders islands into encoded image data.
+
+    Args:
+        islands (list[ZoneStore|list[Zone]]): The islands, largest first.
+        width (int): Width of the image.
+        height (int): Height of the image.
+        image_format (str): The PIL image format to encode with.
+        path (str): Also write the data to this file if provided.
+        **kwargs: Passed on to `render_image`.
+
+    Returns:
+        (bytes): The encoded image.
+    """
+    buffer = io.BytesIO()
+    render_image(islands, width, height, **kwargs).save(buffer, format=image_format)
+    data = buffer.getvalue()
+    if path:
+        Path(path).write_bytes(data)
+    return data
+
+
+def island_labels(islands, width, height, by_zone=False):
+    """Burns islands into an array of labels.
+
+    Notes:
+        Fertile zones never overlap, so the labels are summed up from the corners of every zone
+        in one pass, like a summed-area table in reverse.
+
+    Args:
+        islands (list[ZoneStore|list[Zone]]): The islands.
+        width (int): Width of the array.
+        height (int): Height of the array.
+        by_zone (bool): Label every zone on its own instead of every island.
+
+    Returns:
+        (tuple[numpy.ndarray]): `(height, width)` int32 labels, 0 where there is no island, and
+            the island of each label, -1 for label 0.
+    """
+    bounds, values, owners = _label_values(islands, by_zone)
+    return burn_labels(bounds, values, width, height), owners
+
+
+def burn_labels(bounds, values, width, height):
+    """Burns zones that do not overlap into an array of labels.
+
+    Args:
+        bounds (numpy.ndarray): `(N, 4)` bounds of the zones.
+        values (numpy.ndarray): The label of each zone.
+        width (int): Width of the array.
+        height (int): Height of the array.
+
+    Returns:
+        (numpy.ndarray): `(height, width)` int32 labels, 0 where there is no zone.
+    """
+    start_x = np.clip(bounds[:, 0], 0, width)
+    start_y = np.clip(bounds[:, 1], 0, height)
+    end_x = np.clip(bounds[:, 2] + 1, 0, width)
+    end_y = np.clip(bounds[:, 3] + 1, 0, height)
+    return burn_corners((height + 1, width + 1), start_x, start_y, end_x, end_y, values)[:-1, :-1]
+
+
+def label_colors(owners, base=(20, 20, 20), seed=0):
+    """Builds the RGBA color of every label, the largest island is opaque and the others faint.
+
+    Args:
+        owners (numpy.ndarray): The island of each label, -1 for label 0.
+        base (tuple): The color of label 0.
+        seed (int): Seed of the palette.
+
+    Returns:
+        (numpy.ndarray): `(len(owners), 4)` uint8 colors.
+    """
+    colors = np.empty((len(owners), 4), dtype=np.uint8)
+    colors[0] = tuple(base[:3]) + (255,)
+    colors[1:, :3] = palette(len(owners) - 1, seed=seed)
+    colors[1:, 3] = np.where(owners[1:] == 0, 255, 10)
+    return colors
+
+
+def _label_values(islands, by_zone=False):
+    """Collects the bounds of all zones of the islands with their labels.
+
+    Args:
+        islands (list[ZoneStore|list[Zone]]): The islands.
+        by_zone (bool): Label every zone on its own instead of every island.
+
+    Returns:
+        (tuple[numpy.ndarray]): The `(N, 4)` bounds, the label of each zone and the island of
+            each label, -1 for label 0.
+    """
+    bounds = [bounds_array(island) for island in islands]
+    # The island of every zone.
+    owners = np.repeat(np.arange(len(bounds)), [len(b) for b in bounds])
+    bounds = np.concatenate(bounds) if bounds else np.empty((0, 4), dtype=np.int64)
+    if by_zone:
+        values = np.arange(1, len(bounds) + 1)
+    else:
+        values = owners + 1
+        owners = np.arange(len(islands))
+    return bounds, values, np.concatenate(([-1], owners))
+
+
+def export_png(islands, width, height, path, strip_height=64, base=(20, 20, 20),
+               by_zone=False, seed=0, level=6):
+    """Streams islands into a PNG file strip by strip.
+
+    Notes:
+        Only one strip of `strip_height` rows is rendered at a time and compressed straight
+        into the file, so memory follows the width of the field and not its area. Up to 256
+        labels are written as a palette image, more as RGBA.
+
+    Args:
+        islands (list[ZoneStore|list[Zone]]): The islands, largest first.
+        width (int): Width of the image.
+        height (int): Height of the image.
+        path (str): The PNG file to write.
+        strip_height (int): The amount of rows rendered at once.
+        base (tuple): The color of the land that is not part of an island.
+        by_zone (bool): Give every zone its own color instead of every island.
+        seed (int): Seed of the palette.
+        level (int): The zlib compression level.
+    """
+    bounds, values, owners = _label_values(islands, by_zone)
+    colors = label_colors(owners, base, seed)
+    indexed = len(colors) <= 256
+    order = np.argsort(bounds[:, 1], kind="stable")
+    bounds, values = bounds[order], values[order]
+
+    with open(path, "wb") as png:
+        png.write(b"\x89PNG\r\n\x1a\n")
+        # Bit depth 8, color type 3 is a palette and 6 is RGBA.
+        _write_chunk(png, b"IHDR", struct.pack(">IIBBBBB", width, height, 8,
+                                               3 if indexed else 6, 0, 0, 0))
+        if indexed:
+            _write_chunk(png, b"PLTE", colors[:, :3].tobytes())
+            _write_chunk(png, b"tRNS", colors[:, 3].tobytes())
+        compressor = zlib.compressobj(level)
+        for top in range(0, height, strip_height):
+            rows = min(strip_height, height - top)
+            # Zones are sorted by their start, so the ones starting below the strip are skipped.
+            stop = np.searchsorted(bounds[:, 1], top + rows)
+            inside = bounds[:stop, 3] >= top
+            offset = np.array([0, top, 0, top])
+            labels = burn_labels(bounds[:stop][inside] - offset, values[:stop][inside], width, rows)
+            # Every row starts with filter type 0, no filtering.
+            strip = np.zeros((rows, width * (1 if indexed else 4) + 1), dtype=np.uint8)
+            strip[:, 1:] = labels if indexed else colors[labels].reshape(rows, -1)
+            data = compressor.compress(strip.tobytes())
+            if data:
+                _write_chunk(png, b"IDAT", data)
+        _write_chunk(png, b"IDAT", compressor.flush())
+        _write_chunk(png, b"IEND", b"")
+
+
+def _write_chunk(png, kind, data):
+    """Writes a single PNG chunk.
+
+    Args:
+        png (file): The binary file to write to.
+        kind (bytes): The four letter chunk type.
+        data (bytes): The data of the chunk.
+    """
+    png.write(struct.pack(">I", len(data)))
+    png.write(kind + data)
+    png.write(struct.pack(">I", zlib.crc32(kind + data) & 0xffffffff))
+
+
+def palette(count, seed=0):
+    """Deterministic colors for labels.
+
+    Args:
+        count (int): The amount of colors.
+        seed (int): The seed of the colors.
+
+    Returns:
+        (numpy.ndarray): `(count, 3)` uint8 RGB colors.
+    """
+    return np.random.RandomState(seed).randint(0, 256, size=(count, 3)).astype(np.uint8)
@@ -1,57 +1,235 @@
 import sys
 import argparse
-from barren_lands import land, utils
-
-# Generate the arguments for the command line input.
-parser = argparse.ArgumentParser(
-    description="Generates a list of rectangular zones that do not enter the 'barron-zones'.")
-parser.add_argument("--zones", type=str, nargs="+",
-                    help="List of space-separated barren zones.\n"
-                         "example input: '0 292 351 207'\n"
-                         "example multi input: '48 192 351 207' '48 392 351 407'")
-parser.add_argument("--width", type=int, default=400,
-                    help="The width of the available land for zoning.")
-parser.add_argument("--height", type=int, default=600,
-                    help="The height of the available land for zoning.")
-parser.add_argument("--vis", dest="vis", action="store_true",
-                    help="Render the zones into an image and display it.")
-parser.add_argument("--gui", dest="gui", action="store_true",
-                    help="Opens the GUI for visual feedback.")
-BARREN_DATA = parser.parse_args()
+from contextlib import nullcontext
 
 
-if __name__ == "__main__":
+def build_parser():
+    """Builds the command line arguments.
+
+    Returns:
+        parser (argparse.ArgumentParser): The parser of the case study arguments.
+    """
+    # Generate the arguments for the command line input.
+    parser = argparse.ArgumentParser(
+        description="Generates a list of rectangular zones that do not enter the 'barron-zones'.")
+    parser.add_argument("--zones", type=str, nargs="+",
+                        help="List of space-separated barren zones.\n"
+                             "example input: '0 292 351 207'\n"
+                             "example multi input: '48 192 351 207' '48 392 351 407'")
+    parser.add_argument("--zones-file", dest="zones_file", default=None,
+                        help="Read barren zones in bulk from a .csv, .npy or raw little-endian "
+                             "int32 .bin file, on top of --zones.")
+    parser.add_argument("--width", type=int, default=400,
+                        help="The width of the available land for zoning.")
+    parser.add_argument("--height", type=int, default=600,
+                        help="The height of the available land for zoning.")
+    parser.add_argument("--vis", dest="vis", action="store_true",
+                        help="Render the zones into an image and display it.")
+    parser.add_argument("--gui", dest="gui", action="store_true",
+                        help="Opens the GUI for visual feedback.")
+    parser.add_argument("--stdin", dest="stdin", action="store_true",
+                        help="Stream scenarios from STDIN, one per line.\n"
+                             "example line: {\"48 192 351 207\", \"48 392 351 407\"}")
+    parser.add_argument("--png", default=None,
+                        help="Stream the zones into this PNG file strip by strip, works for fields "
+                             "too large for --vis.")
+    parser.add_argument("--partition", dest="partition", action="store_true",
+                        help="Split the land into the fewest zones instead of scanning greedily.")
+    parser.add_argument("--normalize", dest="normalize", action="store_true",
+                        help="Merge and drop overlapping barren zones before the analysis, "
+                             "pays off for layouts with many redundant zones.")
+    parser.add_argument("--cache", default=None,
+                        help="File to keep analysis results in, repeated layouts are read back "
+                             "instead of analysed again.")
+    parser.add_argument("--tile-size", dest="tile_size", type=int, default=None,
+                        help="Split the field into tiles of this size and analyze them "
+                             "in parallel.")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="The amount of processes to analyze tiles with. (default: cpu count)")
+    parser.add_argument("--profile", nargs="?", const="", default=None, metavar="PSTATS",
+                        help="Print the time spent in each phase to STDERR. Also writes a "
+                             "cProfile dump to PSTATS if provided.")
+    parser.add_argument("--metrics", default=None,
+                        help="Count the hot paths and write the counters to this file, as "
+                             "Prometheus text for .prom files else as JSON.")
+    return parser
+
+
+def stream_scenarios(source, target, width, height, cache=None):
+    """Analyzes one scenario per line, writing the sorted island areas as soon as each is done.
+
+    Notes:
+        Repeated layouts are answered from the cache, in any order or with duplicate zones.
+
+    Args:
+        source (iterable[str]): Lines of scenarios, like `{"48 192 351 207", "48 392 351 407"}`.
+        target (file): Where to write one line of space separated areas per scenario.
+        width (int): The width of the field of every scenario.
+        height (int): The height of the field of every scenario.
+        cache (AnalysisCache): The results of earlier layouts, a new memory cache if not provided.
+    """
+    from barren_lands import utils
+    from barren_lands.cache import AnalysisCache
+
+    cache = cache or AnalysisCache()
+    for line in source:
+        if not line.strip():
+            continue
+        try:
+            areas = cache.island_areas(width, height, utils.format_stdin_input(line))
+            target.write(" ".join(str(area) for area in areas) + "\n")
+        except (ValueError, IndexError) as error:
+            # Keep the output lined up with the input, report the problem on STDERR.
+            print(f"Invalid scenario {line.strip()!r}: {error}", file=sys.stderr)
+            target.write("\n")
+        target.flush()
 
-    if BARREN_DATA.gui:
+
+def main(args=None):
+    """Command line entry point.
+
+    Notes:
+        The GUI and the renderer are only imported when asked for, so headless runs start
+        without loading PySide2 or PIL.
+
+    Args:
+        args (list[str]): The arguments to parse, defaults to `sys.argv`.
+    """
+    barren_data = build_parser().parse_args(args)
+
+    if barren_data.gui:
         from PySide2.QtWidgets import QApplication
         from barren_lands.interact import BarrenLandsWindow
         # Initialize the Qt Application
         case_study_app = QApplication(sys.argv)
         # Format zones for GUI raw_input
-        zones = " ".join([f'"{i}"' for i in BARREN_DATA.zones]) if BARREN_DATA.zones else None
+        zones = " ".join([f'"{i}"' for i in barren_data.zones]) if barren_data.zones else None
 
         # Initialize the window
-        window = BarrenLandsWindow(width=BARREN_DATA.width, height=BARREN_DATA.height, zones=zones)
+        window = BarrenLandsWindow(width=barren_data.width, height=barren_data.height, zones=zones,
+                                   cache_path=barren_data.cache)
         # Display the UI
         window.show()
         # Kickstart the application
         case_study_app.exec_()
         sys.exit(0)
+    # The metrics and the profiler are only imported when asked for, like the analysis modules.
+    counting = nullcontext()
+    if barren_data.metrics:
+        from barren_lands import metrics
+        counting = metrics.counting()
+    profiling = nullcontext()
+    if barren_data.profile is not None:
+        from barren_lands.profiling import profiled
+        profiling = profiled(barren_data.profile)
+    with counting as counted, profiling as profiler:
+        stats = run_analysis(barren_data)
+    if counted is not None:
+        counted.dump(barren_data.metrics)
+        print(f"Wrote metrics to {barren_data.metrics}", file=sys.stderr)
+    if barren_data.profile is not None:
+        if stats is not None:
+            print(stats.report(), file=sys.stderr)
+        if profiler is not None:
+            print(f"Wrote profile to {barren_data.profile}", file=sys.stderr)
+
+
+def run_analysis(barren_data):
+    """Runs the headless analysis the arguments ask for and prints the results.
+
+    Args:
+        barren_data (argparse.Namespace): The parsed arguments.
+
+    Returns:
+        (PhaseStats): The time spent in each phase, None when streaming from STDIN.
+    """
+    from barren_lands import land
+    from barren_lands.cache import AnalysisCache
+    from barren_lands.profiling import PhaseStats
+
+    cache = AnalysisCache(path=barren_data.cache)
+    if barren_data.stdin:
+        with cache:
+            stream_scenarios(sys.stdin, sys.stdout, barren_data.width, barren_data.height, cache)
+        return None
+    if not (barren_data.vis or barren_data.png or barren_data.partition or
+            barren_data.tile_size or barren_data.workers):
+        # Only the areas are needed, skip building the zones.
+        stats = PhaseStats()
+        with stats.phase("parse"):
+            barren = read_barren(barren_data)
+        with cache, stats.phase("islands"):
+            areas = cache.island_areas(barren_data.width, barren_data.height, barren)
+        print("Island Areas:", areas)
+        return stats
+
+    # Generate the initial field in which the barron zones are placed.
+    if barren_data.partition:
+        from barren_lands.partition import PartitionField
+        engine = PartitionField
+    elif barren_data.png:
+        # The PNG is written in strips, the analysis must not hold the whole field either.
+        from barren_lands.grid import CompressedField
+        engine = CompressedField
+    else:
+        engine = None
+    if barren_data.tile_size or barren_data.workers:
+        from barren_lands.grid import GridField
+        from barren_lands.parallel import TiledField
+        field = TiledField(barren_data.width, barren_data.height,
+                           tile_size=barren_data.tile_size or 512, workers=barren_data.workers,
+                           engine=engine or GridField)
     else:
+        field = (engine or land.Field)(barren_data.width, barren_data.height)
+    if barren_data.metrics:
+        from barren_lands import metrics
+        # Count the check_zones of the engines in use, tiles analysed in this process included.
+        metrics.register_engine(type(field), getattr(field, "engine", type(field)))
+    with field.stats.phase("parse"):
+        barren = read_barren(barren_data)
+    # Add all zones from the command line and the zones file into the field at once.
+    with field.stats.phase("insert"):
+        field.barren_zones.extend_bounds(barren)
+    if barren_data.normalize:
+        # Check the coordinates against as few barren zones as possible.
+        removed = field.normalize_barren()
+        print(f"Normalized away {removed} barren zones.", file=sys.stderr)
+
+    # Run the tool to find the rectangular zones.
+    with cache:
+        cache.analyze(field)
+    print(f"Fertile zones: {len(field.fertile_zones)}", file=sys.stderr)
 
-        # Generate the initial field in which the barron zones are placed.
-        Field = land.Field(BARREN_DATA.width, BARREN_DATA.height)
-        # Add all zones from the command line into the field.
-        for barren_coord in BARREN_DATA.zones:
-            barren_zone = utils.format_input(barren_coord)
-            Field.add_zone(barren_zone, barren=True)
+    if barren_data.vis:
+        # Create and display an image of the data.
+        field.display()
+    if barren_data.png:
+        field.export_png(barren_data.png, by_zone=True)
 
-        # Run the tool to find the rectangular zones.
-        Field.check_zones()
+    # Return the zone areas sorted from least to most surface area.
+    print("Island Areas:", field.islands_as_area())
+    return field.stats
 
-        if BARREN_DATA.vis:
-            # Create and display an image of the data.
-            Field.display()
 
-        # Return the zone areas sorted from least to most surface area.
-        print("Island Areas:", Field.islands_as_area())
+def read_barren(barren_data):
+    """Collects the barren zones of the arguments, without creating a Zone for each of them.
+
+    Args:
+        barren_data (argparse.Namespace): The parsed arguments.
+
+    Returns:
+        (numpy.ndarray): `(N, 4)` bounds of the `--zones` and the `--zones-file` zones.
+    """
+    import numpy as np
+    from barren_lands import land, utils
+
+    bounds = land.bounds_array([utils.format_input(zone) for zone in barren_data.zones or ()])
+    if not barren_data.zones_file:
+        return bounds
+    loaded = utils.load_bounds(barren_data.zones_file)
+    # Keep the memory-mapped file as it is when there is nothing to add to it.
+    return np.concatenate((bounds, loaded)) if len(bounds) else loaded
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import random
+
+import numpy as np
+import pytest
+
+from barren_lands.areas import island_areas
+from barren_lands.grid import GridField
+from barren_lands.land import Coord, Zone
+
+
+@pytest.mark.parametrize("barren, areas", [
+    ([], [240000]),
+    ([(0, 292, 399, 307)], [116800, 116800]),
+    ([(48, 192, 351, 207), (48, 392, 351, 407), (120, 52, 135, 547), (260, 52, 275, 547)],
+     [22816, 192608]),
+    ([(0, 0, 399, 599)], []),
+    ([(-50, 100, 999, 199)], [40000, 160000]),
+])
+def test_island_areas(barren, areas):
+    zones = [Zone(Coord(sx, sy), Coord(ex, ey)) for sx, sy, ex, ey in barren]
+    assert island_areas(400, 600, zones) == areas
+    # Bounds arrays are taken as is.
+    assert island_areas(400, 600, np.array(barren).reshape(-1, 4)) == areas
+
+
+def test_island_areas_diagonal():
+    # Land touching only by a corner is a single island.
+    barren = np.array([[0, 0, 1, 1], [2, 2, 3, 3]])
+    assert island_areas(4, 4, barren) == [8]
+
+
+def test_island_areas_matches_field():
+    # Random layouts give the same areas as the zone based analysis.
+    rand = random.Random(1)
+    for _ in range(50):
+        width, height = rand.randrange(1, 30), rand.randrange(1, 30)
+        field = GridField(width, height)
+        for _ in range(rand.randrange(10)):
+            x, y = rand.randrange(-2, width), rand.randrange(-2, height)
+            field.add_zone(Zone(Coord(x, y), Coord(x + rand.randrange(6), y + rand.randrange(6))),
+                           barren=True)
+        field.check_zones()
+        assert island_areas(width, height, field.barren_zones) == field.islands_as_area()
+
+
+def test_island_areas_scale():
+    # A large sparse layout leaves a single island, whatever the order of the zones.
+    rng = np.random.default_rng(0)
+    start = rng.integers(0, 10 ** 6, size=(20000, 2))
+    barren = np.hstack((start, start + rng.integers(0, 1000, size=(20000, 2))))
+    areas = island_areas(10 ** 6, 10 ** 6, barren)
+
+    assert len(areas) == 1
+    assert island_areas(10 ** 6, 10 ** 6, np.concatenate((barren, barren))[::-1]) == areas
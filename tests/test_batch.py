@@ -0,0 +1,66 @@
+import json
+import pytest
+from barren_lands.batch import analyze_scenario, chunked, run_batch, main
+
+SCENARIOS = [
+    {"id": 0, "width": 400, "height": 600, "barren": ["0 292 399 307"]},
+    {"id": 1, "barren": [[48, 192, 351, 207], [48, 392, 351, 407],
+                         [120, 52, 135, 547], [260, 52, 275, 547]]},
+    {"id": 2, "width": 6, "height": 6, "barren": []},
+]
+AREAS = [[116800, 116800], [22816, 192608], [36]]
+
+
+def test_analyze_scenario():
+    result = analyze_scenario(json.dumps(SCENARIOS[0]))
+
+    assert result == {"id": 0, "areas": AREAS[0]}
+
+
+def test_analyze_scenario_error():
+    # A broken scenario is reported instead of stopping the batch.
+    result = analyze_scenario('{"id": 3, "barren": ["1 2"]}')
+
+    assert result["id"] == 3
+    assert "error" in result
+
+
+def test_chunked():
+    chunks = list(chunked(["a", "", "b", "c"], 2))
+
+    assert chunks == [["a", "b"], ["c"]]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_run_batch_order(workers):
+    lines = [json.dumps(s) for s in SCENARIOS] * 3
+    results = [json.loads(r) for r in run_batch(lines, workers=workers, chunk_size=1)]
+
+    assert [r["id"] for r in results] == [0, 1, 2] * 3
+    assert [r["areas"] for r in results] == AREAS * 3
+
+
+def test_main(tmp_path, monkeypatch):
+    scenarios = tmp_path.joinpath("scenarios.jsonl")
+    scenarios.write_text("\n".join(json.dumps(s) for s in SCENARIOS))
+    output = tmp_path.joinpath("results.jsonl")
+    main([str(scenarios), "--output", str(output), "--workers", "1"])
+
+    assert [json.loads(r)["areas"] for r in output.read_text().splitlines()] == AREAS
+
+
+def test_analyze_scenario_engine():
+    # A Field engine gives the same areas as the area-only fast path.
+    from barren_lands.grid import CompressedField
+    for scenario, areas in zip(SCENARIOS, AREAS):
+        assert analyze_scenario(json.dumps(scenario), engine=CompressedField)["areas"] == areas
+
+
+def test_main_engine(tmp_path):
+    # The engine flag reaches the workers.
+    scenarios = tmp_path.joinpath("scenarios.jsonl")
+    scenarios.write_text("\n".join(json.dumps(s) for s in SCENARIOS))
+    output = tmp_path.joinpath("results.jsonl")
+    main([str(scenarios), "--output", str(output), "--workers", "2", "--engine", "partition"])
+
+    assert [json.loads(r)["areas"] for r in output.read_text().splitlines()] == AREAS
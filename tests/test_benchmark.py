@@ -0,0 +1,49 @@
+import json
+import pytest
+from barren_lands.benchmark import (random_rectangles, comb, strips, readme_sample, workloads,
+                                    run_workload, run_sweep, scaling, compare, main, ENGINES)
+
+
+def test_generators_reproducible():
+    assert random_rectangles(50, 50, 5, seed=1) == random_rectangles(50, 50, 5, seed=1)
+    assert strips(50, 50, 4, seed=2) == strips(50, 50, 4, seed=2)
+    assert len(comb(8, 8, spacing=4)) == 4
+
+
+def test_readme_sample():
+    width, height, rectangles = readme_sample(2)
+
+    assert (width, height) == (800, 1200)
+    assert rectangles[0] == (96, 384, 703, 415)
+
+
+def test_run_workload():
+    width, height, rectangles = readme_sample()
+    result = run_workload(ENGINES["grid"], width, height, rectangles)
+
+    assert result["islands"] == 2
+    assert result["check_zones"] > 0
+
+
+def test_run_sweep():
+    result = run_sweep(200, size=1000, max_size=50)
+
+    assert result["barren_zones"] == 200
+    assert 0 < result["normalized_zones"] <= 200
+    assert result["island_areas"] > 0
+
+
+def test_scaling():
+    results = [{"check_zones": 1.0, "area": 10, "fertile_zones": 1},
+               {"check_zones": 4.0, "area": 20, "fertile_zones": 2}]
+
+    assert scaling(results) == {"area": 2.0, "fertile_zones": 2.0}
+
+
+def test_main(tmp_path, capsys):
+    output = tmp_path.joinpath("bench.json")
+    main(["--sizes", "1", "--repeat", "1", "--engines", "compressed", "--output", str(output)])
+    report = json.loads(output.read_text())
+
+    assert len(report["results"]) == len(list(workloads([1])))
+    assert compare(report, report)
@@ -0,0 +1,87 @@
+import numpy as np
+
+from barren_lands.cache import AnalysisCache, canonical_key
+from barren_lands.grid import GridField
+from barren_lands.land import Field, Coord, Zone
+from barren_lands.parallel import TiledField
+from barren_lands.utils import format_raw_input
+
+SAMPLE = [(48, 192, 351, 207), (48, 392, 351, 407), (120, 52, 135, 547), (260, 52, 275, 547)]
+
+
+def test_canonical_key():
+    key = canonical_key("areas", 400, 600, np.array(SAMPLE))
+    # Order, duplicates, zones outside the field, overhangs and curly quotes do not matter.
+    shuffled = SAMPLE[::-1] + SAMPLE[:1] + [(500, 0, 600, 10)]
+    assert canonical_key("areas", 400, 600, np.array(shuffled)) == key
+    assert (canonical_key("areas", 400, 600, np.array([(-10, 292, 450, 307)])) ==
+            canonical_key("areas", 400, 600, np.array([(0, 292, 399, 307)])))
+    raw = "“48 192 351 207”, \"48 392 351 407\", “120 52 135 547” “260 52 275 547”"
+    assert canonical_key("areas", 400, 600, np.array(format_raw_input(raw))) == key
+    # The field and what is cached do.
+    assert canonical_key("areas", 400, 601, np.array(SAMPLE)) != key
+    assert canonical_key("Field", 400, 600, np.array(SAMPLE)) != key
+
+
+def test_island_areas():
+    cache = AnalysisCache()
+
+    assert cache.island_areas(400, 600, np.array(SAMPLE)) == [22816, 192608]
+    assert cache.island_areas(400, 600, np.array(SAMPLE[::-1])) == [22816, 192608]
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_lru():
+    cache = AnalysisCache(max_size=2)
+    for key in "abc":
+        cache.put(key, key)
+
+    assert list(cache.memory) == ["b", "c"]
+    assert cache.get("a") is None
+
+
+def test_analyze():
+    cache = AnalysisCache()
+    fields = [GridField(400, 600) for _ in range(2)]
+    for field in fields:
+        for sx, sy, ex, ey in SAMPLE:
+            field.add_zone(Zone(Coord(sx, sy), Coord(ex, ey)), barren=True)
+        cache.analyze(field)
+
+    assert cache.hits == 1
+    assert fields[1].islands_as_area() == fields[0].islands_as_area() == [22816, 192608]
+    assert set(fields[1].fertile_zones) == set(fields[0].fertile_zones)
+    assert fields[1].fertile_zones.covers(0, 0)
+
+
+def test_analyze_tile_sizes():
+    # Tiles cut the zones at their seams, every tile size and engine keeps its own results.
+    cache = AnalysisCache()
+    counts = list()
+    for tile_size in (300, 100, 300):
+        field = TiledField(400, 600, tile_size=tile_size, workers=1)
+        field.barren_zones.extend_bounds(np.array(SAMPLE))
+        cache.analyze(field)
+        fresh = TiledField(400, 600, tile_size=tile_size, workers=1)
+        fresh.barren_zones.extend_bounds(np.array(SAMPLE))
+        fresh.check_zones()
+        assert len(field.fertile_zones) == len(fresh.fertile_zones)
+        counts.append(len(field.fertile_zones))
+    assert counts[0] != counts[1]
+    assert cache.hits == 1
+
+
+def test_disk_store(tmp_path):
+    path = str(tmp_path / "cache")
+    with AnalysisCache(path=path) as cache:
+        field = Field(10, 10)
+        field.add_zone(Zone(Coord(0, 5), Coord(9, 5)), barren=True)
+        cache.analyze(field)
+
+    # A new cache, like after a restart, reads the result back from disk.
+    with AnalysisCache(path=path) as cache:
+        field = Field(10, 10)
+        field.add_zone(Zone(Coord(0, 5), Coord(9, 5)), barren=True)
+        cache.analyze(field)
+        assert cache.hits == 1
+        assert field.islands_as_area() == [40, 50]
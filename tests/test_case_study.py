@@ -0,0 +1,94 @@
+import sys
+import json
+import pstats
+import subprocess
+from pathlib import Path
+
+import numpy as np
+
+import case_study
+from barren_lands import land, utils
+from barren_lands.areas import island_areas
+from barren_lands.cache import AnalysisCache
+from barren_lands.grid import CompressedField
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_import_is_headless():
+    # The analysis core and the CLI should import without the render or GUI libraries.
+    code = ("import sys, case_study, barren_lands.land, barren_lands.grid, barren_lands.parallel, "
+            "barren_lands.batch; print(sorted(m for m in ('PIL', 'PySide2') if m in sys.modules))")
+    output = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True,
+                            text=True, check=True).stdout
+    assert output.strip() == "[]"
+
+
+def test_import_time():
+    # Importing the CLI loads none of the analysis modules, they are imported once used.
+    code = ("import sys, case_study; print(sorted(m for m in ('numpy', 'shelve', 'cProfile', "
+            "'barren_lands.cache', 'barren_lands.metrics', 'barren_lands.profiling') "
+            "if m in sys.modules))")
+    output = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True,
+                            text=True, check=True).stdout
+    assert output.strip() == "[]"
+
+
+def test_main(capsys):
+    # Run the CLI as a library call.
+    case_study.main(["--zones", "0 292 399 307"])
+    assert capsys.readouterr().out.strip() == "Island Areas: [116800, 116800]"
+
+
+def test_zones_file(capsys, tmp_path):
+    # Zones from a file and from the command line are analysed together.
+    path = tmp_path.joinpath("zones.csv")
+    path.write_text("48,192,351,207\n48,392,351,407\n120,52,135,547\n")
+    case_study.main(["--zones-file", str(path), "--zones", "260 52 275 547", "--partition"])
+    assert capsys.readouterr().out.strip() == "Island Areas: [22816, 192608]"
+
+
+def test_png_engine(capsys, tmp_path, monkeypatch):
+    # The PNG export runs on an engine whose memory does not grow with the field.
+    engines = list()
+    analyze = AnalysisCache.analyze
+    monkeypatch.setattr(AnalysisCache, "analyze",
+                        lambda cache, field: engines.append(type(field)) or analyze(cache, field))
+    case_study.main(["--zones", "0 292 399 307", "--png", str(tmp_path.joinpath("field.png"))])
+
+    assert capsys.readouterr().out.strip() == "Island Areas: [116800, 116800]"
+    assert engines == [CompressedField]
+
+
+def test_profile(capsys, tmp_path):
+    # The phases go to STDERR, the results stay on STDOUT.
+    dump = tmp_path.joinpath("analysis.pstats")
+    case_study.main(["--zones", "0 292 399 307", "--partition", "--profile", str(dump)])
+    captured = capsys.readouterr()
+    assert captured.out.strip() == "Island Areas: [116800, 116800]"
+    assert "mark" in captured.err
+    assert pstats.Stats(str(dump)).total_calls > 0
+
+
+def test_scale(capsys, tmp_path):
+    # 10k zones from a raw file run through the CLI, the normalized zones leave the same
+    # islands. The timing at scale is left to `benchmark --sweep`.
+    rng = np.random.default_rng(0)
+    start = rng.integers(0, 10 ** 5, size=(10000, 2))
+    bounds = np.hstack((start, start + rng.integers(0, 1000, size=(10000, 2))))
+    path = tmp_path.joinpath("zones.bin")
+    bounds.astype("<i4").tofile(path)
+    case_study.main(["--width", "100000", "--height", "100000", "--zones-file", str(path)])
+    areas = json.loads(capsys.readouterr().out.split(":", 1)[1])
+
+    field = land.Field(10 ** 5, 10 ** 5)
+    field.barren_zones.extend_bounds(utils.load_bounds(str(path)))
+    removed = field.normalize_barren()
+    assert removed == 258
+    assert island_areas(10 ** 5, 10 ** 5, field.barren_zones) == areas
+
+
+def test_stream_scenarios(capsys):
+    # Every line gets its own line of areas, invalid lines stay lined up as empty lines.
+    case_study.stream_scenarios(['{"0 292 399 307"}\n', '{"1 2"}\n', "{}\n"], sys.stdout, 400, 600)
+    assert capsys.readouterr().out.split("\n") == ["116800 116800", "", "240000", ""]
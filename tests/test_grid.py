@@ -0,0 +1,141 @@
+import pytest
+import random
+import numpy as np
+from barren_lands.land import Field, Zone, Coord
+from barren_lands.grid import (GridField, CompressedField, rasterize, rasterize_compressed,
+                               decompose, label_regions)
+
+
+def build_field(field_class, width, height, barren):
+    field = field_class(width, height)
+    for zone in barren:
+        field.add_zone(Zone(Coord(zone[0], zone[1]), Coord(zone[2], zone[3])), barren=True)
+    return field
+
+
+def zone_bounds(zones):
+    return sorted((z.start.x, z.start.y, z.end.x, z.end.y) for z in zones)
+
+
+class TestGridField:
+    barren = [(0, 3, 3, 3), (3, 3, 3, 5), (1, 5, 1, 5)]
+
+    def test_check_zones(self):
+        field = build_field(GridField, 6, 6, self.barren)
+        field.check_zones()
+
+        assert len(field.fertile_zones) == 5
+        assert len(field.islands) == 2
+
+    def test_matches_field(self):
+        # The grid engine must produce the exact same zones as the original Field.
+        grid_field = build_field(GridField, 6, 6, self.barren)
+        grid_field.check_zones()
+        field = build_field(Field, 6, 6, self.barren)
+        field.check_zones()
+
+        assert zone_bounds(grid_field.fertile_zones) == zone_bounds(field.fertile_zones)
+        assert grid_field.islands_as_area() == field.islands_as_area()
+
+    def test_matches_field_random(self):
+        rand = random.Random(7)
+        for _ in range(10):
+            barren = list()
+            for _ in range(rand.randint(1, 6)):
+                x, y = rand.randint(0, 14), rand.randint(0, 11)
+                barren.append((x, y, x + rand.randint(0, 5), y + rand.randint(0, 5)))
+            grid_field = build_field(GridField, 15, 12, barren)
+            grid_field.check_zones()
+            field = build_field(Field, 15, 12, barren)
+            field.check_zones()
+
+            assert zone_bounds(grid_field.fertile_zones) == zone_bounds(field.fertile_zones)
+            assert grid_field.islands_as_area() == field.islands_as_area()
+
+    @pytest.mark.parametrize("barren, areas", [
+        ([(0, 292, 399, 307)], [116800, 116800]),
+        ([(48, 192, 351, 207), (48, 392, 351, 407), (120, 52, 135, 547), (260, 52, 275, 547)],
+         [22816, 192608]),
+    ])
+    def test_samples(self, barren, areas):
+        field = build_field(GridField, 400, 600, barren)
+        field.check_zones()
+
+        assert field.islands_as_area() == areas
+
+
+class TestCompressedField:
+
+    @pytest.mark.parametrize("barren, areas", [
+        ([(0, 292, 399, 307)], [116800, 116800]),
+        ([(48, 192, 351, 207), (48, 392, 351, 407), (120, 52, 135, 547), (260, 52, 275, 547)],
+         [22816, 192608]),
+    ])
+    def test_samples(self, barren, areas):
+        field = build_field(CompressedField, 400, 600, barren)
+        field.check_zones()
+
+        assert field.islands_as_area() == areas
+
+    def test_matches_field_random(self):
+        rand = random.Random(11)
+        for _ in range(10):
+            barren = list()
+            for _ in range(rand.randint(1, 6)):
+                x, y = rand.randint(-2, 14), rand.randint(-2, 11)
+                barren.append((x, y, x + rand.randint(0, 5), y + rand.randint(0, 5)))
+            compressed_field = build_field(CompressedField, 15, 12, barren)
+            compressed_field.check_zones()
+            field = build_field(GridField, 15, 12, barren)
+            field.check_zones()
+
+            assert compressed_field.islands_as_area() == field.islands_as_area()
+
+    def test_large_field(self):
+        # A million by a million metres only costs as much as its few barren zones.
+        barren = [(0, 500000, 999999, 500009), (250000, 0, 250009, 999999)]
+        field = build_field(CompressedField, 1000000, 1000000, barren)
+        field.check_zones()
+
+        assert field.islands_as_area() == sorted([
+            250000 * 500000, 250000 * 499990, 749990 * 500000, 749990 * 499990])
+        assert len(field.fertile_zones) == 4
+
+
+def test_rasterize_compressed():
+    zones = [Zone(Coord(2, 0), Coord(4, 9))]
+    mask = rasterize_compressed(zones, np.array([0, 2, 5, 10]), np.array([0, 10]))
+
+    assert mask.tolist() == [[False, True, False]]
+
+
+def test_rasterize_clips():
+    zones = [Zone(Coord(-2, -2), Coord(0, 1)), Zone(Coord(3, 3), Coord(9, 9))]
+    mask = rasterize(zones, 4, 4)
+
+    assert mask.sum() == 3
+    assert mask[0, 0] and mask[1, 0] and mask[3, 3]
+
+
+def test_decompose():
+    free = np.ones((3, 4), dtype=bool)
+    free[1, 1] = False
+    zones = list(decompose(free))
+
+    assert zones[0] == (0, 0, 3, 0)
+    assert sum((z[2] - z[0] + 1) * (z[3] - z[1] + 1) for z in zones) == 11
+    assert not free.any()
+
+
+def test_label_regions_diagonal():
+    mask = np.array([
+        [1, 0, 0],
+        [0, 1, 0],
+        [0, 0, 0],
+    ], dtype=bool)
+    _, count = label_regions(mask)
+    assert count == 1
+
+    labels, count = label_regions(mask, diagonal=False)
+    assert count == 2
+    assert labels[0, 0] != labels[1, 1]
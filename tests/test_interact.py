@@ -3,6 +3,7 @@ import pytest
 from PySide2.QtWidgets import QApplication
 
 from barren_lands.interact import BarrenLandsWindow
+from barren_lands.land import Coord, Zone
 
 
 class TestGUI:
@@ -25,15 +26,52 @@ class TestGUI:
         # Test running the analysis and check results.
         # 'click' the Run button
         self.window.btn_run.click()
+        # The analysis runs on a thread, wait for it and the drawing to be done.
+        assert self.window.btn_cancel.isEnabled()
+        self.window.wait_for_run()
 
-        assert len(self.window.fertile_zones) == 2
+        assert len(self.window.field.fertile_zones) == 2
+        # All fertile zones are drawn by a single item.
+        assert self.window.fertile_item is not None
+        assert not self.window.btn_cancel.isEnabled()
+
+    def test_cancel(self):
+        # Cancelling stops the analysis and gives the controls back.
+        self.window.btn_run.click()
+        self.window.btn_cancel.click()
+        self.window.wait_for_run()
+
+        assert self.window.btn_run.isEnabled()
+
+    def test_live(self):
+        # Live mode analyses the input by itself once the typing stops.
+        self.window.chk_live.setChecked(True)
+        assert not self.window.btn_run.isEnabled()
+        self.window.raw_input.setPlainText('"0 3 5 3"')
+        self.window.live_update()
+        self.window.live_thread.wait()
+        self.window.app.processEvents()
+        self.window.wait_for_run()
+
+        assert len(self.window.field.fertile_zones) == 2
+        self.window.chk_live.setChecked(False)
+        assert self.window.btn_run.isEnabled()
+
+    def test_live_rejects_invalid(self):
+        # Reversed zones and zones out of the int32 range never reach the live thread.
+        self.window.raw_input.setPlainText('"3 3 0 0"')
+        assert self.window.parse_input() is None
+        self.window.raw_input.setPlainText(f'"0 0 {2 ** 31} 1"')
+        assert self.window.parse_input() is None
+        self.window.raw_input.setPlainText('"0 3 5 3"')
+        assert self.window.parse_input() == [Zone(Coord(0, 3), Coord(5, 3))]
 
     def test_clear(self):
         # Make sure the reset, clears out all of the required data.
         # 'click' the Reset button
         self.window.btn_reset.click()
 
-        assert len(self.window.fertile_zones) == 0
+        assert self.window.fertile_item is None
         assert len(self.window.barren_zones) == 0
         assert len(self.window.field.barren_zones) == 0
         assert len(self.window.field.fertile_zones) == 0
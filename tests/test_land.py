@@ -1,7 +1,12 @@
 import pytest
 import os
 from pathlib import Path
-from barren_lands.land import Field, Zone, Coord
+import random
+import numpy as np
+from barren_lands.grid import GridField
+from barren_lands.land import (AnalysisCancelled, Field, Zone, Coord, ZoneStore, ZoneSet,
+                               touching_zones, adjacency, bounds_array, clip_bounds,
+                               normalize_zones, _drop_contained)
 
 
 class TestField:
@@ -96,6 +101,265 @@ class TestField:
         self.new_field.gather_islands()
         assert len(self.new_field.islands) == 2
 
+    def test_is_area_free(self):
+        field = Field(6, 6)
+        field.add_zone(Zone(Coord(3, 3), Coord(3, 5)), barren=True)
+        field.add_zone(Zone(Coord(0, 0), Coord(1, 1)))
+
+        assert field.is_area_free(2, 0, 5, 2)
+        assert not field.is_area_free(2, 2, 4, 4)  # Barren
+        assert not field.is_area_free(1, 1, 2, 2)  # Used
+        assert not field.is_area_free(4, 0, 6, 0)  # Outside
+
+    def test_barren_table_rebuilds(self):
+        # The table follows changes to the barren zones.
+        field = Field(6, 6)
+        assert field.is_area_free(0, 0, 5, 5)
+        field.barren_zones.add(Zone(Coord(2, 2), Coord(2, 2)))
+        assert not field.is_area_free(0, 0, 5, 5)
+        field.barren_zones.clear()
+        assert field.is_area_free(0, 0, 5, 5)
+
+    def test_cancel(self):
+        field = Field(6, 6)
+        field.cancel()
+
+        with pytest.raises(AnalysisCancelled):
+            field.check_zones()
+        assert len(field.fertile_zones) == 0
+
+    def test_stats(self):
+        # Every run of a phase is timed.
+        field = Field(6, 6)
+        field.add_zone(Zone(Coord(0, 2), Coord(5, 2)), barren=True)
+        field.check_zones()
+        field.islands_as_area()
+
+        assert field.stats.calls["mark"] == 1
+        assert field.stats.calls["islands"] == 1
+        assert field.stats.calls["sort"] == 1
+        assert field.stats.total() > 0
+
+    def test_check_zones_matches_grid(self):
+        # The binary searched zones are the same as the rasterized ones.
+        rand = random.Random(4)
+        for _ in range(20):
+            barren = [Zone(Coord(x, y), Coord(x + rand.randrange(5), y + rand.randrange(5)))
+                      for x, y in [(rand.randrange(20), rand.randrange(20)) for _ in range(6)]]
+            fields = [Field(20, 20), GridField(20, 20)]
+            for field in fields:
+                for zone in barren:
+                    field.add_zone(zone, barren=True)
+                field.check_zones()
+            assert set(fields[0].fertile_zones) == set(fields[1].fertile_zones)
+
+    def test_normalize_barren(self):
+        field = Field(10, 10)
+        for bounds in [(0, 0, 4, 9), (5, 0, 9, 3), (5, 2, 9, 9), (6, 6, 7, 7), (2, 2, 3, 3)]:
+            field.add_zone(Zone(Coord(*bounds[:2]), Coord(*bounds[2:])), barren=True)
+
+        assert field.normalize_barren() == 4
+        assert list(field.barren_zones) == [Zone(Coord(0, 0), Coord(9, 9))]
+
+    def test_zone_set_assignment(self):
+        # Assigning a plain set keeps the zones indexed.
+        field = Field(6, 6)
+        barren_zone = Zone(Coord(1, 1), Coord(2, 2))
+        field.barren_zones = {barren_zone}
+
+        assert isinstance(field.barren_zones, ZoneSet)
+        assert not field.check_coord(Coord(2, 1))
+
+
+def test_clip_bounds():
+    # Reversed and outside zones are dropped, overhangs are cut at the field edge.
+    bounds = np.array([[-5, 2, 3, 3], [4, 4, 2, 2], [10, 0, 12, 1], [8, 8, 20, 20]])
+
+    assert clip_bounds(bounds, 10, 10).tolist() == [[0, 2, 3, 3], [8, 8, 9, 9]]
+
+
+def test_normalize_zones_contained():
+    # Containers come before the zones inside of them in the sweep, whatever the input order.
+    rng = np.random.default_rng(3)
+    for _ in range(20):
+        start = rng.integers(0, 30, size=(40, 2))
+        bounds = np.unique(np.hstack((start, start + rng.integers(0, 15, size=(40, 2)))), axis=0)
+        kept = _drop_contained(bounds[rng.permutation(len(bounds))])
+        for sx, sy, ex, ey in bounds.tolist():
+            holders = ((kept[:, 0] <= sx) & (kept[:, 1] <= sy) &
+                       (kept[:, 2] >= ex) & (kept[:, 3] >= ey))
+            # Every zone is inside of a kept zone, and kept zones are only inside of themselves.
+            assert holders.sum() >= 1
+        for sx, sy, ex, ey in kept.tolist():
+            holders = ((kept[:, 0] <= sx) & (kept[:, 1] <= sy) &
+                       (kept[:, 2] >= ex) & (kept[:, 3] >= ey))
+            assert holders.sum() == 1
+
+
+def test_normalize_zones():
+    bounds = np.array([
+        (-5, 0, 2, 2),  # Clipped
+        (3, 0, 5, 2),  # Merges with the clipped zone along x
+        (1, 1, 2, 2),  # Inside of the first zone
+        (0, 4, 1, 4), (0, 4, 1, 4),  # Duplicate
+        (1, 5, 1, 6),  # Not a rectangle together with the one above
+        (20, 20, 30, 30),  # Outside
+    ])
+    normalized = sorted(map(tuple, normalize_zones(bounds, 10, 10).tolist()))
+
+    assert normalized == [(0, 0, 5, 2), (0, 4, 1, 4), (1, 5, 1, 6)]
+
+
+def test_touching_zones():
+    zones = [
+        Zone(Coord(0, 0), Coord(2, 2)),
+        Zone(Coord(3, 0), Coord(5, 1)),  # Shares an edge with 0
+        Zone(Coord(3, 3), Coord(4, 4)),  # Shares a corner with 0
+        Zone(Coord(6, 6), Coord(7, 7)),  # Alone
+    ]
+    pairs = set(tuple(sorted(p)) for p in touching_zones(bounds_array(zones).tolist()))
+
+    assert pairs == {(0, 1), (0, 2)}
+
+
+class TestZoneSet:
+
+    def test_find(self):
+        zone = Zone(Coord(0, 0), Coord(2, 2))
+        zone_set = ZoneSet([zone], 10, 10)
+
+        assert zone in zone_set
+        assert zone_set.find(Coord(1, 2)) == zone
+        assert zone_set.find(Coord(3, 3)) is None
+        assert zone_set.covers(2, 2)
+        assert not zone_set.covers(2, 3)
+
+    def test_discard(self):
+        zone = Zone(Coord(0, 0), Coord(2, 2))
+        zone_set = ZoneSet([zone], 10, 10)
+        zone_set.discard(zone)
+
+        assert len(zone_set) == 0
+        assert zone_set.find(Coord(1, 1)) is None
+
+    def test_discard_moves_last(self):
+        # The last zone takes the place of the removed one and must stay indexed.
+        zones = [Zone(Coord(i, 0), Coord(i, 0)) for i in range(3)]
+        zone_set = ZoneSet(zones, 10, 10)
+        zone_set.discard(zones[0])
+
+        assert zone_set.find(Coord(2, 0)) == zones[2]
+        assert zones[0] not in zone_set
+        assert len(zone_set) == 2
+
+    def test_overlapping(self):
+        zones = [Zone(Coord(0, 0), Coord(2, 2)), Zone(Coord(5, 5), Coord(6, 6))]
+        zone_set = ZoneSet(zones, 10, 10)
+
+        assert zone_set.overlapping(Zone(Coord(2, 2), Coord(4, 4))) == [zones[0]]
+
+    def test_reversed_zone(self):
+        # A zone with its start after its end is still found, de-duplicated and removable.
+        field = Field(400, 600)
+        field.check_zones()
+        zone = Zone(Coord(100, 100), Coord(0, 0))
+        field.add_barren(zone)
+
+        assert zone in field.barren_zones
+        field.barren_zones.add(Zone(Coord(100, 100), Coord(0, 0)))
+        assert len(field.barren_zones) == 1
+        field.remove_barren(zone)
+        assert len(field.barren_zones) == 0
+
+    def test_extend_bounds(self):
+        # Zones added in bulk are indexed like the ones added one by one.
+        zone_set = ZoneSet([Zone(Coord(0, 0), Coord(0, 0))], 10, 10)
+        zone_set.extend_bounds(np.array([[2, 2, 3, 3], [8, 8, 9, 9]], dtype=np.int32))
+
+        assert len(zone_set) == 3
+        assert zone_set.find(Coord(9, 8)) == Zone(Coord(8, 8), Coord(9, 9))
+        with pytest.raises(OverflowError):
+            zone_set.extend_bounds([[0, 0, 2 ** 31, 1]])
+
+
+class TestZoneStore:
+
+    def test_bounds(self):
+        store = ZoneStore([Zone(Coord(0, 0), Coord(1, 4)), Zone(Coord(2, 3), Coord(3, 4))])
+
+        assert store.bounds().tolist() == [[0, 0, 1, 4], [2, 3, 3, 4]]
+        assert store.area() == 14
+
+    def test_add_duplicate(self):
+        store = ZoneStore()
+        store.add(Zone(Coord(0, 0), Coord(1, 1)))
+        store.add(Zone(Coord(0, 0), Coord(1, 1)))
+
+        assert len(store) == 1
+        assert Zone(Coord(0, 0), Coord(1, 1)) in store
+
+    def test_from_bounds(self):
+        store = ZoneStore.from_bounds([[0, 0, 1, 1], [3, 3, 4, 4]])
+
+        assert list(store) == [Zone(Coord(0, 0), Coord(1, 1)), Zone(Coord(3, 3), Coord(4, 4))]
+
+
+class TestIncremental:
+
+    @staticmethod
+    def fresh_areas(width, height, barren):
+        field = GridField(width, height)
+        field.barren_zones = barren
+        field.check_zones()
+        return field.islands_as_area()
+
+    def test_add_barren(self):
+        field = Field(6, 6)
+        field.check_zones()
+        field.add_barren(Zone(Coord(0, 3), Coord(5, 3)))
+
+        assert field.islands_as_area() == [12, 18]
+
+    def test_remove_barren(self):
+        field = Field(6, 6)
+        wall = Zone(Coord(0, 3), Coord(5, 3))
+        field.add_zone(wall, barren=True)
+        field.add_zone(Zone(Coord(2, 2), Coord(2, 4)), barren=True)
+        field.check_zones()
+        field.remove_barren(wall)
+
+        assert field.islands_as_area() == [33]
+        assert sum(zone.get_size() for zone in field.fertile_zones) == 33
+
+    def test_edit_keeps_other_islands(self):
+        # Only the islands next to an edit are grouped again, the others stay as they are.
+        field = Field(6, 6)
+        field.add_zone(Zone(Coord(0, 3), Coord(5, 3)), barren=True)
+        field.check_zones()
+        bottom = [island for island in field.islands if island.bounds()[:, 1].min() > 3][0]
+        field.add_barren(Zone(Coord(0, 0), Coord(0, 0)))
+
+        assert any(island is bottom for island in field.islands)
+        assert field.islands_as_area() == [12, 17]
+
+    def test_random_edits(self):
+        # Every edit must end up with the same islands as a fresh analysis.
+        rand = random.Random(5)
+        field = Field(20, 16)
+        field.check_zones()
+        barren = list()
+        for _ in range(30):
+            if barren and rand.random() < 0.4:
+                zone = barren.pop(rand.randrange(len(barren)))
+                field.remove_barren(zone)
+            else:
+                x, y = rand.randint(-2, 19), rand.randint(-2, 15)
+                zone = Zone(Coord(x, y), Coord(x + rand.randint(0, 6), y + rand.randint(0, 6)))
+                barren.append(zone)
+                field.add_barren(zone)
+
+            assert field.islands_as_area() == self.fresh_areas(20, 16, barren)
+
 
 class TestCoord:
 
@@ -156,3 +420,44 @@ class TestZone:
 
         assert zone_a+zone_b == 14
         assert zone_a+4 == 14
+
+    def test_zone_intersection(self):
+        assert self.new_zone.intersection(Zone(Coord(3, 1), Coord(8, 8))) == \
+            Zone(Coord(3, 1), Coord(4, 1))
+        assert self.new_zone.intersection(Zone(Coord(5, 0), Coord(8, 8))) is None
+
+    def test_zone_subtract(self):
+        zone = Zone(Coord(0, 0), Coord(4, 4))
+        pieces = zone.subtract(Zone(Coord(1, 1), Coord(2, 2)))
+
+        assert sum(piece.get_size() for piece in pieces) == 21
+        assert zone.subtract(Zone(Coord(6, 6), Coord(7, 7))) == [zone]
+        assert zone.subtract(Zone(Coord(-1, -1), Coord(5, 5))) == []
+
+    def test_zone_is_neighbor(self):
+        edge_zone = Zone(Coord(5, 1), Coord(6, 3))
+        corner_zone = Zone(Coord(5, 2), Coord(6, 3))
+        far_zone = Zone(Coord(6, 0), Coord(6, 1))
+
+        assert self.new_zone.is_neighbor(edge_zone)
+        assert self.new_zone.is_neighbor(edge_zone, diagonal=False)
+        assert self.new_zone.is_neighbor(corner_zone)
+        assert not self.new_zone.is_neighbor(corner_zone, diagonal=False)
+        assert not self.new_zone.is_neighbor(far_zone)
+
+
+@pytest.mark.parametrize("diagonal", [True, False])
+def test_adjacency(diagonal):
+    # Compare the vectorized pairs with checking every pair of zones.
+    rand = random.Random(3)
+    zones = list()
+    for _ in range(60):
+        x, y = rand.randint(0, 40), rand.randint(0, 40)
+        zones.append(Zone(Coord(x, y), Coord(x + rand.randint(0, 4), y + rand.randint(0, 4))))
+    expected = set((a, b) for a in range(len(zones)) for b in range(a + 1, len(zones))
+                   if zones[a].is_neighbor(zones[b], diagonal=diagonal))
+
+    pairs = adjacency(zones, diagonal=diagonal)
+
+    assert set(map(tuple, pairs.tolist())) == expected
+    assert len(pairs) == len(expected)
@@ -0,0 +1,100 @@
+import json
+
+import numpy as np
+import pytest
+
+from barren_lands import metrics
+from barren_lands.areas import island_areas
+from barren_lands.grid import GridField
+from barren_lands.land import Field, Zone, Coord
+
+
+def analysed_field():
+    field = Field(6, 6)
+    field.add_zone(Zone(Coord(0, 2), Coord(5, 2)), barren=True)
+    field.check_zones()
+    return field
+
+
+def test_counting():
+    with metrics.counting() as counted:
+        field = analysed_field()
+        field.check_coord(Coord(0, 0))
+        field.check_coord(Coord(0, 2))
+        field.check_coord(Coord(9, 9))
+        Zone(Coord(0, 0), Coord(1, 1)).is_neighbor(Zone(Coord(2, 2), Coord(3, 3)))
+    data = counted.as_dict()
+    values = {(c["name"], c["labels"].get("outcome")): c["value"] for c in data["counters"]}
+
+    assert values[("check_coord_total", "fertile")] == 1
+    assert values[("check_coord_total", "barren")] == 1
+    assert values[("check_coord_total", "out_of_bounds")] == 1
+    assert values[("zone_neighbor_total", None)] == 1
+    assert values[("zones_created_total", None)] == 2
+    assert data["summaries"]["zones_per_island"] == {"count": 2, "sum": 2, "max": 1}
+
+
+def test_disabled():
+    # Outside of the context the original methods run again and nothing is counted.
+    with metrics.counting() as counted:
+        pass
+    analysed_field()
+    assert not any(counted.counters.values())
+    assert "count_" not in Coord.__init__.__name__
+
+
+def test_nested():
+    # A second count while one is running fails instead of stopping the first one.
+    with metrics.counting() as counted:
+        with pytest.raises(RuntimeError):
+            with metrics.counting():
+                pass
+        Coord(0, 0)
+    assert counted.counters[("coords_allocated_total", ())] == 1
+
+
+def test_series_registered():
+    # Every series is exported at 0, even when nothing was counted.
+    text = metrics.Metrics().to_prometheus()
+    assert 'barren_lands_zone_lookups_total{method="covers",outcome="hit"} 0' in text
+    assert 'barren_lands_unions_total{outcome="merged"} 0' in text
+    assert "barren_lands_area_runs_total 0" in text
+    assert "barren_lands_zones_per_island_count 0" in text
+
+
+def test_counting_areas():
+    # The areas sweep counts its runs and unions, without any zone being created.
+    with metrics.counting() as counted:
+        assert island_areas(4, 4, np.array([[0, 0, 1, 1], [2, 2, 3, 3]])) == [8]
+    values = {(c["name"], c["labels"].get("outcome")): c["value"]
+              for c in counted.as_dict()["counters"]}
+
+    assert values[("area_runs_total", None)] > 0
+    assert values[("area_recuts_total", None)] > 0
+    assert values[("unions_total", "merged")] + values[("unions_total", "same")] > 0
+
+
+def test_register_engine():
+    # Engines are only counted once registered, also when registered while counting.
+    with metrics.counting() as counted:
+        metrics.register_engine(GridField)
+        field = GridField(6, 6)
+        field.add_zone(Zone(Coord(0, 2), Coord(5, 2)), barren=True)
+        field.check_zones()
+    assert GridField in metrics.ENGINES
+    assert "count_" not in GridField.check_zones.__name__
+    assert counted.counters[("zones_created_total", ())] == 2
+
+
+def test_export(tmp_path):
+    counted = metrics.Metrics()
+    counted.increment("check_coord_total", outcome="free")
+    counted.observe("zones_per_island", 3)
+    text = counted.to_prometheus()
+
+    assert "# TYPE barren_lands_check_coord_total counter" in text
+    assert 'barren_lands_check_coord_total{outcome="free"} 1' in text
+    assert "barren_lands_zones_per_island_sum 3" in text
+    path = tmp_path.joinpath("metrics.json")
+    counted.dump(str(path))
+    assert json.loads(path.read_text())["summaries"]["zones_per_island"]["max"] == 3
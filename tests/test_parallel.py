@@ -0,0 +1,45 @@
+import pytest
+import random
+from barren_lands.land import Zone, Coord
+from barren_lands.grid import GridField
+from barren_lands.parallel import TiledField
+
+
+def random_barren(rand, width, height, count):
+    barren = list()
+    for _ in range(count):
+        x, y = rand.randint(-2, width), rand.randint(-2, height)
+        barren.append(Zone(Coord(x, y), Coord(x + rand.randint(0, 8), y + rand.randint(0, 8))))
+    return barren
+
+
+class TestTiledField:
+
+    def test_tiles(self):
+        field = TiledField(10, 7, tile_size=4)
+
+        assert len(field.tiles()) == 6
+        assert sum(w * h for _, _, w, h in field.tiles()) == 70
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_matches_single_process(self, workers):
+        rand = random.Random(workers)
+        for _ in range(5):
+            barren = random_barren(rand, 30, 25, rand.randint(1, 12))
+            tiled_field = TiledField(30, 25, tile_size=7, workers=workers)
+            tiled_field.barren_zones = barren
+            tiled_field.check_zones()
+            field = GridField(30, 25)
+            field.barren_zones = barren
+            field.check_zones()
+
+            assert tiled_field.islands_as_area() == field.islands_as_area()
+
+    def test_samples(self):
+        field = TiledField(400, 600, tile_size=128, workers=2)
+        for zone in ("48 192 351 207", "48 392 351 407", "120 52 135 547", "260 52 275 547"):
+            values = [int(i) for i in zone.split(" ")]
+            field.add_zone(Zone(Coord(*values[:2]), Coord(*values[2:])), barren=True)
+        field.check_zones()
+
+        assert field.islands_as_area() == [22816, 192608]
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from barren_lands.grid import CompressedField, decompose
+from barren_lands.land import Coord, Zone
+from barren_lands.partition import PartitionField, minimum_partition
+
+
+def coverage(rectangles, shape):
+    covered = np.zeros(shape, dtype=int)
+    for start_x, start_y, end_x, end_y in rectangles.tolist():
+        covered[start_y:end_y + 1, start_x:end_x + 1] += 1
+    return covered
+
+
+@pytest.mark.parametrize("rows, count", [
+    (["111", "111"], 1),
+    (["010", "111", "010"], 3),  # Plus
+    (["11111", "10101", "10101", "11111"], 5),  # Two holes
+    (["1100", "1100", "0011", "0011"], 2),  # Touching by a corner
+    (["111", "110", "100"], 3),  # Staircase, no chords
+    (["1111", "1001", "1111"], 4),  # A hole, a chord on each side
+])
+def test_minimum_partition(rows, count):
+    free = np.array([[c == "1" for c in row] for row in rows])
+    rectangles = minimum_partition(free)
+
+    assert len(rectangles) == count
+    assert (coverage(rectangles, free.shape) == free).all()
+
+
+def test_minimum_partition_random():
+    # Every free unit is covered exactly once and never by more zones than the greedy scan.
+    rand = np.random.RandomState(2)
+    for _ in range(100):
+        free = rand.rand(rand.randint(1, 15), rand.randint(1, 15)) < rand.uniform(0.3, 0.95)
+        rectangles = minimum_partition(free)
+
+        assert (coverage(rectangles, free.shape) == free).all()
+        assert len(rectangles) <= len(list(decompose(free.copy())))
+
+
+def test_partition_field():
+    barren = [(48, 192, 351, 207), (48, 392, 351, 407), (120, 52, 135, 547), (260, 52, 275, 547)]
+    fields = [PartitionField(400, 600), CompressedField(400, 600)]
+    for field in fields:
+        for start_x, start_y, end_x, end_y in barren:
+            field.add_zone(Zone(Coord(start_x, start_y), Coord(end_x, end_y)), barren=True)
+        field.check_zones()
+
+    assert fields[0].islands_as_area() == fields[1].islands_as_area() == [22816, 192608]
+    assert len(fields[0].fertile_zones) < len(fields[1].fertile_zones)
@@ -0,0 +1,27 @@
+import pstats
+
+from barren_lands.profiling import PhaseStats, profiled
+
+
+def test_phase_stats():
+    stats = PhaseStats()
+    with stats.phase("mark"):
+        pass
+    with stats.phase("mark"):
+        pass
+
+    assert stats.calls["mark"] == 2
+    assert set(stats.as_dict()) == set(PhaseStats.phases)
+    assert stats.report().splitlines()[-1].startswith("total")
+    stats.reset()
+    assert stats.total() == 0
+
+
+def test_profiled(tmp_path):
+    # Without a path nothing is profiled.
+    with profiled() as profiler:
+        assert profiler is None
+    dump = tmp_path.joinpath("run.pstats")
+    with profiled(str(dump)):
+        sorted(range(100))
+    assert pstats.Stats(str(dump)).total_calls > 0
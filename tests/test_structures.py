@@ -0,0 +1,98 @@
+import pytest
+import numpy as np
+from barren_lands.structures import ZoneIndex, DisjointSet, SummedAreaTable, burn_corners
+
+
+class TestZoneIndex:
+    index = ZoneIndex(40, 40, bucket_size=8)
+    small_zone = (2, 2, 4, 4)
+    wide_zone = (0, 20, 39, 21)
+
+    def test_insert(self):
+        self.index.insert(0, *self.small_zone)
+        self.index.insert(1, *self.wide_zone)
+
+        assert 0 in self.index.candidates(3, 3)
+        assert 1 in self.index.candidates(35, 21)
+
+    def test_candidates_missing(self):
+        assert list(self.index.candidates(20, 5)) == []
+
+    def test_candidates_outside(self):
+        # Zones reaching outside of the indexed area are still found there.
+        self.index.insert(2, -10, -10, 0, 0)
+
+        assert 2 in self.index.candidates(-5, -5)
+        self.index.remove(2, -10, -10, 0, 0)
+
+    def test_candidates_of(self):
+        found = self.index.candidates_of(4, 4, 10, 20)
+
+        assert found == {0, 1}
+
+    def test_remove(self):
+        self.index.remove(0, *self.small_zone)
+
+        assert 0 not in self.index.candidates(3, 3)
+        assert 1 in self.index.candidates(0, 20)
+
+    def test_bucket_size_limit(self):
+        # Huge areas get bigger buckets instead of millions of them.
+        index = ZoneIndex(1000000, 1000000)
+
+        assert index.columns <= ZoneIndex.max_buckets
+        assert index.rows <= ZoneIndex.max_buckets
+
+
+class TestDisjointSet:
+
+    def test_union(self):
+        groups = DisjointSet(5)
+        groups.union(0, 1)
+        groups.union(3, 1)
+
+        assert groups.find(0) == groups.find(3)
+        assert groups.find(2) != groups.find(0)
+
+    def test_groups(self):
+        groups = DisjointSet(4)
+        groups.union(2, 3)
+
+        assert sorted(sorted(g) for g in groups.groups()) == [[0], [1], [2, 3]]
+
+
+class TestSummedAreaTable:
+    # Two overlapping rectangles and one reaching outside of the area.
+    table = SummedAreaTable(10, 10, np.array([[0, 0, 3, 3], [2, 2, 5, 5], [8, 8, 20, 20]]))
+
+    def test_count(self):
+        assert self.table.count(0, 0, 9, 9) == 16 + 16 - 4 + 4
+        assert self.table.count(2, 2, 3, 3) == 4
+        assert self.table.count(6, 0, 9, 7) == 0
+
+    def test_count_single_unit(self):
+        assert self.table.count(5, 5, 5, 5) == 1
+        assert self.table.count(6, 6, 6, 6) == 0
+
+    def test_matches_mask(self):
+        # Every rectangle counts the same as a plain mask, the table stays int32.
+        rng = np.random.default_rng(3)
+        bounds = rng.integers(-5, 30, size=(20, 4))
+        bounds[:, 2:] = bounds[:, :2] + rng.integers(0, 10, size=(20, 2))
+        table = SummedAreaTable(30, 20, bounds)
+        mask = np.zeros((20, 30), dtype=bool)
+        for sx, sy, ex, ey in bounds.tolist():
+            mask[max(sy, 0):max(ey + 1, 0), max(sx, 0):max(ex + 1, 0)] = True
+
+        assert table.table.dtype == np.int32
+        for sx, sy, ex, ey in [(0, 0, 29, 19), (3, 4, 17, 11), (29, 19, 29, 19)]:
+            assert table.count(sx, sy, ex, ey) == mask[sy:ey + 1, sx:ex + 1].sum()
+
+
+def test_burn_corners():
+    # Overlapping rectangles add up their values, the ends are exclusive.
+    summed = burn_corners((4, 5), np.array([0, 1]), np.array([0, 1]), np.array([2, 4]),
+                          np.array([2, 3]), values=np.array([1, 2]))
+
+    assert summed[:-1, :-1].tolist() == [[1, 1, 0, 0], [1, 3, 2, 2], [0, 2, 2, 2]]
+    assert summed.dtype == np.int32
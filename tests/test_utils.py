@@ -1,6 +1,10 @@
 import pytest
+import numpy as np
 from os.path import isfile
-from barren_lands.utils import format_input, format_raw_input, get_icon, get_css
+from barren_lands.utils import (format_input, format_raw_input, format_stdin_input, load_bounds,
+                                get_icon, get_css)
+
+BOUNDS = [[48, 192, 351, 207], [48, 392, 351, 407]]
 
 
 def test_format_input():
@@ -21,6 +25,42 @@ def test_format_raw_input():
     assert parsed_input == [[48, 192, 351, 207], [48, 392, 351, 407]]
 
 
+def test_format_stdin_input():
+    # Make sure a scenario line from STDIN is turned into zones.
+    zones = format_stdin_input("{\"48 192 351 207\", “48 392 351 407”}\n")
+
+    assert [(z.start.x, z.start.y, z.end.x, z.end.y) for z in zones] == [
+        (48, 192, 351, 207), (48, 392, 351, 407)]
+    assert format_stdin_input("{}") == []
+
+
+def test_load_bounds(tmp_path):
+    # Every file format gives back the same bounds.
+    csv_path = tmp_path.joinpath("zones.csv")
+    csv_path.write_text("start_x,start_y,end_x,end_y\n48,192,351,207\n# comment\n48,392,351,407\n")
+    npy_path = tmp_path.joinpath("zones.npy")
+    np.save(npy_path, np.array(BOUNDS, dtype=np.int64))
+    bin_path = tmp_path.joinpath("zones.bin")
+    np.array(BOUNDS, dtype="<i4").tofile(bin_path)
+
+    for path in (csv_path, npy_path, bin_path):
+        assert np.asarray(load_bounds(str(path))).tolist() == BOUNDS
+    # The binary formats are read straight from the file.
+    assert isinstance(load_bounds(str(bin_path)), np.memmap)
+
+
+def test_load_bounds_invalid(tmp_path):
+    bin_path = tmp_path.joinpath("zones.bin")
+    bin_path.write_bytes(b"\x00" * 10)
+    with pytest.raises(ValueError):
+        load_bounds(str(bin_path))
+    with pytest.raises(ValueError):
+        load_bounds(str(tmp_path.joinpath("zones.json")))
+    empty = tmp_path.joinpath("empty.bin")
+    empty.write_bytes(b"")
+    assert load_bounds(str(empty)).shape == (0, 4)
+
+
 def test_get_icon():
     # Make sure we are getting a file back.
     icon_path = get_icon()
@@ -0,0 +1,84 @@
+import io
+
+import numpy as np
+from PIL import Image
+
+from barren_lands.grid import GridField
+from barren_lands.land import Coord, Zone
+from barren_lands.visualize import export_png, island_labels, palette, render_bytes, render_image
+
+
+def build_field():
+    field = GridField(10, 6)
+    field.add_zone(Zone(Coord(4, 0), Coord(4, 5)), barren=True)
+    field.add_zone(Zone(Coord(8, 0), Coord(8, 5)), barren=True)
+    field.check_zones()
+    return field
+
+
+def test_island_labels():
+    field = build_field()
+    labels, owners = island_labels(field.islands, 10, 6)
+
+    assert labels.shape == (6, 10)
+    assert (labels[:, 4] == 0).all()
+    # The largest island is label 1.
+    assert (labels[:, :4] == 1).all() and (labels[:, 9] == 3).all()
+    assert owners.tolist() == [-1, 0, 1, 2]
+
+
+def test_island_labels_by_zone():
+    field = build_field()
+    labels, owners = island_labels(field.islands, 10, 6, by_zone=True)
+
+    assert labels.max() == len(field.fertile_zones)
+    assert len(owners) == len(field.fertile_zones) + 1
+
+
+def test_palette():
+    # The same seed gives the same colors.
+    assert (palette(5, seed=3) == palette(5, seed=3)).all()
+    assert palette(5, seed=3).shape == (5, 3)
+
+
+def test_render_image():
+    field = build_field()
+    image = render_image(field.islands, 10, 6, base=(1, 2, 3))
+    pixels = np.asarray(image)
+
+    assert image.size == (10, 6)
+    assert tuple(pixels[0, 4]) == (1, 2, 3, 255)
+    # Only the largest island is opaque.
+    assert pixels[0, 0, 3] == 255 and pixels[0, 9, 3] == 10
+
+
+def test_render_bytes(tmp_path):
+    field = build_field()
+    path = tmp_path / "field.png"
+    data = field.render(path=str(path))
+
+    assert path.read_bytes() == data
+    assert Image.open(io.BytesIO(data)).size == (10, 6)
+    assert render_bytes(field.islands, 10, 6) == data
+
+
+def test_export_png(tmp_path):
+    # The streamed PNG has the same pixels as the image rendered at once.
+    field = build_field()
+    for by_zone in (False, True):
+        path = tmp_path / "field.png"
+        field.export_png(str(path), strip_height=4, by_zone=by_zone)
+        exported = np.asarray(Image.open(path).convert("RGBA"))
+
+        assert (exported == np.asarray(render_image(field.islands, 10, 6, by_zone=by_zone))).all()
+
+
+def test_export_png_rgba(tmp_path):
+    # More than 256 labels do not fit a palette.
+    islands = [[Zone(Coord(x, y), Coord(x, y))] for x in range(20) for y in range(15)]
+    path = tmp_path / "field.png"
+    export_png(islands, 20, 15, str(path), strip_height=7)
+    image = Image.open(path)
+
+    assert image.mode == "RGBA"
+    assert (np.asarray(image) == np.asarray(render_image(islands, 20, 15))).all()